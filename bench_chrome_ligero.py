@@ -0,0 +1,101 @@
+"""
+Benchmark: arranque y memoria de Chrome con las opciones normales frente al modo ligero.
+Para cada modo levanta Chrome N veces con crear_opciones_chrome (perfil desechable,
+como el de incógnito) y mide:
+  - arranque: desde webdriver.Chrome(...) hasta que about:blank terminó de cargar
+  - RSS: memoria residente de todo el árbol de procesos de Chrome tras abrir una página
+  - PSS: lo mismo repartiendo las páginas compartidas entre procesos (Linux). La suma de
+    RSS cuenta varias veces las bibliotecas compartidas, así que baja con solo tener
+    menos procesos; PSS es la que refleja la memoria real del árbol
+
+Uso:
+    python bench_chrome_ligero.py [--repeticiones 5] [--url about:blank] [--asentar 3]
+"""
+import argparse
+import os
+import statistics
+import time
+
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+
+import zoom_auto_launcher as zal
+
+
+def pss_arbol_mb(pid: int) -> float | None:
+    """PSS total (MB) de un proceso y sus descendientes (/proc/<pid>/smaps_rollup); None fuera de Linux."""
+    if not os.path.isdir("/proc"):
+        return None
+    total_kb, pendientes = 0, [pid]
+    while pendientes:
+        actual = pendientes.pop()
+        try:
+            with open(f"/proc/{actual}/smaps_rollup") as f:
+                total_kb += next((int(l.split()[1]) for l in f if l.startswith("Pss:")), 0)
+            for tid in os.listdir(f"/proc/{actual}/task"):
+                with open(f"/proc/{actual}/task/{tid}/children") as f:
+                    pendientes.extend(int(h) for h in f.read().split())
+        except (OSError, ValueError):
+            continue
+    return total_kb / 1024
+
+
+def medir_modo(ligero: bool, repeticiones: int, url: str, asentar: float) -> tuple[list, list, list]:
+    """(tiempos de arranque en s, RSS en MB, PSS en MB) de 'repeticiones' arranques en frío."""
+    ruta = zal.resolver_chromedriver()
+    arranques, rss, pss = [], [], []
+    for _ in range(repeticiones):
+        opciones = zal.crear_opciones_chrome(incognito=True, ligero=ligero)
+        t0 = time.perf_counter()
+        driver = webdriver.Chrome(service=Service(ruta) if ruta else Service(), options=opciones)
+        try:
+            driver.get("about:blank")
+            arranques.append(time.perf_counter() - t0)
+            if url != "about:blank":
+                driver.get(url)
+            # Dejar que terminen los procesos auxiliares (GPU, red, utilidades)
+            time.sleep(asentar)
+            mb = zal._rss_arbol_mb(driver.service.process.pid)
+            if mb is not None:
+                rss.append(mb)
+            mb = pss_arbol_mb(driver.service.process.pid)
+            if mb is not None:
+                pss.append(mb)
+        finally:
+            driver.quit()
+    return arranques, rss, pss
+
+
+def resumen(valores: list, unidad: str) -> str:
+    if not valores:
+        return "n/d"
+    return f"{statistics.median(valores):.2f} {unidad} (min {min(valores):.2f}, max {max(valores):.2f})"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeticiones", type=int, default=5)
+    parser.add_argument("--url", default="about:blank", help="página a abrir antes de medir la memoria")
+    parser.add_argument("--asentar", type=float, default=3.0, help="segundos de espera antes de leer el RSS")
+    args = parser.parse_args()
+
+    filas = {}
+    for nombre, ligero in (("normal", False), ("ligero", True)):
+        print(f"⏱️  Midiendo modo {nombre} ({args.repeticiones} arranques)...")
+        filas[nombre] = medir_modo(ligero, args.repeticiones, args.url, args.asentar)
+
+    print(f"\n{'modo':>8}  {'arranque (mediana)':<36} {'RSS del árbol (mediana)':<36} {'PSS del árbol (mediana)':<36}")
+    for nombre, (arranques, rss, pss) in filas.items():
+        print(f"{nombre:>8}  {resumen(arranques, 's'):<36} {resumen(rss, 'MB'):<36} {resumen(pss, 'MB'):<36}")
+
+    (a_n, r_n, p_n), (a_l, r_l, p_l) = filas["normal"], filas["ligero"]
+    if a_n and a_l:
+        print(f"\narranque: {statistics.median(a_n) / statistics.median(a_l):.2f}x más rápido en modo ligero")
+    if r_n and r_l:
+        print(f"RSS: {statistics.median(r_n) - statistics.median(r_l):+.0f} MB menos por instancia en modo ligero")
+    if p_n and p_l:
+        print(f"PSS: {statistics.median(p_n) - statistics.median(p_l):+.0f} MB menos por instancia en modo ligero")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Benchmark: tiempo de unión del modo navegador_auto contra el Zoom/Google de prueba
+(mock_zoom_google.py), sin cuentas reales. Cada repetición levanta un Chrome limpio
+(incógnito, así el SSO se repite), lo apunta al servidor local y ejecuta
+abrir_navegador_automatico hasta pausar la grabación. Reporta p50/p95/p99 de:
+  - hitos acumulados desde el inicio de la unión (primera pre-unión, fin del login,
+    "Entrar", UI de la reunión, pausa = total), según los eventos del servidor
+  - cada fase de espera del flujo (MEDIDOR_FASES)
+El arranque de Chrome se mide aparte.
+
+Las estadísticas de selectores y el almacén de sesiones se redirigen a un directorio
+temporal para no mezclar las cookies ni el orden aprendido del mock con los reales.
+
+Uso:
+    python bench_join.py [--repeticiones 20] [--idioma es|en] [--iframe] [--menu-mas]
+                         [--latencia-ms 50] [--demora-unirse-ms 300] [--sin-login] [--ligero]
+"""
+import argparse
+import tempfile
+import time
+
+import mock_zoom_google as mock
+import zoom_auto_launcher as zal
+
+REUNION = "https://renata.zoom.us/j/84835100297"
+
+# Hito -> predicado sobre el tipo de evento del servidor (se toma la primera coincidencia,
+# salvo el login, que termina en la última vuelta a Zoom desde Google)
+HITOS = [
+    ("pre-unión", lambda tipo: tipo.startswith("GET /wc/")),
+    ("entrar", lambda tipo: tipo == "entrar"),
+    ("en reunión", lambda tipo: tipo == "en_reunion"),
+    ("pausa (total)", lambda tipo: tipo == "pausa"),
+]
+
+
+def medir_union(servidor: mock.ServidorMock, ligero: bool) -> tuple[float, dict, dict]:
+    """(arranque de Chrome, hitos en s desde el inicio de la unión, segundos por fase)."""
+    zal.MEDIDOR_FASES = zal.MedidorFases()
+    t0 = time.monotonic()
+    driver = zal.iniciar_navegador(incognito=True, ligero=ligero)
+    arranque = time.monotonic() - t0
+    try:
+        inicio = time.monotonic()
+        zal.abrir_navegador_automatico(REUNION, zal.TU_NOMBRE, driver=driver)
+        eventos = servidor.eventos(desde=inicio)
+    finally:
+        driver.quit()
+
+    hitos = {}
+    for nombre, es_hito in HITOS:
+        t = next((t for t, tipo, _ in eventos if es_hito(tipo)), None)
+        if t is not None:
+            hitos[nombre] = t - inicio
+    vueltas = [t for t, tipo, _ in eventos if tipo == "GET /signin/google/callback"]
+    if vueltas:
+        hitos["login"] = vueltas[-1] - inicio
+    return arranque, hitos, zal.MEDIDOR_FASES.por_fase()
+
+
+def fila(nombre: str, valores: list, total: int) -> str:
+    if not valores:
+        return f"{nombre:<28} {'n/d':>8}"
+    p = [zal._percentil(valores, q) for q in (50, 95, 99)]
+    return f"{nombre:<28} {p[0]:>7.2f}s {p[1]:>7.2f}s {p[2]:>7.2f}s   {len(valores)}/{total}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeticiones", type=int, default=20)
+    parser.add_argument("--idioma", choices=sorted(mock.TEXTOS), default="es")
+    parser.add_argument("--iframe", action="store_true", help="Web Client dentro de un iframe")
+    parser.add_argument("--menu-mas", action="store_true", help="pausa dentro del menú 'Más'")
+    parser.add_argument("--latencia-ms", type=int, default=50, help="demora de cada respuesta del servidor")
+    parser.add_argument("--demora-unirse-ms", type=int, default=300, help="de 'Entrar' a la UI de la reunión")
+    parser.add_argument("--sin-login", action="store_true", help="la pre-unión no pide iniciar sesión")
+    parser.add_argument("--ligero", action="store_true", help="Chrome en modo ligero (headless)")
+    args = parser.parse_args()
+
+    servidor = mock.ServidorMock(variante=mock.Variante(
+        idioma=args.idioma, iframe=args.iframe, menu_mas=args.menu_mas, latencia_ms=args.latencia_ms,
+        demora_unirse_ms=args.demora_unirse_ms, requiere_login=not args.sin_login,
+    )).iniciar()
+    temporal = tempfile.mkdtemp(prefix="bench_join_")
+    zal.CHROME_ARGS_EXTRA = servidor.flags_chrome() + [f"--lang={args.idioma}"]
+    zal.ALMACEN_SESIONES = zal.AlmacenSesiones(temporal)
+    zal.ESTADISTICAS_SELECTORES = zal.EstadisticasSelectores(f"{temporal}/selectores.json")
+    zal.PRIMERA_VEZ = False
+
+    arranques, hitos, fases = [], {}, {}
+    for i in range(args.repeticiones):
+        print(f"⏱️  Unión {i + 1}/{args.repeticiones}...")
+        arranque, h, f = medir_union(servidor, args.ligero)
+        arranques.append(arranque)
+        for nombre, s in h.items():
+            hitos.setdefault(nombre, []).append(s)
+        for nombre, s in f.items():
+            fases.setdefault(nombre, []).append(s)
+    servidor.shutdown()
+
+    n = args.repeticiones
+    print(f"\n{'':<28} {'p50':>8} {'p95':>8} {'p99':>8}   muestras")
+    print(fila("arranque de Chrome", arranques, n))
+    print("— hitos desde el inicio de la unión —")
+    for nombre in ["login"] + [h for h, _ in HITOS]:
+        print(fila(nombre, hitos.get(nombre, []), n))
+    print("— fases de espera (MEDIDOR_FASES) —")
+    for nombre in sorted(fases):
+        print(fila(nombre, fases[nombre], n))
+    completas = len(hitos.get("pausa (total)", []))
+    if completas < n:
+        print(f"\n⚠️  {n - completas} de {n} uniones no llegaron a pausar la grabación")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Benchmark: cálculo del próximo run de cada reunión.
+Compara el camino por diccionario (compute_next_run) con el cálculo en lote
+NumPy (TablaReuniones + proximos_runs_batch) a 1k, 10k y 100k reuniones.
+
+Uso:
+    python bench_next_run.py [--tamanos 1000 10000 100000] [--repeticiones 3]
+"""
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+
+import zoom_auto_launcher as zal
+
+DIAS = ["lun", "mar", "mie", "jue", "vie", "sab", "dom"]
+
+
+def generar_reuniones(n: int, seed: int = 0) -> list:
+    """Catálogo sintético: ~90% semanales (1-3 días) y ~10% eventos únicos."""
+    rnd = random.Random(seed)
+    base = datetime.now(zal.TZ)
+    reus = []
+    for i in range(n):
+        reu = {
+            "nombre": f"Curso {i}",
+            "url": f"https://renata.zoom.us/j/{80000000000 + i}",
+            "modo": rnd.choice(["zoom_app", "navegador_auto"]),
+            "abrir_antes_min": rnd.choice([5, 10, 15, 20, 30]),
+        }
+        if rnd.random() < 0.9:
+            reu["programacion"] = {
+                "tipo": "semanal",
+                "dias": rnd.sample(DIAS, rnd.randint(1, 3)),
+                "hora": f"{rnd.randint(6, 21):02d}:{rnd.choice([0, 15, 30, 45]):02d}",
+            }
+        else:
+            fh = base + timedelta(minutes=rnd.randint(-600, 60 * 24 * 30))
+            reu["programacion"] = {"tipo": "unico", "fecha_hora": fh.strftime("%Y-%m-%d %H:%M")}
+        reus.append(reu)
+    return reus
+
+
+def medir(fn, repeticiones: int) -> float:
+    mejor = float("inf")
+    for _ in range(repeticiones):
+        t0 = time.perf_counter()
+        fn()
+        mejor = min(mejor, time.perf_counter() - t0)
+    return mejor
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tamanos", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--repeticiones", type=int, default=3)
+    args = parser.parse_args()
+
+    if zal.np is None:
+        raise SystemExit("❌ NumPy no está instalado (pip install numpy).")
+
+    print("tabla = armar TablaReuniones (una vez por carga); núcleo = pasada datetime64;")
+    print("lote = núcleo + conversión a datetime con TZ (lo que devuelve compute_next_runs)\n")
+    print(f"{'reuniones':>10} {'por dict (s)':>13} {'tabla (s)':>10} {'núcleo (s)':>11} {'lote (s)':>10} "
+          f"{'tabla+lote (s)':>15} {'speedup':>8}")
+    for n in args.tamanos:
+        reus = generar_reuniones(n)
+        now = datetime.now(zal.TZ)
+
+        t_dict = medir(lambda: [zal.compute_next_run(r, now=now) for r in reus], args.repeticiones)
+        t_tabla = medir(lambda: zal.TablaReuniones(reus), args.repeticiones)
+        tabla = zal.TablaReuniones(reus)
+        t_nucleo = medir(lambda: zal.proximos_runs_datetime64(tabla, now), args.repeticiones)
+        t_lote = medir(lambda: zal.proximos_runs_batch(tabla, now=now), args.repeticiones)
+
+        # Verificación: ambos caminos deben coincidir
+        esperado = [zal.compute_next_run(r, now=now) for r in reus]
+        obtenido = zal.proximos_runs_batch(tabla, now=now)
+        if esperado != obtenido:
+            malos = sum(a != b for a, b in zip(esperado, obtenido))
+            raise SystemExit(f"❌ {malos} diferencias entre compute_next_run y el cálculo en lote (n={n})")
+
+        total = t_tabla + t_lote
+        print(f"{n:>10} {t_dict:>13.4f} {t_tabla:>10.4f} {t_nucleo:>11.4f} {t_lote:>10.4f} "
+              f"{total:>15.4f} {t_dict / total:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
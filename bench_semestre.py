@@ -0,0 +1,54 @@
+"""
+Benchmark: un semestre completo del planificador heap con reloj virtual.
+Genera un catálogo sintético (el de bench_next_run.py) y lo corre con
+simular_planificador: sin esperas reales ni navegadores, solo un lanzador de prueba
+que anota cada apertura. Reporta aperturas, retraso respecto a la hora objetivo,
+ocurrencias perdidas o duplicadas, despertares del planificador y CPU usada.
+
+Uso:
+    python bench_semestre.py [--tamanos 1000 10000] [--semanas 18]
+                             [--costo-apertura-ms 0] [--latencia-despertar-ms 0]
+                             [--disparos disparos.csv]
+"""
+import argparse
+import time
+from datetime import timedelta
+
+import zoom_auto_launcher as zal
+from bench_next_run import generar_reuniones
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tamanos", type=int, nargs="+", default=[10000])
+    parser.add_argument("--semanas", type=float, default=18)
+    parser.add_argument("--costo-apertura-ms", type=float, default=0.0,
+                        help="tiempo virtual que consume entregar cada apertura")
+    parser.add_argument("--latencia-despertar-ms", type=float, default=0.0,
+                        help="tiempo virtual que tarda cada despertar del planificador")
+    parser.add_argument("--disparos", metavar="CSV", help="guarda cada apertura del último tamaño")
+    args = parser.parse_args()
+
+    desde = zal.RELOJ.ahora()
+    hasta = desde + timedelta(weeks=args.semanas)
+    for n in args.tamanos:
+        reus = generar_reuniones(n)
+        t0 = time.perf_counter()
+        resultado = zal.simular_planificador(
+            reus, desde, hasta,
+            costo_apertura_s=args.costo_apertura_ms / 1000,
+            latencia_despertar_s=args.latencia_despertar_ms / 1000,
+        )
+        pared = time.perf_counter() - t0
+        print(f"\n🧪 {n} reuniones, {args.semanas:g} semanas ({pared:.1f}s de pared, "
+              f"{len(resultado.disparos) / max(pared, 1e-9):,.0f} aperturas/s)")
+        print(resultado.resumen())
+        if args.disparos:
+            resultado.guardar_csv(args.disparos)
+
+    if args.disparos:
+        print(f"\n💾 Aperturas simuladas en {args.disparos}")
+
+
+if __name__ == "__main__":
+    main()
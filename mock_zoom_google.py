@@ -0,0 +1,342 @@
+"""
+Servidor local de prueba que imita las páginas de Zoom y Google que recorre el modo
+navegador_auto, para ejercitar abrir_navegador_automatico, login_zoom_via_google y
+pause_recording_in_webclient sin cuentas reales.
+
+Sirve por HTTPS (certificado autofirmado generado con openssl) y decide qué mostrar
+según el Host pedido, así Chrome puede visitar las URL reales si se le indica
+  --host-resolver-rules="MAP zoom.us 127.0.0.1:PUERTO, MAP *.zoom.us 127.0.0.1:PUERTO,
+                         MAP accounts.google.com 127.0.0.1:PUERTO"
+  --ignore-certificate-errors
+(ver flags_chrome()). Páginas:
+  zoom:   /j/<id> (launcher), /wc/join/<id> (pre-unión y reunión), /wc/<id>/cliente
+          (la misma UI dentro de un iframe), /signin, /signin/google, /profile
+  google: /accountchooser (selector de cuentas o correo), /challenge/pwd (contraseña)
+
+Variantes: latencia por petición y al pulsar "Entrar", etiquetas en español o inglés,
+UI del Web Client en iframe o no, botón de pausa directo o dentro del menú "Más",
+y si hace falta iniciar sesión como anfitrión. Cada paso del usuario (páginas pedidas,
+"Entrar", pausa) queda en un registro de eventos con marca de tiempo (ver eventos()).
+
+Uso:
+    python mock_zoom_google.py [--puerto 8443] [--idioma es|en] [--iframe] [--menu-mas]
+                               [--latencia-ms 0] [--demora-unirse-ms 0] [--sin-login]
+"""
+import argparse
+import html
+import os
+import ssl
+import subprocess
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, quote, urlsplit
+
+
+@dataclass
+class Variante:
+    idioma: str = "es"             # "es" o "en"
+    iframe: bool = False           # UI del Web Client dentro de un iframe del mismo origen
+    menu_mas: bool = False         # "Pausar grabación" solo aparece tras abrir "Más"
+    latencia_ms: int = 0           # demora de cada respuesta HTTP
+    demora_unirse_ms: int = 0      # de "Entrar" a la UI de la reunión
+    requiere_login: bool = True    # sin cookie de sesión, la pre-unión ofrece "Host sign in"
+
+
+TEXTOS = {
+    "es": {
+        "unirse_navegador": "Únase desde su navegador",
+        "anfitrion": "Inicio de sesión del anfitrión",
+        "nombre": "Su nombre",
+        "entrar": "Entrar",
+        "google": "Iniciar sesión con Google",
+        "siguiente": "Siguiente",
+        "correo": "Correo electrónico o teléfono",
+        "password": "Ingresa tu contraseña",
+        "microfono": "Silenciar micrófono",
+        "mas": "Más",
+        "pausar": "Pausar grabación",
+        "pausada": "Grabación en pausa",
+        "grabando": "Grabando...",
+        "salir": "Salir",
+        "perfil": "Perfil",
+    },
+    "en": {
+        "unirse_navegador": "Join from your browser",
+        "anfitrion": "Host sign in",
+        "nombre": "Your Name",
+        "entrar": "Join",
+        "google": "Sign in with Google",
+        "siguiente": "Next",
+        "correo": "Email or phone",
+        "password": "Enter your password",
+        "microfono": "Mute",
+        "mas": "More",
+        "pausar": "Pause recording",
+        "pausada": "Recording paused",
+        "grabando": "Recording...",
+        "salir": "Leave",
+        "perfil": "Profile",
+    },
+}
+
+COOKIE_ZOOM = "mock_zoom_sesion"
+COOKIE_GOOGLE = "mock_google_cuenta"
+
+
+def _pagina(titulo: str, cuerpo: str) -> bytes:
+    return (f"<!doctype html><html><head><meta charset='utf-8'><title>{html.escape(titulo)}</title>"
+            f"</head><body>{cuerpo}</body></html>").encode("utf-8")
+
+
+def _ui_web_client(t: dict, v: Variante, reunion: str, con_anfitrion: bool) -> str:
+    """Pre-unión; al pulsar "Entrar" monta la UI de la reunión sin navegar, como el Web Client."""
+    # target=_top: con la variante iframe el login sale del marco, como en el Web Client real
+    anfitrion = (f"<a href='/signin?continue={quote('/wc/join/' + reunion)}' target='_top'>{t['anfitrion']}</a>"
+                 if con_anfitrion else "")
+    if v.menu_mas:
+        pausa = (f"<button id='mas' aria-label='{t['mas']}'>{t['mas']}</button>"
+                 f"<div id='menu'></div>")
+    else:
+        pausa = f"<button id='pausa' aria-label='{t['pausar']}'>{t['pausar']}</button>"
+    reunion_html = (f"<div id='wc-footer'><button aria-label='{t['microfono']}'>{t['microfono']}</button>"
+                    f"{pausa}<button class='footer__leave-btn' aria-label='{t['salir']}'>{t['salir']}</button>"
+                    f"</div><div id='indicador'>{t['grabando']}</div>")
+    return f"""
+<div id='preview'>
+  <input id='inputname' name='uname' placeholder='{t['nombre']}'>
+  <button id='joinBtn' class='preview-join-button'>{t['entrar']}</button>
+  {anfitrion}
+</div>
+<script>
+const evento = tipo => fetch('/__evento?tipo=' + tipo);
+function pausar() {{
+  evento('pausa');
+  document.getElementById('indicador').textContent = {t['pausada']!r};
+}}
+function montarReunion() {{
+  document.body.innerHTML = {reunion_html!r};
+  const pausa = document.getElementById('pausa');
+  if (pausa) pausa.onclick = pausar;
+  const mas = document.getElementById('mas');
+  if (mas) mas.onclick = () => {{
+    document.getElementById('menu').innerHTML =
+      "<div role='menu'><button role='menuitem' id='pausa' aria-label={t['pausar']!r}>{t['pausar']}</button></div>";
+    document.getElementById('pausa').onclick = pausar;
+  }};
+  evento('en_reunion');
+}}
+document.getElementById('joinBtn').onclick = () => {{
+  evento('entrar');
+  setTimeout(montarReunion, {v.demora_unirse_ms});
+}};
+</script>"""
+
+
+class _Manejador(BaseHTTPRequestHandler):
+    server: "ServidorMock"
+
+    def log_message(self, *args):
+        pass
+
+    # ---------- utilidades ----------
+    def _cookies(self) -> dict:
+        cookies = {}
+        for par in (self.headers.get("Cookie") or "").split(";"):
+            if "=" in par:
+                k, val = par.strip().split("=", 1)
+                cookies[k] = val
+        return cookies
+
+    def _enviar(self, cuerpo: bytes, estado: int = 200, cabeceras: dict = None):
+        self.send_response(estado)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(cuerpo)))
+        self.send_header("Cache-Control", "no-store")
+        for k, val in (cabeceras or {}).items():
+            self.send_header(k, val)
+        self.end_headers()
+        self.wfile.write(cuerpo)
+
+    def _redirigir(self, url: str, cookie: str = None):
+        cabeceras = {"Location": url}
+        if cookie:
+            cabeceras["Set-Cookie"] = f"{cookie}=1; Path=/; Secure; SameSite=Lax"
+        self._enviar(b"", 302, cabeceras)
+
+    # ---------- rutas ----------
+    def do_GET(self):
+        partes = urlsplit(self.path)
+        ruta, q = partes.path, {k: v[0] for k, v in parse_qs(partes.query).items()}
+        host = (self.headers.get("Host") or "").split(":")[0]
+        if ruta == "/__evento":
+            self.server.registrar(q.get("tipo", "?"), host)
+            self._enviar(b"", 204)
+            return
+        if ruta == "/favicon.ico":
+            self._enviar(b"", 404)
+            return
+        self.server.registrar(f"GET {ruta}", host)
+        v = self.server.variante
+        if v.latencia_ms:
+            time.sleep(v.latencia_ms / 1000)
+        t = TEXTOS[v.idioma]
+        if host.endswith("accounts.google.com"):
+            self._google(ruta, q, t)
+        else:
+            self._zoom(host, ruta, q, t, v)
+
+    def _zoom(self, host: str, ruta: str, q: dict, t: dict, v: Variante):
+        sesion = COOKIE_ZOOM in self._cookies() or not v.requiere_login
+        partes = ruta.strip("/").split("/")
+        if ruta.startswith("/j/"):
+            reunion = partes[-1]
+            self._enviar(_pagina("Launch Meeting - Zoom",
+                                 f"<a href='/wc/join/{reunion}'>{t['unirse_navegador']}</a>"))
+        elif ruta.startswith("/wc/join/"):
+            reunion = partes[-1]
+            if v.iframe:
+                self._enviar(_pagina("Zoom", f"<iframe id='webclient' src='/wc/{reunion}/cliente' "
+                                             f"style='width:100%;height:90vh;border:0'></iframe>"))
+            else:
+                self._enviar(_pagina("Zoom", _ui_web_client(t, v, reunion, not sesion)))
+        elif ruta.startswith("/wc/") and ruta.endswith("/cliente"):
+            self._enviar(_pagina("Zoom Web Client", _ui_web_client(t, v, partes[1], not sesion)))
+        elif ruta == "/signin":
+            siguiente = quote(q.get("continue", "/profile"), safe="")
+            self._enviar(_pagina("Sign In - Zoom",
+                                 f"<button data-qa='google-signin' onclick=\"location='/signin/google?continue={siguiente}'\">"
+                                 f"{t['google']}</button>"))
+        elif ruta == "/signin/google":
+            regreso = f"https://{host}/signin/google/callback?continue={quote(q.get('continue', '/profile'), safe='')}"
+            self._redirigir(f"https://accounts.google.com/accountchooser?continue={quote(regreso, safe='')}")
+        elif ruta == "/signin/google/callback":
+            self._redirigir(q.get("continue", "/profile"), cookie=COOKIE_ZOOM)
+        elif ruta == "/profile":
+            if sesion:
+                self._enviar(_pagina("Profile - Zoom", f"<div aria-label='Profile' class='user-menu'>{t['perfil']}</div>"))
+            else:
+                self._redirigir("/signin")
+        else:
+            self._enviar(_pagina("Zoom", "404"), 404)
+
+    def _google(self, ruta: str, q: dict, t: dict):
+        regreso = q.get("continue", "https://zoom.us/profile")
+        seguir = quote(regreso, safe="")
+        if ruta == "/accountchooser":
+            correo = self._cookies().get(COOKIE_GOOGLE)
+            if correo:
+                # Cuenta recordada: un click y de vuelta a Zoom
+                cuerpo = (f"<div data-identifier='{html.escape(correo)}' "
+                          f"onclick=\"location='/challenge/pwd?continue={seguir}&recordada=1'\">{html.escape(correo)}</div>")
+            else:
+                cuerpo = (f"<form action='/challenge/pwd' method='get'>"
+                          f"<input type='hidden' name='continue' value='{html.escape(regreso)}'>"
+                          f"<input type='email' name='identifier' aria-label='{t['correo']}'>"
+                          f"<button type='submit'><span>{t['siguiente']}</span></button></form>")
+            self._enviar(_pagina("Sign in - Google Accounts", cuerpo))
+        elif ruta == "/challenge/pwd":
+            if q.get("recordada"):
+                self._redirigir(regreso)
+                return
+            correo = q.get("identifier", "")
+            cuerpo = (f"<form action='/challenge/done' method='get'>"
+                      f"<input type='hidden' name='continue' value='{html.escape(regreso)}'>"
+                      f"<input type='hidden' name='identifier' value='{html.escape(correo)}'>"
+                      f"<input type='password' name='Passwd' aria-label='{t['password']}'>"
+                      f"<button type='submit'><span>{t['siguiente']}</span></button></form>")
+            self._enviar(_pagina("Sign in - Google Accounts", cuerpo))
+        elif ruta == "/challenge/done":
+            self.send_response(302)
+            self.send_header("Location", regreso)
+            self.send_header("Set-Cookie", f"{COOKIE_GOOGLE}={q.get('identifier', '')}; Path=/; Secure; SameSite=None")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+        else:
+            self._enviar(_pagina("Google", "404"), 404)
+
+
+def generar_certificado(directorio: str) -> tuple:
+    """Certificado autofirmado para zoom.us y accounts.google.com (Chrome ignora el error)."""
+    os.makedirs(directorio, exist_ok=True)
+    cert, clave = os.path.join(directorio, "mock.crt"), os.path.join(directorio, "mock.key")
+    if not (os.path.exists(cert) and os.path.exists(clave)):
+        subprocess.run(
+            ["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "30",
+             "-keyout", clave, "-out", cert, "-subj", "/CN=zoom.us",
+             "-addext", "subjectAltName=DNS:zoom.us,DNS:*.zoom.us,DNS:accounts.google.com,DNS:localhost"],
+            check=True, capture_output=True,
+        )
+    return cert, clave
+
+
+class ServidorMock(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, puerto: int = 0, variante: Variante = None, tls: bool = True):
+        super().__init__(("127.0.0.1", puerto), _Manejador)
+        self.variante = variante or Variante()
+        self._eventos = []
+        self._lock = threading.Lock()
+        if tls:
+            contexto = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+            contexto.load_cert_chain(*generar_certificado(
+                os.path.join(tempfile.gettempdir(), "mock_zoom_google")))
+            self.socket = contexto.wrap_socket(self.socket, server_side=True)
+
+    @property
+    def puerto(self) -> int:
+        return self.server_address[1]
+
+    def registrar(self, tipo: str, host: str):
+        with self._lock:
+            self._eventos.append((time.monotonic(), tipo, host))
+
+    def eventos(self, desde: float = 0.0) -> list:
+        """[(time.monotonic(), tipo, host)] registrados a partir de 'desde'."""
+        with self._lock:
+            return [e for e in self._eventos if e[0] >= desde]
+
+    def flags_chrome(self) -> list:
+        """Flags para que Chrome resuelva los dominios reales contra este servidor."""
+        destino = f"127.0.0.1:{self.puerto}"
+        return [
+            f"--host-resolver-rules=MAP zoom.us {destino}, MAP *.zoom.us {destino}, "
+            f"MAP accounts.google.com {destino}",
+            "--ignore-certificate-errors",
+        ]
+
+    def iniciar(self) -> "ServidorMock":
+        threading.Thread(target=self.serve_forever, daemon=True, name="mock-zoom").start()
+        return self
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--puerto", type=int, default=8443)
+    parser.add_argument("--idioma", choices=sorted(TEXTOS), default="es")
+    parser.add_argument("--iframe", action="store_true", help="Web Client dentro de un iframe")
+    parser.add_argument("--menu-mas", action="store_true", help="pausa dentro del menú 'Más'")
+    parser.add_argument("--latencia-ms", type=int, default=0)
+    parser.add_argument("--demora-unirse-ms", type=int, default=0)
+    parser.add_argument("--sin-login", action="store_true", help="la pre-unión no pide iniciar sesión")
+    args = parser.parse_args()
+
+    servidor = ServidorMock(args.puerto, Variante(
+        idioma=args.idioma, iframe=args.iframe, menu_mas=args.menu_mas, latencia_ms=args.latencia_ms,
+        demora_unirse_ms=args.demora_unirse_ms, requiere_login=not args.sin_login,
+    ))
+    print(f"🧪 Zoom/Google de prueba en https://127.0.0.1:{servidor.puerto}")
+    print("   Flags de Chrome:")
+    for flag in servidor.flags_chrome():
+        print(f"     {flag}")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
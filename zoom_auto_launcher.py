@@ -1,12 +1,37 @@
 import os
+import abc
+import json
 import time
+import copy
+import ctypes
+import select
+import bisect
+import struct
+import heapq
+import asyncio
+import argparse
+import csv
+import itertools
+import logging.handlers
 import platform
 import subprocess
+import shutil
+import sqlite3
 import tempfile
+import uuid
+import weakref
+import pathlib
 from urllib.parse import quote
 from datetime import datetime, timedelta, time as dtime
 from zoneinfo import ZoneInfo
 import threading
+from collections import deque
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from contextlib import contextmanager, nullcontext, redirect_stdout
+from dataclasses import dataclass
+
+from sortedcontainers import SortedList
 
 from selenium import webdriver
 from selenium.webdriver.common.by import By
@@ -15,8 +40,17 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
 from webdriver_manager.chrome import ChromeDriverManager
+from webdriver_manager.core.os_manager import ChromeType, OperationSystemManager
 from selenium.webdriver.common.action_chains import ActionChains
 from selenium.webdriver.common.keys import Keys
+from selenium.webdriver.remote.command import Command
+from selenium.webdriver.remote.switch_to import SwitchTo
+
+# Clonado copy-on-write de perfiles (ioctl FICLONE); solo en sistemas tipo Unix
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
 
 # Opcional para la app de Zoom (atajos a nivel del SO)
 try:
@@ -24,6 +58,30 @@ try:
 except Exception:
     pyautogui = None
 
+# Opcional para detectar la ventana de la app de Zoom: Xlib en Linux/X11,
+# pygetwindow en Windows/macOS (en Linux pygetwindow no importa)
+try:
+    from Xlib import X, display as xdisplay, protocol as xprotocol  # pip install python3-xlib
+except Exception:
+    X = xdisplay = xprotocol = None
+try:
+    import pygetwindow as gw  # pip install pygetwindow
+except Exception:
+    gw = None
+
+# Opcional para verificar en pantalla que la grabación quedó pausada (modo zoom_app)
+try:
+    import pyscreeze  # pip install pyscreeze pillow
+    from PIL import Image
+except Exception:
+    pyscreeze = Image = None
+
+# Opcional para calcular en lote los próximos runs de catálogos grandes
+try:
+    import numpy as np  # pip install numpy
+except Exception:
+    np = None
+
 
 # =====================================
 # CONFIGURACIÓN
@@ -37,6 +95,89 @@ ZOOM_PASSWORD = "Utpunivirtual2020"           # ← Cambia si corresponde
 # Perfil de Chrome para guardar sesión (crear automáticamente)
 CHROME_PROFILE_DIR = os.path.join(tempfile.gettempdir(), "zoom_chrome_profile")
 
+# ChromeDriver: ruta local fija (hosts sin red) o None para resolverlo al arrancar.
+# La ruta resuelta se guarda en una caché por versión mayor de Chrome.
+CHROMEDRIVER_PATH = os.environ.get("ZOOM_CHROMEDRIVER") or None
+CHROMEDRIVER_CACHE = os.path.join(os.path.expanduser("~"), ".cache", "zoom_auto_launcher", "chromedriver.json")
+
+# Sesiones guardadas (cookies de Zoom/Google por cuenta), fuera del directorio temporal
+SESIONES_DIR = os.path.join(os.path.expanduser("~"), ".local", "share", "zoom_auto_launcher", "sesiones")
+DOMINIOS_SESION = ("zoom.us", "google.com")
+COOKIES_SESION_ZOOM = ("_zm_ssid", "_zm_page_auth", "zm_aid")  # las que sostienen el login de Zoom
+SESION_MAX_EDAD_H = 72          # si no se encuentran esas cookies, renovar tras este tiempo
+REFRESCAR_SESION_ANTES_H = 12   # renovar en segundo plano si vence antes de estas horas
+REFRESCAR_SESION_ESPERA_MAX_H = 6  # tope de la espera (creciente) entre renovaciones que no alargan la sesión
+TENANT_SESION = "https://renata.zoom.us"
+
+# Trazas por lanzamiento: spans por fase en JSON lines, con rotación por tamaño
+USAR_TRAZAS = True
+TRAZAS_ARCHIVO = os.path.join(os.path.expanduser("~"), ".local", "share", "zoom_auto_launcher", "trazas.jsonl")
+TRAZAS_MAX_BYTES = 5 * 1024 * 1024
+TRAZAS_COPIAS = 3
+
+# Métricas OpenMetrics (opcionales): endpoint HTTP local y/o archivo de texto para el
+# textfile collector de node_exporter. None = desactivado (también --metricas / --metricas-archivo)
+METRICAS_PUERTO = None
+METRICAS_ARCHIVO = None
+METRICAS_INTERVALO_S = 15     # cada cuánto se reescribe METRICAS_ARCHIVO
+METRICAS_MAX_PROXIMAS = 200   # series de "próximo disparo" (las más cercanas) por scrape
+
+# Esperas por eventos en el flujo de unión (en vez de pausas fijas). Son topes:
+# en una red rápida la condición se cumple en milisegundos; en una lenta se espera hasta aquí.
+ESPERA_CARGA_S = 30        # document.readyState == 'complete' tras driver.get
+ESPERA_NAVEGACION_S = 15   # cambio de URL tras un click que navega
+
+# Eventos de navegación por WebDriver BiDi (sin BiDi se vuelve al sondeo de la URL)
+USAR_BIDI = True
+
+# Orden aprendido de los selectores XPath de respaldo (por tenant e idioma de la UI)
+SELECTORES_CACHE = os.path.join(os.path.expanduser("~"), ".cache", "zoom_auto_launcher", "selectores.json")
+SELECTORES_OMITIR_TRAS = 10   # omitir un selector tras N aperturas seguidas en que ganó otro
+
+# Modo ligero para servidores sin usuario frente a la pantalla: Chrome headless,
+# ventana pequeña fija y sin servicios de fondo. Se puede activar por reunión con "ligero".
+MODO_LIGERO = False
+VENTANA_LIGERO = "1280,720"
+# El modo ligero usa su propio perfil: Chrome no admite dos procesos sobre el mismo
+# user-data-dir (la sesión se restaura desde el almacén de sesiones)
+CHROME_PROFILE_LIGERO_DIR = CHROME_PROFILE_DIR + "_ligero"
+# Flags de Chrome adicionales para todas las aperturas (p. ej. --host-resolver-rules
+# para apuntar zoom.us y accounts.google.com al servidor de prueba mock_zoom_google.py)
+CHROME_ARGS_EXTRA = []
+
+# Clones de perfil: cada Chrome del pool con perfil persistente arranca sobre una copia
+# del perfil "dorado" (solo cookies y almacenamiento local), así varias reuniones
+# simultáneas no compiten por el mismo user-data-dir
+CLONAR_PERFILES = True
+PERFILES_CLON_DIR = os.path.join(tempfile.gettempdir(), "zoom_chrome_clones")
+
+# Ciclo de vida (modo navegador_auto): al terminar la clase se sale de la reunión y se
+# libera el navegador. Cada reunión declara "duracion_min" o "hora_fin" ("HH:MM").
+MARGEN_FIN_MIN = 5                 # minutos de gracia tras la hora de fin declarada
+CICLO_VIDA_SONDEO_S = 30           # cada cuánto se mira si la reunión terminó en la UI
+CICLO_VIDA_ESPERA_NAVEGADOR_S = 2  # si el Chrome está ocupado con otra apertura, se revisa en el próximo sondeo
+# Unión fallida (2FA, captcha, primer login): False = el navegador queda abierto para
+# terminarla a mano hasta la hora de fin; True = se cierra en el acto
+CERRAR_NAVEGADOR_SI_FALLA = False
+RETENER_PRECALENTADA_S = 15 * 60   # no cerrar un Chrome ocioso precalentado hace menos de esto
+
+# App de Zoom: tope de espera por la ventana de la reunión antes de enviar el atajo,
+# y títulos con los que se la reconoce (en minúsculas)
+ZOOM_APP_ESPERA_S = 60
+TITULOS_VENTANA_ZOOM = ("zoom meeting", "reunión de zoom", "reunión zoom", "zoom workplace")
+
+# Verificación de la pausa en la app: recortes PNG del indicador de grabación de tu
+# Zoom (tomados de una captura de pantalla). Sin ellos no se verifica.
+PLANTILLA_GRABANDO = os.path.join(os.path.dirname(os.path.abspath(__file__)), "plantillas", "grabando.png")
+PLANTILLA_PAUSADA = os.path.join(os.path.dirname(os.path.abspath(__file__)), "plantillas", "grabacion_pausada.png")
+INDICADOR_CACHE = os.path.join(os.path.expanduser("~"), ".cache", "zoom_auto_launcher", "indicador.json")
+INDICADOR_ESCALA = 0.5       # se compara a media resolución y en escala de grises
+INDICADOR_UMBRAL = 0.85      # correlación normalizada mínima para dar por visto el indicador
+REINTENTOS_PAUSA_APP = 2     # reenvíos del atajo si el indicador sigue en "grabando"
+CUADROS_ESTABLES_PAUSA_APP = 3   # capturas seguidas con el mismo estado antes de decidir
+INTERVALO_CUADROS_PAUSA_APP_S = 0.25
+ESPERA_ESTABLE_PAUSA_APP_S = 5   # si el indicador no se estabiliza en este tiempo, no se reenvía
+
 # Comportamiento de sesión
 GUARDAR_SESION = True   # True = guarda cookies/sesión; False = sesión desechable
 PRIMERA_VEZ = False     # True = forzar login Google y almacenar sesión; luego ponlo en False
@@ -44,6 +185,22 @@ PRIMERA_VEZ = False     # True = forzar login Google y almacenar sesión; luego
 # Zona horaria local
 TZ = ZoneInfo("America/Bogota")
 
+# Máximo de aperturas (navegador/app) ejecutándose a la vez
+MAX_LANZAMIENTOS_CONCURRENTES = 4
+
+# Precalentamiento (modo navegador_auto): minutos antes de la apertura en que se
+# levanta Chrome y se verifica la sesión. 0 = desactivado. Se puede cambiar por
+# reunión con "precalentar_min".
+PRECALENTAR_MIN = 3
+# Máximo de segundos que una apertura espera por un navegador libre del pool
+PRECALENTAR_ESPERA_S = 90
+
+# Pool de navegadores: Chrome de larga vida, una pestaña por reunión
+USAR_POOL_NAVEGADORES = True
+MAX_NAVEGADORES_POR_PERFIL = 2      # instancias por perfil (con CLONAR_PERFILES cada una usa su clon)
+RECICLAR_NAVEGADOR_USOS = 20        # reciclar una instancia tras N aperturas...
+RECICLAR_NAVEGADOR_RSS_MB = 2048    # ...o si su memoria (RSS) supera este umbral
+
 # Reuniones a abrir (ejemplos con programación)
 reuniones = [
     {
@@ -127,6 +284,589 @@ def build_webclient_url(meeting_url: str, as_host: bool = True, display_name: st
         else:
             return f"{base}/wc/join/{mid}?uname={quote(display_name)}"
 
+# =====================================
+# TRAZAS DE LANZAMIENTO (JSON LINES)
+# =====================================
+class Trazador:
+    """
+    Una traza por lanzamiento: un id y spans anidados con la fase, inicio y fin en
+    time.monotonic(), el resultado y atributos (p. ej. el selector que ganó). Al terminar
+    el lanzamiento se escribe un span por línea en TRAZAS_ARCHIVO (rotación por tamaño).
+    La traza activa es por hilo: cada apertura corre entera en un worker del pool.
+    """
+
+    def __init__(self, ruta: str = None, max_bytes: int = None, copias: int = None):
+        self.ruta = ruta or TRAZAS_ARCHIVO
+        self.max_bytes = max_bytes or TRAZAS_MAX_BYTES
+        self.copias = copias or TRAZAS_COPIAS
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._archivo = None
+
+    def _escribir(self, spans: list):
+        with self._lock:
+            if self._archivo is None:
+                os.makedirs(os.path.dirname(self.ruta) or ".", exist_ok=True)
+                self._archivo = logging.handlers.RotatingFileHandler(
+                    self.ruta, maxBytes=self.max_bytes, backupCount=self.copias, encoding="utf-8", delay=True)
+            for span in spans:
+                self._archivo.handle(logging.makeLogRecord(
+                    {"msg": json.dumps(span, ensure_ascii=False, default=str)}))
+
+    @contextmanager
+    def lanzamiento(self, fase: str, **atributos):
+        """Span raíz de una apertura; los span() del mismo hilo quedan dentro."""
+        if getattr(self._local, "traza", None) is not None:
+            with self.span(fase, **atributos) as span:
+                yield span
+            return
+        traza = self._local.traza = {"id": uuid.uuid4().hex[:12], "seq": itertools.count(1),
+                                     "pila": [], "spans": []}
+        try:
+            with self.span(fase, ts=datetime.now(TZ).isoformat(timespec="seconds"), **atributos) as span:
+                yield span
+        finally:
+            self._local.traza = None
+            spans = sorted(traza["spans"], key=lambda s: s["span"])
+            METRICAS.registrar_traza(spans)
+            if USAR_TRAZAS:
+                try:
+                    self._escribir(spans)
+                except OSError as e:
+                    print(f"   ⚠️ No pude escribir la traza en {self.ruta}: {e}")
+
+    @contextmanager
+    def span(self, fase: str, **atributos):
+        """Span hijo del activo; fuera de un lanzamiento no registra nada."""
+        traza = getattr(self._local, "traza", None)
+        if traza is None:
+            yield {}
+            return
+        pila = traza["pila"]
+        span = {"traza": traza["id"], "span": next(traza["seq"]),
+                "padre": pila[-1]["span"] if pila else None, "fase": fase, **atributos}
+        pila.append(span)
+        span["inicio"] = time.monotonic()
+        try:
+            yield span
+        except BaseException as e:
+            span.setdefault("resultado", f"error: {type(e).__name__}")
+            raise
+        finally:
+            span["fin"] = time.monotonic()
+            span["dur_s"] = round(span["fin"] - span["inicio"], 4)
+            span.setdefault("resultado", "ok")
+            pila.pop()
+            traza["spans"].append(span)
+
+    def anotar(self, **atributos):
+        """Agrega atributos al span activo (si hay una traza en curso)."""
+        traza = getattr(self._local, "traza", None)
+        if traza is not None and traza["pila"]:
+            traza["pila"][-1].update(atributos)
+
+    def anotar_selector(self, lista: str, selector: str):
+        traza = getattr(self._local, "traza", None)
+        if traza is not None and traza["pila"]:
+            traza["pila"][-1].setdefault("selectores", {})[lista] = selector
+
+
+TRAZADOR = Trazador()
+
+def _leer_trazas(ruta: str) -> list:
+    """Spans de 'ruta' y de sus copias rotadas (.1, .2, ...), de la más vieja a la más nueva."""
+    rutas = [f"{ruta}.{i}" for i in range(TRAZAS_COPIAS, 0, -1)] + [ruta]
+    spans = []
+    for r in rutas:
+        try:
+            with open(r, encoding="utf-8") as f:
+                for linea in f:
+                    try:
+                        spans.append(json.loads(linea))
+                    except ValueError:
+                        continue  # línea cortada por una escritura interrumpida
+        except FileNotFoundError:
+            continue
+    return spans
+
+def resumen_trazas(ruta: str = None) -> str:
+    """p50/p95/p99 de la duración de cada fase en todas las trazas guardadas."""
+    ruta = ruta or TRAZAS_ARCHIVO
+    por_fase, errores, trazas = {}, {}, set()
+    for span in _leer_trazas(ruta):
+        if "dur_s" not in span:
+            continue
+        trazas.add(span.get("traza"))
+        fase = span.get("fase", "?") + (f" [{span['modo']}]" if span.get("modo") else "")
+        por_fase.setdefault(fase, []).append(span["dur_s"])
+        if span.get("resultado", "ok") != "ok":
+            errores[fase] = errores.get(fase, 0) + 1
+    if not por_fase:
+        return f"sin trazas en {ruta}"
+    ancho = max(len(f) for f in por_fase)
+    lineas = [f"{len(trazas)} lanzamientos en {ruta}",
+              f"{'fase':<{ancho}}  {'n':>5} {'p50':>8} {'p95':>8} {'p99':>8}  no-ok"]
+    for fase, durs in sorted(por_fase.items()):
+        p = [_percentil(durs, q) for q in (50, 95, 99)]
+        lineas.append(f"{fase:<{ancho}}  {len(durs):>5} {p[0]:>7.2f}s {p[1]:>7.2f}s {p[2]:>7.2f}s  "
+                      f"{errores.get(fase, 0)}")
+    return "\n".join(lineas)
+
+
+class MedidorFases:
+    """
+    Tiempo real de cada espera del flujo de unión frente a la pausa fija que reemplaza,
+    acumulado por fase, para reportar cuánto se ahorra.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._fases = {}  # fase -> [veces, segundos reales, segundos de la pausa fija]
+
+    @contextmanager
+    def fase(self, nombre: str, fijo_s: float):
+        t0 = time.monotonic()
+        try:
+            with TRAZADOR.span(nombre, fijo_s=fijo_s):
+                yield
+        finally:
+            real = time.monotonic() - t0
+            with self._lock:
+                acum = self._fases.setdefault(nombre, [0, 0.0, 0.0])
+                acum[0] += 1
+                acum[1] += real
+                acum[2] += fijo_s
+
+    def por_fase(self) -> dict:
+        """Segundos reales acumulados por fase."""
+        with self._lock:
+            return {nombre: real for nombre, (_, real, _) in self._fases.items()}
+
+    def ahorro_total(self) -> float:
+        with self._lock:
+            return sum(fijo - real for _, real, fijo in self._fases.values())
+
+    def resumen(self) -> str:
+        with self._lock:
+            if not self._fases:
+                return "sin esperas registradas"
+            lineas = [
+                f"   {nombre}: {veces}x, {real / veces:.2f}s en promedio "
+                f"(antes {fijo / veces:.1f}s) → ahorro {fijo - real:+.1f}s"
+                for nombre, (veces, real, fijo) in sorted(self._fases.items())
+            ]
+        return f"ahorro total {self.ahorro_total():+.1f}s\n" + "\n".join(lineas)
+
+
+MEDIDOR_FASES = MedidorFases()
+
+class EventosNavegacion:
+    """
+    Flujo de eventos de navegación de un driver (WebDriver BiDi, browsingContext.*):
+    inicio, commit y load de cada navegación, y cambios de URL del historial/fragmento.
+    Guarda por pestaña (contexto BiDi = window handle) la última URL, si terminó de
+    cargar y un contador de eventos, para que el flujo de unión espere el evento
+    en vez de leer driver.current_url en bucle.
+    """
+
+    _EVENTOS = ("navigation_started", "navigation_committed", "load",
+                "fragment_navigated", "history_updated")
+
+    def __init__(self, driver):
+        self._cond = threading.Condition()
+        self._pestanas = {}  # contexto -> {"url", "cargado", "seq", "evento"}
+        self._seq = 0
+        self._bc = driver.browsing_context
+        self._suscripciones = [
+            (ev, self._bc.add_event_handler(ev, lambda info, ev=ev: self._recibir(ev, info)))
+            for ev in self._EVENTOS
+        ]
+
+    def _recibir(self, evento: str, info):
+        contexto = getattr(info, "context", None)
+        url = getattr(info, "url", None)
+        with self._cond:
+            self._seq += 1
+            st = self._pestanas.setdefault(contexto, {"url": None, "cargado": False})
+            if url:
+                st["url"] = url
+            if evento == "navigation_started":
+                st["cargado"] = False
+            elif evento == "load":
+                st["cargado"] = True
+            st["seq"] = self._seq
+            st["evento"] = evento
+            self._cond.notify_all()
+
+    def estado(self, contexto: str) -> dict:
+        with self._cond:
+            return dict(self._pestanas.get(contexto, {"url": None, "cargado": False, "seq": 0}))
+
+    def esperar(self, contexto: str, pred, timeout: float) -> bool:
+        """Bloquea hasta que pred(estado de la pestaña) sea cierto o venza el tope."""
+        with self._cond:
+            return self._cond.wait_for(
+                lambda: pred(self._pestanas.get(contexto, {"url": None, "cargado": False, "seq": 0})),
+                timeout,
+            )
+
+    def esperar_evento(self, contexto: str, desde_seq: int, timeout: float) -> bool:
+        """Espera cualquier evento nuevo de la pestaña posterior a desde_seq."""
+        return self.esperar(contexto, lambda st: st.get("seq", 0) > desde_seq, timeout)
+
+    def cerrar(self):
+        for ev, cid in self._suscripciones:
+            try:
+                self._bc.remove_event_handler(ev, cid)
+            except Exception:
+                pass
+        self._suscripciones = []
+
+
+_eventos_por_driver = weakref.WeakKeyDictionary()
+_eventos_lock = threading.Lock()
+
+def eventos_de(driver):
+    """EventosNavegacion del driver (se suscribe la primera vez); None si no hay BiDi."""
+    if not USAR_BIDI:
+        return None
+    with _eventos_lock:
+        try:
+            if driver in _eventos_por_driver:
+                return _eventos_por_driver[driver]
+        except TypeError:
+            return None
+        try:
+            eventos = EventosNavegacion(driver)
+        except Exception as e:
+            print(f"   ℹ️ Sin eventos BiDi de navegación ({e}); se usará sondeo.")
+            eventos = None
+        _eventos_por_driver[driver] = eventos
+        return eventos
+
+def _pestana_actual(driver) -> str | None:
+    try:
+        return driver.current_window_handle
+    except Exception:
+        return None
+
+def esperar_condicion(driver, condicion, fase: str, fijo_s: float, timeout: float) -> bool:
+    """WebDriverWait sobre 'condicion' medido en MEDIDOR_FASES; False si venció el tope."""
+    with MEDIDOR_FASES.fase(fase, fijo_s):
+        try:
+            WebDriverWait(driver, timeout, poll_frequency=0.1).until(condicion)
+            return True
+        except Exception:
+            return False
+
+def _documento_listo(driver) -> bool:
+    try:
+        return driver.execute_script("return document.readyState") == "complete"
+    except Exception:
+        return False
+
+def esperar_carga(driver, fase: str, fijo_s: float = 2, url_previa: str = None,
+                  timeout: float = None) -> bool:
+    """
+    Espera a que la página termine de cargar. Con url_previa, además a que la URL
+    haya cambiado (navegación disparada por un click o una redirección).
+    """
+    tope = timeout or (ESPERA_CARGA_S if url_previa is None else ESPERA_NAVEGACION_S)
+    eventos = eventos_de(driver) if url_previa is not None else None
+    contexto = _pestana_actual(driver) if eventos else None
+    if contexto:
+        # Con BiDi: despertar con el evento 'load' de la nueva URL, sin sondear. Si la
+        # navegación ya había terminado al llegar aquí, se confirma con una sola lectura.
+        with MEDIDOR_FASES.fase(fase, fijo_s):
+            inicial = eventos.estado(contexto)
+            ya_navego = driver.current_url != url_previa and _documento_listo(driver)
+            return ya_navego or eventos.esperar(
+                contexto,
+                lambda st: (st.get("seq", 0) > inicial.get("seq", 0) and st["cargado"]
+                            and st["url"] not in (None, url_previa)),
+                tope,
+            )
+    if url_previa is None:
+        cond = _documento_listo
+    else:
+        cond = lambda d: d.current_url != url_previa and _documento_listo(d)
+    return esperar_condicion(driver, cond, fase, fijo_s, tope)
+
+class EstadisticasSelectores:
+    """
+    Aciertos por selector de cada lista de respaldo (google_btn_selectors, link_selectors,
+    posibles_botones, pause_selectors, join_from_browser), separados por tenant e idioma.
+    Cada fallo cuesta un WebDriverWait completo, así que el último ganador se prueba
+    primero y los que llevan SELECTORES_OMITIR_TRAS derrotas seguidas solo se prueban
+    si fallan todos los demás. Se guarda en SELECTORES_CACHE entre ejecuciones.
+    """
+
+    def __init__(self, ruta: str = None):
+        self.ruta = ruta or SELECTORES_CACHE
+        self._lock = threading.Lock()
+        self._datos = None  # "lista|tenant|idioma" -> {"ultimo": sx, "selectores": {sx: stats}}
+
+    def _cargar(self) -> dict:
+        if self._datos is None:
+            try:
+                with open(self.ruta, encoding="utf-8") as f:
+                    self._datos = json.load(f)
+            except (OSError, ValueError):
+                self._datos = {}
+        return self._datos
+
+    def _guardar(self):
+        try:
+            os.makedirs(os.path.dirname(self.ruta), exist_ok=True)
+            tmp = self.ruta + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self._datos, f, indent=2, ensure_ascii=False)
+            os.replace(tmp, self.ruta)
+        except OSError as e:
+            print(f"   ⚠️ No pude guardar las estadísticas de selectores: {e}")
+
+    @staticmethod
+    def _clave(lista: str, tenant: str, idioma: str) -> str:
+        return f"{lista}|{tenant}|{idioma}"
+
+    def ordenar(self, lista: str, selectores: list, tenant: str, idioma: str) -> tuple[list, list]:
+        """(a probar primero, omitidos): último ganador, luego por aciertos, luego orden original."""
+        with self._lock:
+            entrada = self._cargar().get(self._clave(lista, tenant, idioma), {})
+        stats = entrada.get("selectores", {})
+        ultimo = entrada.get("ultimo")
+        hubo_ganador = any(st.get("aciertos", 0) for st in stats.values())
+        orden = sorted(
+            range(len(selectores)),
+            key=lambda i: (selectores[i] != ultimo, -stats.get(selectores[i], {}).get("aciertos", 0), i),
+        )
+        activos, omitidos = [], []
+        for i in orden:
+            sx = selectores[i]
+            derrotas = stats.get(sx, {}).get("derrotas_seguidas", 0)
+            (omitidos if hubo_ganador and derrotas >= SELECTORES_OMITIR_TRAS else activos).append(sx)
+        return activos, omitidos
+
+    def registrar(self, lista: str, tenant: str, idioma: str, ganador: str, selectores: list):
+        """
+        Suma un acierto al ganador y una derrota a los demás de la lista (probados o no).
+        Solo se llama cuando alguno ganó: si no apareció ninguno, no hay evidencia.
+        """
+        with self._lock:
+            entrada = self._cargar().setdefault(self._clave(lista, tenant, idioma), {"selectores": {}})
+            stats = entrada["selectores"]
+            st = stats.setdefault(ganador, {"aciertos": 0, "derrotas_seguidas": 0})
+            st["aciertos"] += 1
+            st["derrotas_seguidas"] = 0
+            for sx in selectores:
+                if sx == ganador:
+                    continue
+                st = stats.setdefault(sx, {"aciertos": 0, "derrotas_seguidas": 0})
+                st["derrotas_seguidas"] += 1
+            entrada["ultimo"] = ganador
+            self._guardar()
+
+    def volcado(self) -> str:
+        with self._lock:
+            datos = dict(self._cargar())
+        if not datos:
+            return f"Sin estadísticas de selectores todavía ({self.ruta})."
+        lineas = [f"Estadísticas de selectores ({self.ruta}):"]
+        for clave in sorted(datos):
+            lista, tenant, idioma = clave.split("|", 2)
+            entrada = datos[clave]
+            lineas.append(f"\n  {lista}  [{tenant}, {idioma}]")
+            orden = sorted(entrada["selectores"].items(), key=lambda kv: -kv[1]["aciertos"])
+            for sx, st in orden:
+                marca = "★" if sx == entrada.get("ultimo") else ("✗" if st["derrotas_seguidas"] >= SELECTORES_OMITIR_TRAS else " ")
+                lineas.append(f"   {marca} {st['aciertos']:>4} aciertos, {st['derrotas_seguidas']:>3} derrotas seguidas  {sx}")
+        return "\n".join(lineas)
+
+
+ESTADISTICAS_SELECTORES = EstadisticasSelectores()
+
+def _contexto_selectores(driver) -> tuple[str, str]:
+    """Tenant (host actual) e idioma del navegador: las claves del orden aprendido."""
+    try:
+        url = driver.current_url
+        tenant = "renata.zoom.us" if "renata.zoom.us" in url else url.split("/")[2] if "//" in url else "?"
+    except Exception:
+        tenant = "?"
+    try:
+        idioma = driver.execute_script("return navigator.language") or "?"
+    except Exception:
+        idioma = "?"
+    return tenant, idioma
+
+# Carrera de selectores en la página: todas las XPaths se evalúan en un solo
+# execute_async_script y un MutationObserver resuelve en cuanto alguna es clickeable.
+# Devuelve [índice, elemento] del primero en orden de prioridad, o null al vencer.
+_JS_CARRERA_SELECTORES = """
+const xpaths = arguments[0], limiteMs = arguments[1], listo = arguments[arguments.length - 1];
+function clickeable(el) {
+    if (!el || el.disabled || !el.isConnected) return false;
+    const r = el.getBoundingClientRect();
+    if (r.width === 0 && r.height === 0) return false;
+    const st = getComputedStyle(el);
+    return st.visibility !== 'hidden' && st.display !== 'none' && st.pointerEvents !== 'none';
+}
+function buscar() {
+    for (let i = 0; i < xpaths.length; i++) {
+        let res;
+        try {
+            res = document.evaluate(xpaths[i], document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+        } catch (e) { continue; }
+        for (let j = 0; j < res.snapshotLength; j++) {
+            const el = res.snapshotItem(j);
+            if (clickeable(el)) return [i, el];
+        }
+    }
+    return null;
+}
+const primero = buscar();
+if (primero || limiteMs <= 0) { listo(primero); return; }
+let terminado = false, pendiente = false, obs = null, sondeo = null, limite = null;
+function terminar(hit) {
+    if (terminado) return;
+    terminado = true;
+    if (obs) obs.disconnect();
+    clearInterval(sondeo);
+    clearTimeout(limite);
+    listo(hit);
+}
+function revisar() {
+    pendiente = false;
+    const hit = buscar();
+    if (hit) terminar(hit);
+}
+obs = new MutationObserver(function () {
+    // Agrupar ráfagas de mutaciones (el Web Client re-renderiza mucho)
+    if (!pendiente) { pendiente = true; setTimeout(revisar, 16); }
+});
+obs.observe(document.documentElement || document, {childList: true, subtree: true, attributes: true});
+// Cambios de estilo por CSS/animaciones no generan mutaciones: sondeo de respaldo
+sondeo = setInterval(revisar, 250);
+limite = setTimeout(function () { terminar(buscar()); }, limiteMs);
+"""
+
+def carrera_selectores(driver, selectores: list, timeout: float):
+    """
+    Espera a que CUALQUIERA de las XPaths sea clickeable con un solo tope 'timeout'
+    (en vez de la suma de un WebDriverWait por selector). Devuelve (selector, elemento)
+    del primero según el orden de 'selectores', o (None, None) si venció el tope.
+    """
+    if not selectores:
+        return None, None
+    try:
+        driver.set_script_timeout(timeout + 5)
+        hit = driver.execute_async_script(_JS_CARRERA_SELECTORES, list(selectores), int(timeout * 1000))
+    except Exception:
+        # Página sin JS utilizable (navegando, documento XML...): sondeo desde Selenium
+        def alguno(d):
+            for sx in selectores:
+                try:
+                    el = EC.element_to_be_clickable((By.XPATH, sx))(d)
+                except Exception:
+                    el = None
+                if el:
+                    return sx, el
+            return False
+        try:
+            return WebDriverWait(driver, timeout, poll_frequency=0.1).until(alguno)
+        except Exception:
+            return None, None
+    if not hit:
+        return None, None
+    return selectores[hit[0]], hit[1]
+
+def probar_selectores(driver, lista: str, selectores: list, timeout: float, tenant: str = None):
+    """
+    Devuelve el elemento del primer selector de 'lista' que se vuelva clickeable
+    (None si ninguno dentro de 'timeout'). Los activos corren juntos en una carrera
+    priorizada por el orden aprendido; los omitidos solo se revisan una vez al final,
+    sin volver a esperar.
+    """
+    host, idioma = _contexto_selectores(driver)
+    tenant = tenant or host
+    activos, omitidos = ESTADISTICAS_SELECTORES.ordenar(lista, selectores, tenant, idioma)
+    sx, el = carrera_selectores(driver, activos, timeout)
+    if sx is None and omitidos:
+        sx, el = carrera_selectores(driver, omitidos, 0)
+    if sx is None:
+        return None
+    ESTADISTICAS_SELECTORES.registrar(lista, tenant, idioma, sx, selectores)
+    TRAZADOR.anotar_selector(lista, sx)
+    return el
+
+# Listas de selectores de respaldo (se reordenan con ESTADISTICAS_SELECTORES)
+GOOGLE_BTN_SELECTORS = [
+    "//button[contains(., 'Google')]",
+    "//div[contains(@class,'signin-with') and contains(.,'Google')]",
+    "//a[contains(.,'Google') and contains(@href,'google')]",
+    "//button[contains(@data-qa,'google-signin')]",
+    "//a[contains(@data-qa,'google-signin')]",
+]
+LINK_SELECTORS = [
+    "//a[contains(translate(text(),'HOST','host'),'host')]",
+    "//a[contains(translate(text(),'INICIO DE SESIÓN DEL ANFITRIÓN','inicio de sesión del anfitrión'),'inicio de sesión del anfitrión')]",
+    "//a[contains(.,'Inicio de sesión del anfitrión')]",
+    "//a[contains(.,'Host sign in')]",
+    "//a[contains(@href,'signin')]",
+]
+JOIN_FROM_BROWSER = [
+    "//a[contains(.,'Unirse desde su navegador')]",
+    "//a[contains(.,'Únase desde su navegador')]",
+    "//a[contains(.,'Join from your browser')]",
+]
+POSIBLES_BOTONES = [
+    "//button[@id='joinBtn']",
+    "//button[contains(translate(text(),'ENTRAR','entrar'),'entrar')]",
+    "//button[contains(translate(text(),'JOIN','join'),'join')]",
+    "//button[contains(translate(text(),'UNIRSE','unirse'),'unirse')]",
+    "//button[contains(@class,'preview-join-button')]",
+]
+
+_XPATH_SIGUIENTE_GOOGLE = "//span[text()='Siguiente']/ancestor::button|//button[@type='submit']"
+
+def _google_click_cuenta(driver, timeout=8) -> bool:
+    """En el selector de cuentas de Google, elige ZOOM_EMAIL si aparece."""
+    try:
+        cuenta = WebDriverWait(driver, timeout).until(
+            EC.presence_of_element_located((By.XPATH, f"//div[@data-identifier='{ZOOM_EMAIL}']|//div[contains(.,'{ZOOM_EMAIL}')]"))
+        )
+        driver.execute_script("arguments[0].click();", cuenta)
+        return True
+    except Exception:
+        return False
+
+def _google_escribir_correo(driver, timeout=10) -> bool:
+    try:
+        email_input = WebDriverWait(driver, timeout).until(
+            EC.presence_of_element_located((By.XPATH, "//input[@type='email' and @name='identifier']|//input[@type='email']"))
+        )
+        email_input.clear()
+        email_input.send_keys(ZOOM_EMAIL)
+        next_btn = driver.find_element(By.XPATH, _XPATH_SIGUIENTE_GOOGLE)
+        driver.execute_script("arguments[0].click();", next_btn)
+        return True
+    except Exception as e:
+        print(f"   ⚠️ No pude ingresar el correo en Google: {e}")
+        return False
+
+def _google_escribir_password(driver, timeout=10) -> bool:
+    try:
+        pwd_input = WebDriverWait(driver, timeout).until(
+            EC.presence_of_element_located((By.XPATH, "//input[@type='password' and @name='Passwd']|//input[@type='password']"))
+        )
+        pwd_input.clear()
+        pwd_input.send_keys(ZOOM_PASSWORD)
+        next_btn2 = driver.find_element(By.XPATH, _XPATH_SIGUIENTE_GOOGLE)
+        driver.execute_script("arguments[0].click();", next_btn2)
+        return True
+    except Exception as e:
+        print(f"   ⚠️ No pude ingresar la contraseña de Google (¿2FA activo?): {e}")
+        return False
+
 def login_zoom_via_google(driver, wait, tenant_base="https://zoom.us"):
     """
     Inicia sesión en Zoom usando 'Sign in with Google'.
@@ -134,65 +874,29 @@ def login_zoom_via_google(driver, wait, tenant_base="https://zoom.us"):
     """
     try:
         driver.get(f"{tenant_base}/signin")
-        time.sleep(2)
+        esperar_carga(driver, "login: signin")
 
         # Botón "Sign in with Google"
-        google_btn_selectors = [
-            "//button[contains(., 'Google')]",
-            "//div[contains(@class,'signin-with') and contains(.,'Google')]",
-            "//a[contains(.,'Google') and contains(@href,'google')]",
-            "//button[contains(@data-qa,'google-signin')]",
-            "//a[contains(@data-qa,'google-signin')]"
-        ]
-        clicked = False
-        for sx in google_btn_selectors:
-            try:
-                btn = wait.until(EC.element_to_be_clickable((By.XPATH, sx)))
-                driver.execute_script("arguments[0].click();", btn)
-                clicked = True
-                break
-            except Exception:
-                continue
+        btn = probar_selectores(driver, "google_btn_selectors", GOOGLE_BTN_SELECTORS, 15)
+        clicked = btn is not None
+        if clicked:
+            driver.execute_script("arguments[0].click();", btn)
 
         if not clicked:
             driver.get(f"{tenant_base}/signin/google")
-            time.sleep(2)
+            esperar_carga(driver, "login: signin/google")
 
         # Flujo de Google: elegir cuenta o ingresar credenciales
-        try:
-            cuenta = WebDriverWait(driver, 8).until(
-                EC.presence_of_element_located((By.XPATH, f"//div[@data-identifier='{ZOOM_EMAIL}']|//div[contains(.,'{ZOOM_EMAIL}')]"))
-            )
-            driver.execute_script("arguments[0].click();", cuenta)
-        except Exception:
-            # Ingresar correo
-            try:
-                email_input = WebDriverWait(driver, 10).until(
-                    EC.presence_of_element_located((By.XPATH, "//input[@type='email' and @name='identifier']|//input[@type='email']"))
-                )
-                email_input.clear()
-                email_input.send_keys(ZOOM_EMAIL)
-                next_btn = driver.find_element(By.XPATH, "//span[text()='Siguiente']/ancestor::button|//button[@type='submit']")
-                driver.execute_script("arguments[0].click();", next_btn)
-            except Exception as e:
-                print(f"   ⚠️ No pude ingresar el correo en Google: {e}")
-
+        if not _google_click_cuenta(driver):
+            _google_escribir_correo(driver)
             # Ingresar contraseña (si Google la pide)
-            try:
-                pwd_input = WebDriverWait(driver, 10).until(
-                    EC.presence_of_element_located((By.XPATH, "//input[@type='password' and @name='Passwd']|//input[@type='password']"))
-                )
-                pwd_input.clear()
-                pwd_input.send_keys(ZOOM_PASSWORD)
-                next_btn2 = driver.find_element(By.XPATH, "//span[text()='Siguiente']/ancestor::button|//button[@type='submit']")
-                driver.execute_script("arguments[0].click();", next_btn2)
-            except Exception as e:
-                print(f"   ⚠️ No pude ingresar la contraseña de Google (¿2FA activo?): {e}")
+            _google_escribir_password(driver)
 
         # Esperar redirección de vuelta a Zoom
         try:
             WebDriverWait(driver, 20).until(lambda d: "zoom.us" in d.current_url or "renata.zoom.us" in d.current_url)
             print("   ✅ Login Google -> Zoom completado (redirigido a Zoom)")
+            ALMACEN_SESIONES.exportar(driver, ZOOM_EMAIL)
         except Exception:
             print("   ⚠️ No se observó redirección inmediata, continuando...")
     except Exception as e:
@@ -230,37 +934,6 @@ def get_webclient_url(meeting_url: str, display_name: str) -> str:
         return f"{base}/wc/join/{mid}?prefer=1&uname={quote(display_name)}"
     
 
-def try_host_sign_in_on_wc(driver, wait, tenant_base):
-    """
-    En la pantalla del Web Client, pulsa 'Inicio de sesión del anfitrión'
-    si existe; hace SSO y vuelve al Web Client.
-    """
-    try:
-        link_selectors = [
-            "//a[contains(translate(text(),'HOST','host'),'host')]",
-            "//a[contains(translate(text(),'INICIO DE SESIÓN DEL ANFITRIÓN','inicio de sesión del anfitrión'),'inicio de sesión del anfitrión')]",
-            "//a[contains(.,'Inicio de sesión del anfitrión')]",
-            "//a[contains(.,'Host sign in')]",
-            "//a[contains(@href,'signin')]",
-        ]
-        for sx in link_selectors:
-            try:
-                a = WebDriverWait(driver, 4).until(EC.element_to_be_clickable((By.XPATH, sx)))
-                driver.execute_script("arguments[0].scrollIntoView(true);", a)
-                time.sleep(0.2)
-                driver.execute_script("arguments[0].click();", a)
-                time.sleep(2)
-                # si nos manda a login → SSO
-                if "signin" in driver.current_url or "accounts.google.com" in driver.current_url:
-                    login_zoom_via_google(driver, wait, tenant_base=tenant_base)
-                return True
-            except Exception:
-                continue
-        return False
-    except Exception:
-        return False
-
-
 def pause_recording_in_webclient(driver, wait, timeout=20):
     """
     Pausa la grabación en el Web Client. Primero intenta click en el botón
@@ -279,14 +952,16 @@ def pause_recording_in_webclient(driver, wait, timeout=20):
         except Exception:
             pass
 
-        # b) Espera que la UI cargue algo común (micrófono)
-        try:
-            wait.until(EC.presence_of_element_located((
+        # b) Espera que la UI cargue algo común (micrófono); reemplaza la pausa fija de 4 s
+        esperar_condicion(
+            driver,
+            EC.presence_of_element_located((
                 By.XPATH,
-                "//button[contains(@aria-label,'Mic') or contains(@aria-label,'Micrófono') or contains(@aria-label,'Mute')]"
-            )))
-        except Exception:
-            pass
+                "//button[contains(@aria-label,'Mic') or contains(@aria-label,'Micrófono')"
+                " or contains(@aria-label,'micrófono') or contains(@aria-label,'Mute')]"
+            )),
+            "pausa: controles", fijo_s=4, timeout=timeout,
+        )
 
         # c) Intenta encontrar el botón de pausa
         pause_selectors = [
@@ -298,33 +973,34 @@ def pause_recording_in_webclient(driver, wait, timeout=20):
         ]
 
         def open_more_menu_if_needed():
-            for sx in ["//button[contains(@aria-label,'Más') or contains(@aria-label,'More')]",
-                       "//button[contains(.,'Más') or contains(.,'More')]"]:
-                try:
-                    b = WebDriverWait(driver, 2).until(EC.element_to_be_clickable((By.XPATH, sx)))
-                    driver.execute_script("arguments[0].click();", b)
-                    time.sleep(0.4)
-                    return True
-                except Exception:
-                    continue
-            return False
+            _, b = carrera_selectores(driver, [
+                "//button[contains(@aria-label,'Más') or contains(@aria-label,'More')]",
+                "//button[contains(.,'Más') or contains(.,'More')]",
+            ], 2)
+            if b is None:
+                return False
+            driver.execute_script("arguments[0].click();", b)
+            # Esperar a que el menú se despliegue
+            esperar_condicion(
+                driver,
+                EC.presence_of_element_located((By.XPATH, "//*[@role='menu' or @role='menuitem']")),
+                "pausa: menú Más", fijo_s=0.4, timeout=2,
+            )
+            return True
 
         end = time.time() + timeout
         while time.time() < end:
-            for sx in pause_selectors:
+            btn = probar_selectores(driver, "pause_selectors", pause_selectors, 2)
+            if btn is not None:
+                driver.execute_script("arguments[0].scrollIntoView(true);", btn)
+                driver.execute_script("arguments[0].click();", btn)
+                print("   ⏸️ Grabación pausada (click en botón).")
+                TRAZADOR.anotar(metodo="click")
                 try:
-                    btn = WebDriverWait(driver, 2).until(EC.element_to_be_clickable((By.XPATH, sx)))
-                    driver.execute_script("arguments[0].scrollIntoView(true);", btn)
-                    time.sleep(0.1)
-                    driver.execute_script("arguments[0].click();", btn)
-                    print("   ⏸️ Grabación pausada (click en botón).")
-                    try:
-                        driver.switch_to.default_content()
-                    except Exception:
-                        pass
-                    return True
+                    driver.switch_to.default_content()
                 except Exception:
-                    continue
+                    pass
+                return True
             open_more_menu_if_needed()
 
         # d) Fallback: enviar ALT+P al navegador
@@ -335,6 +1011,7 @@ def pause_recording_in_webclient(driver, wait, timeout=20):
         try:
             ActionChains(driver).key_down(Keys.ALT).send_keys('p').key_up(Keys.ALT).perform()
             print("   ⏸️ Grabación pausada (fallback ALT+P).")
+            TRAZADOR.anotar(metodo="alt+p")
             return True
         except Exception as e:
             print(f"   ⚠️ No pude enviar ALT+P en Web Client: {e}")
@@ -347,90 +1024,620 @@ def pause_recording_in_webclient(driver, wait, timeout=20):
             pass
 
 
-def pause_recording_in_zoom_app(delay_seconds=4):
+def _es_ventana_reunion_zoom(titulo: str, clase: str = "zoom") -> bool:
+    titulo = (titulo or "").lower()
+    return "zoom" in (clase or "").lower() and any(t in titulo for t in TITULOS_VENTANA_ZOOM)
+
+def _titulo_ventana_x(disp, ventana) -> str:
+    """_NET_WM_NAME (UTF-8) o, si no está, WM_NAME."""
+    try:
+        prop = ventana.get_full_property(disp.intern_atom("_NET_WM_NAME"), 0)
+        if prop and prop.value:
+            valor = prop.value
+            return valor.decode("utf-8", "replace") if isinstance(valor, bytes) else str(valor)
+        nombre = ventana.get_wm_name()
+        return nombre.decode("latin-1") if isinstance(nombre, bytes) else (nombre or "")
+    except Exception:
+        return ""
+
+def _buscar_ventana_x(disp):
+    raiz = disp.screen().root
+    prop = raiz.get_full_property(disp.intern_atom("_NET_CLIENT_LIST"), X.AnyPropertyType)
+    for wid in (prop.value if prop else []):
+        ventana = disp.create_resource_object("window", wid)
+        try:
+            clase = " ".join(ventana.get_wm_class() or ())
+        except Exception:
+            continue
+        if _es_ventana_reunion_zoom(_titulo_ventana_x(disp, ventana), clase):
+            return ventana
+    return None
+
+def _esperar_ventana_x(timeout: float):
+    """
+    Espera la ventana de la reunión en X11: se suscribe a los cambios de la ventana
+    raíz (_NET_CLIENT_LIST cambia al mapear ventanas) y revisa al llegar cada evento,
+    con un sondeo corto de respaldo para los cambios de título.
+    """
+    disp = xdisplay.Display()
+    entregado = False
+    try:
+        raiz = disp.screen().root
+        raiz.change_attributes(event_mask=X.PropertyChangeMask | X.SubstructureNotifyMask)
+        limite = time.monotonic() + timeout
+        while True:
+            ventana = _buscar_ventana_x(disp)
+            if ventana is not None:
+                entregado = True   # la conexión pasa a quien llama, que la cierra
+                return disp, ventana
+            restante = limite - time.monotonic()
+            if restante <= 0:
+                return None
+            select.select([disp.fileno()], [], [], min(restante, 0.5))
+            while disp.pending_events():
+                disp.next_event()
+    finally:
+        if not entregado:
+            disp.close()
+
+def _enfocar_ventana_x(disp, ventana):
+    """Pide al gestor de ventanas activarla (_NET_ACTIVE_WINDOW) y le da el foco."""
+    raiz = disp.screen().root
+    evento = xprotocol.event.ClientMessage(
+        window=ventana, client_type=disp.intern_atom("_NET_ACTIVE_WINDOW"),
+        data=(32, [2, X.CurrentTime, 0, 0, 0]),
+    )
+    raiz.send_event(evento, event_mask=X.SubstructureRedirectMask | X.SubstructureNotifyMask)
+    ventana.configure(stack_mode=X.Above)
+    ventana.set_input_focus(X.RevertToParent, X.CurrentTime)
+    disp.sync()
+
+def esperar_ventana_zoom(timeout: float = None):
+    """
+    Espera a que aparezca la ventana de la reunión en la app de Zoom y la enfoca.
+    True si la encontró y enfocó, False si venció el tope, None si no hay forma de
+    detectarla en este sistema (sin Xlib/X11 ni pygetwindow).
+    """
+    timeout = timeout or ZOOM_APP_ESPERA_S
+    if platform.system() == "Linux":
+        if xdisplay is None or not os.environ.get("DISPLAY"):
+            return None
+        try:
+            hallada = _esperar_ventana_x(timeout)
+        except Exception as e:
+            print(f"   ⚠️ No pude consultar las ventanas de X11: {e}")
+            return None
+        if hallada is None:
+            return False
+        disp, ventana = hallada
+        try:
+            _enfocar_ventana_x(disp, ventana)
+        finally:
+            disp.close()
+        return True
+    if gw is None:
+        return None
+    limite = time.monotonic() + timeout
+    while time.monotonic() < limite:
+        for ventana in gw.getAllWindows():
+            if _es_ventana_reunion_zoom(ventana.title):
+                try:
+                    if ventana.isMinimized:
+                        ventana.restore()
+                    ventana.activate()
+                except Exception:
+                    pass
+                return True
+        time.sleep(0.25)
+    return False
+
+def pause_recording_in_zoom_app(delay_seconds=6, lanzado=None):
     """
     Envía el atajo global de Zoom para Pausar/Reanudar grabación en la app nativa.
     Windows/Linux: Alt+P
     macOS: Cmd+Shift+P
-    Requiere que la ventana de Zoom esté al frente (abrir por zoommtg:// ya la enfoca).
+    Antes espera a que aparezca la ventana de la reunión (hasta ZOOM_APP_ESPERA_S) y
+    la enfoca; si no hay forma de detectarla, espera delay_seconds como antes.
+    lanzado: time.monotonic() del lanzamiento, para medir cuánto tardó la ventana.
     """
     try:
-        time.sleep(delay_seconds)  # dar tiempo a que cargue la reunión
         system = platform.system().lower()
         if pyautogui is None:
             print("   ℹ️ pyautogui no está instalado; no puedo enviar el atajo a la app.")
             return False
 
+        lanzado = lanzado if lanzado is not None else time.monotonic()
+        with MEDIDOR_FASES.fase("app Zoom: ventana", fijo_s=delay_seconds):
+            encontrada = esperar_ventana_zoom()
+            if encontrada is None:
+                time.sleep(delay_seconds)  # sin detección: dar tiempo a que cargue la reunión
+        if encontrada is False:
+            print(f"   ⚠️ La ventana de la reunión no apareció en {ZOOM_APP_ESPERA_S}s; no envío el atajo.")
+            return False
+        if encontrada:
+            print(f"   🪟 Ventana de la reunión lista {time.monotonic() - lanzado:.1f}s después de lanzar la app.")
+
         if system == "darwin":  # macOS
-            pyautogui.hotkey("command", "shift", "p")
+            atajo = ("command", "shift", "p")
         else:  # Windows / Linux
-            pyautogui.hotkey("alt", "p")
+            atajo = ("alt", "p")
+        pyautogui.hotkey(*atajo)
 
         print("   ⏸️ Atajo enviado a la app de Zoom (pausar).")
-        return True
+        return verificar_pausa_app(lambda: pyautogui.hotkey(*atajo))
     except Exception as e:
         print(f"   ⚠️ No pude enviar atajo a la app de Zoom: {e}")
         return False
 
 
+def _gris_reducido(imagen) -> "np.ndarray":
+    """Imagen PIL → matriz float32 en escala de grises a INDICADOR_ESCALA."""
+    gris = imagen.convert("L")
+    if INDICADOR_ESCALA != 1:
+        ancho, alto = gris.size
+        gris = gris.resize((max(1, int(ancho * INDICADOR_ESCALA)), max(1, int(alto * INDICADOR_ESCALA))),
+                           Image.BILINEAR)
+    return np.asarray(gris, dtype=np.float32)
 
+def correlacion_normalizada(imagen: "np.ndarray", plantilla: "np.ndarray") -> tuple[float, tuple[int, int]]:
+    """
+    Mejor coincidencia de 'plantilla' en 'imagen' por correlación cruzada normalizada
+    (NCC), toda vectorizada: el numerador por FFT y las sumas locales de la ventana por
+    imágenes integrales. Devuelve (puntaje en [-1, 1], (fila, columna) de la esquina).
+    """
+    H, W = imagen.shape
+    h, w = plantilla.shape
+    if h > H or w > W:
+        return -1.0, (0, 0)
+    n = h * w
+    t = plantilla - plantilla.mean()
+    norma_t = np.sqrt((t * t).sum())
+    if norma_t == 0:
+        return -1.0, (0, 0)
+    forma = (H + h - 1, W + w - 1)
+    conv = np.fft.irfft2(np.fft.rfft2(imagen, forma) * np.fft.rfft2(t[::-1, ::-1], forma), forma)
+    numerador = conv[h - 1:H, w - 1:W]
 
+    def sumas_ventana(a):
+        integral = np.pad(a, ((1, 0), (1, 0))).cumsum(0).cumsum(1)
+        return integral[h:, w:] - integral[:-h, w:] - integral[h:, :-w] + integral[:-h, :-w]
 
-# =====================================
-# FUNCIONES PRINCIPALES (APERTURA)
-# =====================================
-def abrir_zoom_app(url):
-    """Abre la reunión con la aplicación de Zoom usando el protocolo zoommtg://."""
-    sistema = platform.system()
-    if "zoom.us/j/" in url:
-        meeting_id = url.split("/j/")[-1].split("?")[0]
-        zoom_url = f"zoommtg://zoom.us/join?confno={meeting_id}"
-    else:
-        zoom_url = url
+    imagen64 = imagen.astype(np.float64)
+    suma = sumas_ventana(imagen64)
+    suma2 = sumas_ventana(imagen64 * imagen64)
+    varianza = np.maximum(suma2 - suma * suma / n, 0)
+    denominador = np.sqrt(varianza) * norma_t
+    puntajes = np.where(denominador > 1e-6, numerador / np.maximum(denominador, 1e-6), -1.0)
+    fila, col = np.unravel_index(int(np.argmax(puntajes)), puntajes.shape)
+    return float(puntajes[fila, col]), (int(fila), int(col))
 
-    try:
-        if sistema == "Windows":
-            os.startfile(zoom_url)
-        elif sistema == "Linux":
-            subprocess.Popen(["xdg-open", zoom_url])
-        elif sistema == "Darwin":
-            subprocess.Popen(["open", zoom_url])
-        print("✅ App de Zoom abierta")
 
-        # 👉 Pausar automáticamente la grabación en la app
-        pause_recording_in_zoom_app(delay_seconds=6)  # sube/baja este delay si la app tarda en cargar
+class DetectorIndicador:
+    """
+    Busca en pantalla el indicador de grabación de la app de Zoom ("grabando" o
+    "pausada") con plantillas en gris a media resolución. Primero mira solo la región
+    donde se vio la última vez (guardada en INDICADOR_CACHE), que cuesta decenas de
+    milisegundos; solo si ahí no está recorre la pantalla completa.
+    """
+
+    MARGEN = 40  # píxeles de pantalla alrededor de la última posición conocida
+
+    def __init__(self, plantillas: dict = None, cache: str = None):
+        self.rutas = plantillas or {"pausada": PLANTILLA_PAUSADA, "grabando": PLANTILLA_GRABANDO}
+        self.cache = cache or INDICADOR_CACHE
+        self._plantillas = None
+        self._region = None  # (x, y, ancho, alto) en píxeles de pantalla
+        self._pantalla = None  # (ancho, alto) de la última captura completa
+
+    def disponible(self) -> bool:
+        return (pyscreeze is not None and np is not None
+                and all(os.path.exists(r) for r in self.rutas.values()))
+
+    def _cargar(self):
+        if self._plantillas is None:
+            self._plantillas = {nombre: _gris_reducido(Image.open(ruta)) for nombre, ruta in self.rutas.items()}
+            try:
+                with open(self.cache, encoding="utf-8") as f:
+                    self._region = tuple(json.load(f)["region"])
+            except (OSError, ValueError, KeyError, TypeError):
+                self._region = None
+        return self._plantillas
+
+    def _guardar_region(self, region):
+        self._region = region
+        try:
+            os.makedirs(os.path.dirname(self.cache), exist_ok=True)
+            with open(self.cache, "w", encoding="utf-8") as f:
+                json.dump({"region": list(region)}, f)
+        except OSError:
+            pass
+
+    def _region_cercana(self):
+        """
+        Última posición conocida más MARGEN, recortada a la pantalla (una región que se
+        sale de ella hace fallar la captura). None sin posición o sin tamaño de pantalla
+        todavía: la primera búsqueda completa lo registra.
+        """
+        if not self._region or not self._pantalla:
+            return None
+        x, y, ancho, alto = self._region
+        m = self.MARGEN
+        ancho_p, alto_p = self._pantalla
+        x0, y0 = max(0, x - m), max(0, y - m)
+        x1, y1 = min(ancho_p, x + ancho + m), min(alto_p, y + alto + m)
+        if x1 <= x0 or y1 <= y0:
+            return None
+        return (x0, y0, x1 - x0, y1 - y0)
+
+    def _buscar_en(self, region=None):
+        """(estado, puntaje, región en pantalla del hallazgo) del mejor indicador en 'region'."""
+        imagen = pyscreeze.screenshot(region=region)
+        if region is None:
+            self._pantalla = imagen.size
+        captura = _gris_reducido(imagen)
+        x0, y0 = (region[0], region[1]) if region else (0, 0)
+        mejor = (None, -1.0, None)
+        for nombre, plantilla in self._cargar().items():
+            puntaje, (fila, col) = correlacion_normalizada(captura, plantilla)
+            if puntaje > mejor[1]:
+                alto, ancho = plantilla.shape
+                escala = 1 / INDICADOR_ESCALA
+                mejor = (nombre, puntaje, (x0 + int(col * escala), y0 + int(fila * escala),
+                                           int(ancho * escala), int(alto * escala)))
+        return mejor
+
+    def estado(self) -> str | None:
+        """
+        'pausada', 'grabando' o None si no se ve el indicador. Si falla la captura de la
+        región conocida se busca en la pantalla completa; si falla esta, propaga el error.
+        """
+        self._cargar()
+        cerca = self._region_cercana()
+        if cerca:
+            try:
+                nombre, puntaje, hallazgo = self._buscar_en(cerca)
+                if puntaje >= INDICADOR_UMBRAL:
+                    return nombre
+            except Exception as e:
+                print(f"   ⚠️ No pude capturar la región del indicador {cerca}: {e}; busco en toda la pantalla.")
+        nombre, puntaje, hallazgo = self._buscar_en()
+        if puntaje < INDICADOR_UMBRAL:
+            return None
+        self._guardar_region(hallazgo)
+        return nombre
+
+
+DETECTOR_INDICADOR = DetectorIndicador()
+
+def _leer_indicador_estable(cuadros: int = None, intervalo_s: float = None, timeout_s: float = None):
+    """
+    Lee el indicador de grabación hasta que da el mismo estado en 'cuadros' capturas
+    seguidas (la barra de Zoom parpadea durante la transición). Devuelve (estado, True),
+    o (último estado, False) si no se estabiliza antes de timeout_s.
+    """
+    cuadros = cuadros or CUADROS_ESTABLES_PAUSA_APP
+    intervalo_s = INTERVALO_CUADROS_PAUSA_APP_S if intervalo_s is None else intervalo_s
+    fin = time.monotonic() + (ESPERA_ESTABLE_PAUSA_APP_S if timeout_s is None else timeout_s)
+    ultimo, seguidos = object(), 0
+    while True:
+        estado = DETECTOR_INDICADOR.estado()
+        seguidos = seguidos + 1 if estado == ultimo else 1
+        ultimo = estado
+        if seguidos >= cuadros:
+            return estado, True
+        if time.monotonic() >= fin:
+            return estado, False
+        time.sleep(intervalo_s)
+
+def verificar_pausa_app(reenviar, espera_ui_s: float = 1.0) -> bool:
+    """
+    Comprueba en pantalla que la grabación quedó en pausa; si el indicador sigue en
+    "grabando" de forma estable, reenvía el atajo (hasta REINTENTOS_PAUSA_APP veces) y
+    vuelve a comprobar. El atajo alterna pausa/reanudar: con una lectura inestable no se
+    reenvía. Sin plantillas, sin pyscreeze/NumPy o si falla la captura no verifica y da
+    por buena la pausa.
+    """
+    if not DETECTOR_INDICADOR.disponible():
+        return True
+    for intento in range(REINTENTOS_PAUSA_APP + 1):
+        time.sleep(espera_ui_s)  # la barra de Zoom tarda un momento en reflejar el cambio
+        t0 = time.perf_counter()
+        try:
+            estado, estable = _leer_indicador_estable()
+        except Exception as e:
+            print(f"   ⚠️ No pude capturar la pantalla para verificar la pausa: {e}")
+            return True
+        ms = (time.perf_counter() - t0) * 1000
+        if not estable:
+            print(f"   ⚠️ El indicador de grabación no se estabiliza ({ms:.0f} ms): "
+                  "no reenvío el atajo, revisa la app de Zoom.")
+            return False
+        if estado == "pausada":
+            print(f"   ✅ Grabación en pausa verificada en pantalla ({ms:.0f} ms).")
+            return True
+        if estado is None:
+            print(f"   ℹ️ No veo el indicador de grabación ({ms:.0f} ms): quizá la reunión no se está grabando.")
+            return True
+        if intento < REINTENTOS_PAUSA_APP:
+            print("   🔁 La grabación sigue activa; reenviando el atajo de pausa...")
+            reenviar()
+    print("   ⚠️ La grabación sigue activa tras reenviar el atajo: revisa la app de Zoom.")
+    return False
+
+
+
+
+
+# =====================================
+# ALMACÉN DE SESIONES (COOKIES)
+# =====================================
+class AlmacenSesiones:
+    """
+    Cookies de Zoom y Google guardadas por cuenta fuera del perfil temporal de Chrome
+    (que se borra al reiniciar). Se exportan tras un login exitoso y se inyectan por
+    CDP en cada Chrome nuevo antes del primer driver.get, así las aperturas casi
+    nunca necesitan pasar por el SSO de Google.
+    """
+
+    # Campos que acepta Network.setCookies (getAllCookies devuelve más)
+    _CAMPOS = ("name", "value", "domain", "path", "secure", "httpOnly", "sameSite", "expires")
+
+    def __init__(self, directorio: str = None):
+        self.directorio = directorio or SESIONES_DIR
+        self._lock = threading.Lock()
+
+    def _ruta(self, cuenta: str) -> str:
+        nombre = "".join(c if c.isalnum() or c in "._-@" else "_" for c in cuenta)
+        return os.path.join(self.directorio, f"{nombre}.json")
+
+    def exportar(self, driver, cuenta: str) -> int:
+        """Guarda las cookies de sesión (dominios DOMINIOS_SESION) del driver para 'cuenta'."""
+        try:
+            cookies = driver.execute_cdp_cmd("Network.getAllCookies", {})["cookies"]
+        except Exception as e:
+            print(f"   ⚠️ No pude exportar las cookies de sesión: {e}")
+            return 0
+        propias = [
+            {k: c[k] for k in self._CAMPOS if k in c and not (k == "expires" and c.get("session"))}
+            for c in cookies
+            if any(c.get("domain", "").lstrip(".").endswith(d) for d in DOMINIOS_SESION)
+        ]
+        if not propias:
+            return 0
+        with self._lock:
+            os.makedirs(self.directorio, exist_ok=True)
+            ruta = self._ruta(cuenta)
+            tmp = ruta + ".tmp"
+            # Son credenciales: solo legibles por el usuario
+            fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"cuenta": cuenta, "guardado": time.time(), "cookies": propias}, f)
+            os.replace(tmp, ruta)
+        print(f"   💾 Sesión guardada ({len(propias)} cookies) para {cuenta}")
+        return len(propias)
+
+    def _leer(self, cuenta: str) -> dict:
+        with self._lock:
+            try:
+                with open(self._ruta(cuenta), encoding="utf-8") as f:
+                    return json.load(f)
+            except (OSError, ValueError):
+                return {}
+
+    def cookies_vigentes(self, cuenta: str) -> list:
+        ahora = time.time()
+        return [c for c in self._leer(cuenta).get("cookies", []) if c.get("expires", ahora + 1) > ahora]
+
+    def inyectar(self, driver, cuenta: str) -> int:
+        """Carga en el driver las cookies vigentes de 'cuenta' (antes de navegar)."""
+        cookies = self.cookies_vigentes(cuenta)
+        if not cookies:
+            return 0
+        try:
+            driver.execute_cdp_cmd("Network.setCookies", {"cookies": cookies})
+        except Exception as e:
+            print(f"   ⚠️ No pude restaurar la sesión guardada: {e}")
+            return 0
+        print(f"   🍪 Sesión restaurada ({len(cookies)} cookies) para {cuenta}")
+        return len(cookies)
+
+    def vence_en(self, cuenta: str) -> float | None:
+        """
+        Segundos hasta que la sesión guardada deje de servir: el primer vencimiento de
+        las cookies COOKIES_SESION_ZOOM, o la edad máxima SESION_MAX_EDAD_H si no están.
+        None si no hay sesión guardada.
+        """
+        vence = self.vencimiento(cuenta)
+        return None if vence is None else vence - time.time()
+
+    def vencimiento(self, cuenta: str) -> float | None:
+        """Instante (epoch) en que vence la sesión guardada (ver vence_en); None si no hay."""
+        datos = self._leer(cuenta)
+        if not datos:
+            return None
+        limites = [c["expires"] for c in datos.get("cookies", [])
+                   if c.get("name") in COOKIES_SESION_ZOOM and "expires" in c]
+        limites.append(datos.get("guardado", 0) + SESION_MAX_EDAD_H * 3600)
+        return min(limites)
+
+
+ALMACEN_SESIONES = AlmacenSesiones()
+
+def _borrar_cookies_zoom(driver):
+    """Borra las cookies de Zoom del driver (las de Google quedan: la cuenta sigue recordada)."""
+    for c in driver.execute_cdp_cmd("Network.getAllCookies", {})["cookies"]:
+        if c.get("domain", "").lstrip(".").endswith("zoom.us"):
+            driver.execute_cdp_cmd("Network.deleteCookies",
+                                   {"name": c["name"], "domain": c["domain"], "path": c.get("path", "/")})
+
+def _renovar_sesion(reunion: dict, inicio: datetime | None = None) -> bool:
+    """
+    Renueva la sesión guardada de reunion["cuenta"] con un login nuevo (tarea del
+    PoolLanzamientos). Usa un Chrome propio sobre un clon del perfil, así no toca las
+    pestañas de reunión del pool: sin las cookies de Zoom el SSO de Google emite una
+    sesión nueva, que se guarda y se promueve al perfil dorado. True solo si el
+    vencimiento guardado avanzó.
+    """
+    cuenta = reunion["cuenta"]
+    print(f"\n🔄 Renovando la sesión guardada de {cuenta} en segundo plano...")
+    antes = ALMACEN_SESIONES.vencimiento(cuenta) or 0
+    perfil = _perfil_de(False, MODO_LIGERO)
+    clon = GESTOR_PERFILES.clonar(perfil)
+    driver = None
+    try:
+        driver = iniciar_navegador(False, MODO_LIGERO, user_data_dir=clon)
+        _borrar_cookies_zoom(driver)
+        with TRAZADOR.span("login: SSO Google"):
+            login_zoom_via_google(driver, WebDriverWait(driver, 15), tenant_base=TENANT_SESION)
+    except Exception as e:
+        print(f"   ⚠️ No pude renovar la sesión: {e}")
+        return False
+    finally:
+        if driver is not None:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+        GESTOR_PERFILES.liberar(clon, perfil)
+    despues = ALMACEN_SESIONES.vencimiento(cuenta) or 0
+    if despues <= antes:
+        print(f"   ⚠️ La sesión de {cuenta} no se renovó: su vencimiento guardado no cambió.")
+        return False
+    print(f"   ✅ Sesión de {cuenta} renovada hasta el "
+          f"{datetime.fromtimestamp(despues, TZ).strftime('%Y-%m-%d %H:%M')}.")
+    return True
+
+def refrescar_sesion_si_vence(pool, cuenta: str = None, margen_h: float = None):
+    """
+    Si hay una sesión guardada y vence dentro del margen, encola su renovación en el
+    PoolLanzamientos 'pool' con la hora de vencimiento como clave EDF (las aperturas
+    de clases que empiezan antes pasan primero). Devuelve el Future, o None si no
+    hacía falta (o si el pool de navegadores está desactivado).
+    """
+    if not USAR_POOL_NAVEGADORES:
+        return None
+    cuenta = cuenta or ZOOM_EMAIL
+    margen = (margen_h if margen_h is not None else REFRESCAR_SESION_ANTES_H) * 3600
+    restante = ALMACEN_SESIONES.vence_en(cuenta)
+    if restante is None or restante > margen:
+        return None
+    vence = RELOJ.ahora() + timedelta(seconds=max(restante, 0))
+    return pool.enviar({"nombre": f"sesión de {cuenta}", "cuenta": cuenta}, vence, fn=_renovar_sesion)
+
+def iniciar_refresco_sesiones(pool, intervalo_s: float = 1800) -> threading.Thread:
+    """
+    Hilo de fondo que revisa periódicamente si hay que renovar la sesión guardada.
+    Si una renovación no alarga la sesión, la espera hasta la siguiente se duplica
+    (hasta REFRESCAR_SESION_ESPERA_MAX_H) en vez de reintentar cada 'intervalo_s'.
+    """
+    def _bucle():
+        pendiente, espera = None, intervalo_s
+        while True:
+            if pendiente is not None and pendiente.done():
+                if not pendiente.cancelled() and pendiente.exception() is None and pendiente.result():
+                    espera = intervalo_s
+                else:
+                    espera = min(espera * 2, REFRESCAR_SESION_ESPERA_MAX_H * 3600)
+                    print(f"   ⏳ Próximo intento de renovar la sesión en {espera / 60:.0f} min.")
+                pendiente = None
+            elif pendiente is None:
+                # No encolar otra renovación mientras la anterior sigue esperando turno
+                try:
+                    pendiente = refrescar_sesion_si_vence(pool)
+                except RuntimeError:
+                    return  # pool de lanzamientos cerrado
+            time.sleep(espera)
+    hilo = threading.Thread(target=_bucle, name="refresco-sesion", daemon=True)
+    hilo.start()
+    return hilo
+
+
+# =====================================
+# FUNCIONES PRINCIPALES (APERTURA)
+# =====================================
+def abrir_zoom_app(url):
+    """Abre la reunión con la aplicación de Zoom usando el protocolo zoommtg://."""
+    sistema = platform.system()
+    if "zoom.us/j/" in url:
+        meeting_id = url.split("/j/")[-1].split("?")[0]
+        zoom_url = f"zoommtg://zoom.us/join?confno={meeting_id}"
+    else:
+        zoom_url = url
+
+    try:
+        lanzado = time.monotonic()
+        with TRAZADOR.span("app Zoom: lanzar"):
+            if sistema == "Windows":
+                os.startfile(zoom_url)
+            elif sistema == "Linux":
+                subprocess.Popen(["xdg-open", zoom_url])
+            elif sistema == "Darwin":
+                subprocess.Popen(["open", zoom_url])
+        print("✅ App de Zoom abierta")
+
+        # 👉 Pausar automáticamente la grabación en la app (en cuanto aparece su ventana)
+        with TRAZADOR.span("app Zoom: pausa") as span:
+            if not pause_recording_in_zoom_app(delay_seconds=6, lanzado=lanzado):
+                span["resultado"] = "fallo"
 
         return True
     except Exception as e:
         print(f"❌ Error al abrir Zoom app: {e}")
         return False
 
-def abrir_navegador_automatico(url, nombre_usuario, incognito=False):
+# Flags del modo ligero: sin ventana ni servicios en segundo plano (red, actualizaciones,
+# extensiones, sincronización). En un servidor sin pantalla no mejoró el arranque ni la
+# memoria frente a las opciones normales (bench_chrome_ligero.py): por eso MODO_LIGERO = False.
+FLAGS_LIGERO = [
+    "--headless=new",
+    f"--window-size={VENTANA_LIGERO}",
+    "--disable-background-networking",
+    "--disable-component-update",
+    "--disable-extensions",
+    "--disable-sync",
+    "--disable-default-apps",
+    "--disable-client-side-phishing-detection",
+    "--disable-breakpad",
+    "--disable-domain-reliability",
+    "--disable-features=Translate,OptimizationHints,MediaRouter,AutofillServerCommunication,InterestFeedContentSuggestions",
+    "--no-first-run",
+    "--no-default-browser-check",
+    "--metrics-recording-only",
+    "--password-store=basic",
+    "--use-mock-keychain",
+    "--mute-audio",
+    # Sin escritorio no hay micrófono/cámara reales
+    "--use-fake-device-for-media-stream",
+]
+
+def es_ligero(reunion: dict) -> bool:
+    return bool(reunion.get("ligero", MODO_LIGERO))
+
+def crear_opciones_chrome(incognito=False, ligero=False, user_data_dir=None):
     """
-    Abre Zoom en el navegador directamente en el Web Client (Renata),
-    evitando el launcher (/j/<id>) y realizando inicio de sesión del anfitrión
-    si la sesión está guardada o se usa SSO de Google.
+    Opciones de Chrome comunes a todas las aperturas (perfil, permisos de medios, protocolos).
+    ligero=True: headless, ventana fija y FLAGS_LIGERO, con su propio perfil persistente.
+    user_data_dir: usar este directorio (p. ej. un clon) en lugar del perfil persistente.
     """
-    print(f"   🤖 Iniciando navegador automatizado...")
-    print(f"   👤 Usuario: {nombre_usuario}")
-
-    # ==============================
-    # Configuración de Chrome
-    # ==============================
     chrome_options = Options()
     if incognito:
         chrome_options.add_argument("--incognito")
         print("   🕶️  Modo incógnito activado")
 
     if GUARDAR_SESION and not incognito:
-        os.makedirs(CHROME_PROFILE_DIR, exist_ok=True)
-        chrome_options.add_argument(f"--user-data-dir={CHROME_PROFILE_DIR}")
+        perfil = user_data_dir or (CHROME_PROFILE_LIGERO_DIR if ligero else CHROME_PROFILE_DIR)
+        os.makedirs(perfil, exist_ok=True)
+        chrome_options.add_argument(f"--user-data-dir={perfil}")
         chrome_options.add_argument("--profile-directory=Default")
 
     chrome_options.add_argument("--no-sandbox")
     chrome_options.add_argument("--disable-dev-shm-usage")
     chrome_options.add_argument("--disable-gpu")
-    chrome_options.add_argument("--start-maximized")
+    if ligero:
+        for flag in FLAGS_LIGERO:
+            chrome_options.add_argument(flag)
+    else:
+        chrome_options.add_argument("--start-maximized")
     chrome_options.add_argument("--disable-blink-features=AutomationControlled")
     chrome_options.add_experimental_option("excludeSwitches", ["enable-automation", "enable-logging"])
     chrome_options.add_experimental_option('useAutomationExtension', False)
@@ -443,178 +1650,1415 @@ def abrir_navegador_automatico(url, nombre_usuario, incognito=False):
         "protocol_handler.excluded_schemes.zoomus": False
     })
     chrome_options.add_argument("--use-fake-ui-for-media-stream")
+    for flag in CHROME_ARGS_EXTRA:
+        chrome_options.add_argument(flag)
+    if USAR_BIDI:
+        chrome_options.enable_bidi = True
+    return chrome_options
 
-    driver = None
+# ==============================
+# Resolución de ChromeDriver (una vez por proceso)
+# ==============================
+_chromedriver_lock = threading.Lock()
+_chromedriver_path = None
+
+def version_chrome() -> str | None:
+    """Versión del Chrome instalado (p. ej. '141.0.7390.54'), o None si no se detecta."""
+    for tipo in (ChromeType.GOOGLE, ChromeType.CHROMIUM):
+        try:
+            version = OperationSystemManager().get_browser_version_from_os(tipo)
+        except Exception:
+            version = None
+        if version:
+            return version
+    return None
+
+def version_chromedriver(ruta: str) -> str | None:
+    """Versión que reporta un ejecutable de ChromeDriver ('ChromeDriver 141.0...')."""
+    try:
+        salida = subprocess.run([ruta, "--version"], capture_output=True, text=True, timeout=10).stdout
+    except Exception:
+        return None
+    partes = salida.split()
+    return partes[1] if len(partes) > 1 else None
+
+def _mayor(version: str | None) -> str | None:
+    return version.split(".")[0] if version else None
+
+def _leer_cache_chromedriver() -> dict:
+    try:
+        with open(CHROMEDRIVER_CACHE, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def _guardar_cache_chromedriver(cache: dict):
+    try:
+        os.makedirs(os.path.dirname(CHROMEDRIVER_CACHE), exist_ok=True)
+        with open(CHROMEDRIVER_CACHE, "w", encoding="utf-8") as f:
+            json.dump(cache, f, indent=2)
+    except OSError as e:
+        print(f"   ⚠️ No pude guardar la caché de ChromeDriver: {e}")
+
+def resolver_chromedriver() -> str | None:
+    """
+    Ruta del ChromeDriver a usar en todas las aperturas, resuelta una sola vez:
+      1. CHROMEDRIVER_PATH (ruta local fija, para hosts sin red);
+      2. caché local indexada por la versión mayor de Chrome instalada;
+      3. ChromeDriverManager().install() (con red), que luego se guarda en la caché.
+    None significa "dejar que Selenium Manager lo busque" (PATH o su propia caché).
+    """
+    global _chromedriver_path
+    with _chromedriver_lock:
+        if _chromedriver_path is not None:
+            return _chromedriver_path or None
+
+        if CHROMEDRIVER_PATH:
+            if os.path.isfile(CHROMEDRIVER_PATH):
+                _chromedriver_path = CHROMEDRIVER_PATH
+                return _chromedriver_path
+            print(f"   ⚠️ CHROMEDRIVER_PATH no existe: {CHROMEDRIVER_PATH}")
+
+        mayor = _mayor(version_chrome())
+        cache = _leer_cache_chromedriver()
+        ruta = cache.get(mayor) if mayor else None
+        if ruta and os.path.isfile(ruta):
+            _chromedriver_path = ruta
+            return ruta
+
+        print("   ⏳ Descargando/verificando ChromeDriver...")
+        try:
+            with TRAZADOR.span("chromedriver: install"):
+                ruta = ChromeDriverManager().install()
+        except Exception as e:
+            print(f"   ⚠️ ChromeDriverManager falló ({e}); se usará Selenium Manager / PATH.")
+            _chromedriver_path = ""
+            return None
+        if mayor:
+            cache[mayor] = ruta
+            _guardar_cache_chromedriver(cache)
+        _chromedriver_path = ruta
+        return ruta
+
+def verificar_chromedriver() -> bool:
+    """Chequeo de arranque: resuelve el driver y avisa si no coincide con la versión de Chrome."""
+    ruta = resolver_chromedriver()
+    chrome = version_chrome()
+    driver = version_chromedriver(ruta) if ruta else None
+    print(f"Chrome: {chrome or 'no detectado'} | ChromeDriver: {driver or 'Selenium Manager'}"
+          + (f" ({ruta})" if ruta else ""))
+    if chrome and driver and _mayor(chrome) != _mayor(driver):
+        print(f"⚠️  ChromeDriver {driver} no corresponde a Chrome {chrome}: las aperturas en navegador "
+              f"van a fallar. Actualiza CHROMEDRIVER_PATH o borra {CHROMEDRIVER_CACHE}.")
+        return False
+    return True
+
+def iniciar_navegador(incognito=False, ligero=False, user_data_dir=None):
+    """Levanta ChromeDriver + Chrome con las opciones del launcher."""
+    ruta = resolver_chromedriver()
+    service = Service(ruta) if ruta else Service()
+    with TRAZADOR.span("chrome: arranque", ligero=ligero, incognito=incognito):
+        driver = webdriver.Chrome(service=service, options=crear_opciones_chrome(incognito, ligero, user_data_dir))
+    print("   ✅ Navegador iniciado" + (" (modo ligero)" if ligero else ""))
+    # Suscribirse a los eventos de navegación antes de la primera carga
+    eventos_de(driver)
+    if not incognito:
+        # Antes del primer driver.get: restaurar la sesión guardada de la cuenta
+        ALMACEN_SESIONES.inyectar(driver, ZOOM_EMAIL)
+    return driver
+
+def tenant_de_url(url: str) -> str:
+    return "https://renata.zoom.us" if "renata.zoom.us" in url else "https://zoom.us"
+
+# Clasificador de página: una sola llamada que mira la URL y unos pocos marcadores
+# del DOM. Devuelve {"estado", "anfitrion", "listo", "marco"}; "marco" es el índice del
+# iframe del mismo origen donde está la UI del Web Client (-1 si está en la página).
+_JS_CLASIFICAR_PAGINA = """
+const enlacesAnfitrion = arguments[0];
+function clasificar(doc) {
+    const host = doc.location.hostname, ruta = doc.location.pathname;
+    const hay = sel => !!doc.querySelector(sel);
+    const hayXPath = xs => xs.some(x => {
+        try { return doc.evaluate('boolean(' + x + ')', doc, null, XPathResult.BOOLEAN_TYPE, null).booleanValue; }
+        catch (e) { return false; }
+    });
+    let estado = 'desconocido', anfitrion = false;
+    if (host.endsWith('accounts.google.com')) {
+        estado = hay("input[type=password]") ? 'google_password' : 'google_cuentas';
+    } else if (host.endsWith('zoom.us')) {
+        if (ruta.startsWith('/wc/')) {
+            // La pre-unión también tiene botones de micrófono: se mira primero
+            if (hay('#joinBtn, .preview-join-button, #inputname, input[name=uname]')) {
+                estado = 'wc_preview';
+                anfitrion = hayXPath(enlacesAnfitrion);
+            } else if (hay('#wc-footer, .footer__leave-btn') ||
+                       hayXPath(["//button[contains(@aria-label,'Mic') or contains(@aria-label,'Micrófono') or contains(@aria-label,'Mute')]"])) {
+                estado = 'en_reunion';
+            } else {
+                estado = 'wc_cargando';
+            }
+        } else if (ruta.startsWith('/signin')) {
+            estado = 'zoom_signin';
+        } else if (ruta.startsWith('/profile')) {
+            estado = 'zoom_perfil';
+        } else if (ruta.startsWith('/j/') || ruta.indexOf('/launch') !== -1) {
+            estado = 'launcher';
+        }
+    }
+    return {estado: estado, anfitrion: anfitrion, listo: doc.readyState === 'complete', marco: -1};
+}
+const pagina = clasificar(document);
+if (pagina.estado === 'wc_cargando') {
+    // Algunas variantes del Web Client montan la UI en un iframe del mismo origen
+    for (let i = 0; i < window.frames.length; i++) {
+        try {
+            const doc = window.frames[i].document;
+            if (!doc.location.pathname.startsWith('/wc/')) continue;
+            const interna = clasificar(doc);
+            if (interna.estado !== 'wc_cargando') {
+                interna.marco = i;
+                interna.listo = interna.listo && pagina.listo;
+                return interna;
+            }
+        } catch (e) { /* iframe de otro origen */ }
+    }
+}
+return pagina;
+"""
+
+# Tope total del flujo de unión y de pasadas por un mismo estado (evita ciclos)
+UNION_TOPE_S = 120
+UNION_MAX_VISITAS = 3
+# Con eventos BiDi, cada cuánto se reclasifica igual por si el cambio no fue una navegación
+SONDEO_SIN_EVENTOS_S = 0.25
+
+def clasificar_pagina(driver) -> dict:
+    """Estado de la pestaña: launcher, google_cuentas, google_password, zoom_signin,
+    zoom_perfil, wc_preview, wc_cargando, en_reunion o desconocido."""
+    try:
+        return driver.execute_script(_JS_CLASIFICAR_PAGINA, LINK_SELECTORS) or {"estado": "desconocido"}
+    except Exception:
+        return {"estado": "desconocido", "anfitrion": False, "listo": False}
+
+def _esperar_otro_estado(driver, estado: str, fase: str, fijo_s: float, timeout: float = None) -> str:
+    """Espera a que la página deje 'estado' (y termine de cargar); devuelve el nuevo estado."""
+    tope = timeout or ESPERA_NAVEGACION_S
+    eventos = eventos_de(driver)
+    contexto = _pestana_actual(driver) if eventos else None
+    if contexto:
+        # Con BiDi se reclasifica en cuanto hay un evento de navegación; el sondeo lento
+        # queda solo para los cambios del Web Client que no navegan (pre-unión → reunión)
+        with MEDIDOR_FASES.fase(fase, fijo_s):
+            limite = time.monotonic() + tope
+            while True:
+                seq = eventos.estado(contexto).get("seq", 0)
+                pagina = clasificar_pagina(driver)
+                if pagina["estado"] != estado and pagina.get("listo"):
+                    return pagina["estado"]
+                restante = limite - time.monotonic()
+                if restante <= 0:
+                    return estado
+                eventos.esperar_evento(contexto, seq, min(restante, SONDEO_SIN_EVENTOS_S))
+
+    nuevo = {}
+    def cambio(d):
+        pagina = clasificar_pagina(d)
+        if pagina["estado"] != estado and pagina.get("listo"):
+            nuevo.update(pagina)
+            return True
+        return False
+    esperar_condicion(driver, cambio, fase, fijo_s, timeout or ESPERA_NAVEGACION_S)
+    return nuevo.get("estado", estado)
+
+
+@dataclass
+class ContextoUnion:
+    """Lo que los manejadores de estado necesitan saber de esta apertura."""
+    driver: object
+    wc_url: str
+    tenant: str
+    nombre_usuario: str
+    anfitrion_intentado: bool = False
+
+
+def _en_launcher(ctx: ContextoUnion, pagina: dict):
+    # Cayó en /j/<id> → "Unirse desde su navegador" (o ir directo al Web Client)
+    a = probar_selectores(ctx.driver, "join_from_browser", JOIN_FROM_BROWSER, 5)
+    if a is None:
+        ctx.driver.get(ctx.wc_url)
+        esperar_carga(ctx.driver, "web client: carga")
+        return
+    ctx.driver.execute_script("arguments[0].click();", a)
+    print("   🔁 Redirigido al Web Client correctamente.")
+    _esperar_otro_estado(ctx.driver, "launcher", "web client: desde /j/", fijo_s=2)
+
+def _en_zoom_signin(ctx: ContextoUnion, pagina: dict):
+    print("   🔑 Realizando inicio de sesión (SSO con Google)...")
+    btn = probar_selectores(ctx.driver, "google_btn_selectors", GOOGLE_BTN_SELECTORS, 5)
+    if btn is not None:
+        ctx.driver.execute_script("arguments[0].click();", btn)
+    else:
+        ctx.driver.get(f"{ctx.tenant}/signin/google")
+    _esperar_otro_estado(ctx.driver, "zoom_signin", "login: signin", fijo_s=2)
+
+def _en_google_cuentas(ctx: ContextoUnion, pagina: dict):
+    if not _google_click_cuenta(ctx.driver, timeout=1):
+        _google_escribir_correo(ctx.driver, timeout=2)
+    _esperar_otro_estado(ctx.driver, "google_cuentas", "login: cuenta Google", fijo_s=0)
+
+def _en_google_password(ctx: ContextoUnion, pagina: dict):
+    _google_escribir_password(ctx.driver, timeout=2)
+    _esperar_otro_estado(ctx.driver, "google_password", "login: contraseña Google", fijo_s=0, timeout=20)
+
+def _en_zoom_perfil(ctx: ContextoUnion, pagina: dict):
+    # Sesión lista (tras el SSO Zoom suele dejarnos en /profile) → volver al Web Client
+    print("   ✅ Sesión de Zoom activa")
+    ALMACEN_SESIONES.exportar(ctx.driver, ZOOM_EMAIL)
+    ctx.driver.get(ctx.wc_url)
+    esperar_carga(ctx.driver, "web client: desde /profile")
+
+def _en_wc_preview(ctx: ContextoUnion, pagina: dict):
+    driver = ctx.driver
+    # “Inicio de sesión del anfitrión”: solo si el enlace está y no se intentó ya
+    if pagina.get("anfitrion") and not ctx.anfitrion_intentado:
+        ctx.anfitrion_intentado = True
+        a = probar_selectores(driver, "link_selectors", LINK_SELECTORS, 0)
+        if a is not None:
+            driver.execute_script("arguments[0].scrollIntoView(true);", a)
+            driver.execute_script("arguments[0].click();", a)
+            _esperar_otro_estado(driver, "wc_preview", "host sign-in", fijo_s=3)
+            return
+
+    # Autocompletar y pulsar "Entrar"
+    try:
+        name_input = driver.find_element(By.XPATH, "//input[@id='inputname' or @name='uname']")
+        if name_input.get_attribute("value").strip() == "":
+            name_input.clear()
+            name_input.send_keys(ctx.nombre_usuario)
+    except Exception:
+        pass
+    btn = probar_selectores(driver, "posibles_botones", POSIBLES_BOTONES, 4)
+    if btn is not None:
+        driver.execute_script("arguments[0].scrollIntoView(true);", btn)
+        driver.execute_script("arguments[0].click();", btn)
+        print("   ✅ Botón 'Entrar' presionado.")
+    _esperar_otro_estado(driver, "wc_preview", "pre-unión: entrar", fijo_s=2)
+
+def _en_carga(ctx: ContextoUnion, pagina: dict):
+    # El Web Client todavía está montando la UI: esperar a que se defina
+    _esperar_otro_estado(ctx.driver, pagina["estado"], "web client: carga", fijo_s=0, timeout=5)
+
+def _en_desconocido(ctx: ContextoUnion, pagina: dict):
+    if not pagina.get("listo"):
+        _en_carga(ctx, pagina)
+        return
+    ctx.driver.get(ctx.wc_url)
+    esperar_carga(ctx.driver, "web client: carga")
+
+
+MANEJADORES_UNION = {
+    "launcher": _en_launcher,
+    "zoom_signin": _en_zoom_signin,
+    "google_cuentas": _en_google_cuentas,
+    "google_password": _en_google_password,
+    "zoom_perfil": _en_zoom_perfil,
+    "wc_preview": _en_wc_preview,
+    "wc_cargando": _en_carga,
+    "desconocido": _en_desconocido,
+}
+
+def unir_por_estados(ctx: ContextoUnion, primera_url: str, tope_s: float = None) -> str:
+    """
+    Máquina de estados de la unión: clasifica la página y ejecuta solo el manejador
+    de ese estado, hasta llegar a 'en_reunion'. Acotada por tope_s (UNION_TOPE_S) y
+    por UNION_MAX_VISITAS pasadas por estado. Devuelve el último estado observado.
+    """
+    ctx.driver.get(primera_url)
+    esperar_carga(ctx.driver, "web client: carga")
+    limite = time.monotonic() + (tope_s or UNION_TOPE_S)
+    visitas = {}
+    estado = "desconocido"
+    while time.monotonic() < limite:
+        pagina = clasificar_pagina(ctx.driver)
+        estado = pagina["estado"]
+        if estado == "en_reunion":
+            break
+        visitas[estado] = visitas.get(estado, 0) + 1
+        if visitas[estado] > UNION_MAX_VISITAS:
+            print(f"   ⚠️ La unión no avanza (estado '{estado}' repetido {visitas[estado] - 1} veces)")
+            break
+        with TRAZADOR.span(f"unión: {estado}"):
+            if pagina.get("marco", -1) >= 0:
+                # La UI está en un iframe: el manejador actúa dentro de él
+                try:
+                    ctx.driver.switch_to.frame(pagina["marco"])
+                    MANEJADORES_UNION[estado](ctx, pagina)
+                finally:
+                    ctx.driver.switch_to.default_content()
+            else:
+                MANEJADORES_UNION[estado](ctx, pagina)
+    return estado
+
+def abrir_navegador_automatico(url, nombre_usuario, incognito=False, driver=None, sesion_verificada=False,
+                               ligero=False):
+    """
+    Abre Zoom en el navegador directamente en el Web Client (Renata),
+    evitando el launcher (/j/<id>) y realizando inicio de sesión del anfitrión
+    si la sesión está guardada o se usa SSO de Google.
+    driver: navegador prestado por el PoolNavegadores, ya posicionado en la pestaña
+      de esta reunión; si es None se crea uno propio.
+    sesion_verificada: el driver prestado ya confirmó la sesión de Zoom (precalentado).
+    ligero: Chrome headless con FLAGS_LIGERO (solo si se crea uno propio).
+    """
+    print(f"   🤖 Iniciando navegador automatizado...")
+    print(f"   👤 Usuario: {nombre_usuario}")
+
+    prestado = driver is not None
     try:
         # ==============================
-        # Iniciar ChromeDriver
+        # Iniciar ChromeDriver (o reutilizar una instancia del pool)
         # ==============================
-        print("   ⏳ Descargando/verificando ChromeDriver...")
-        service = Service(ChromeDriverManager().install())
-        driver = webdriver.Chrome(service=service, options=chrome_options)
+        if prestado:
+            print("   ♨️  Usando un navegador ya iniciado")
+        else:
+            driver = iniciar_navegador(incognito, ligero)
         wait = WebDriverWait(driver, 15)
-        print("   ✅ Navegador iniciado")
 
         # ==============================
-        # Construir URL Web Client válida
+        # Unión guiada por el estado de la página
         # ==============================
-        def get_webclient_url(meeting_url, display_name):
-            from urllib.parse import quote
-            base = "https://renata.zoom.us" if "renata.zoom.us" in meeting_url else "https://zoom.us"
-            meeting_id = extract_meeting_id(meeting_url)
-            if not meeting_id:
-                import re
-                m = re.search(r"(?<!\d)(\d{9,12})(?!\d)", meeting_url)
-                meeting_id = m.group(1) if m else ""
-            return f"{base}/wc/join/{meeting_id}?prefer=1&uname={quote(display_name)}"
-
+        tenant = tenant_de_url(url)
         wc_url = get_webclient_url(url, nombre_usuario)
+        ctx = ContextoUnion(driver, wc_url, tenant, nombre_usuario)
+        if PRIMERA_VEZ and not sesion_verificada:
+            # Forzar el SSO: empezar por /signin; tras el login se vuelve al Web Client
+            primera = f"{tenant}/signin"
+        else:
+            primera = wc_url
         print(f"   🌐 Abriendo Web Client: {wc_url}")
-        driver.get(wc_url)
-        time.sleep(2)
+        with TRAZADOR.span("unión") as span:
+            estado = unir_por_estados(ctx, primera)
+            span["estado_final"] = estado
+            if estado != "en_reunion":
+                span["resultado"] = "fallo"
 
         # ==============================
-        # Si cayó en /j/<id> → buscar "Unirse desde su navegador"
+        # Confirmar si entró al Web Client y PAUSAR grabación
         # ==============================
-        if ("/j/" in driver.current_url or "/launch" in driver.current_url) and "/wc/" not in driver.current_url:
-            try:
-                join_from_browser = [
-                    "//a[contains(.,'Unirse desde su navegador')]",
-                    "//a[contains(.,'Únase desde su navegador')]",
-                    "//a[contains(.,'Join from your browser')]",
-                ]
-                for sx in join_from_browser:
-                    try:
-                        a = WebDriverWait(driver, 5).until(EC.element_to_be_clickable((By.XPATH, sx)))
-                        driver.execute_script("arguments[0].click();", a)
-                        print("   🔁 Redirigido al Web Client correctamente.")
-                        time.sleep(2)
+        if estado == "en_reunion":
+            print("   🎉 ¡ÉXITO! Ya estás en la reunión de Zoom (Web Client).")
+            # pause_recording_in_webclient espera por sí misma a que aparezcan los controles
+            with TRAZADOR.span("pausa: web client") as span:
+                if not pause_recording_in_webclient(driver, wait):
+                    span["resultado"] = "fallo"
+            return True
+
+        print(f"   ❌ No se llegó a la reunión (estado final '{estado}'), URL actual: {driver.current_url}")
+        if not prestado and CERRAR_NAVEGADOR_SI_FALLA:
+            driver.quit()
+        return False
+
+    except Exception as e:
+        print(f"   ❌ Error general: {e}")
+        try:
+            # Un driver prestado lo libera su dueño (el pool cierra solo la pestaña)
+            if driver and not prestado and CERRAR_NAVEGADOR_SI_FALLA:
+                driver.quit()
+        except Exception:
+            pass
+        return False
+
+
+
+
+# =====================================
+# POOL DE NAVEGADORES Y PRECALENTAMIENTO
+# =====================================
+def minutos_precalentar(reunion: dict) -> float:
+    """Minutos antes del run en que se precalienta el navegador (0 = no precalentar)."""
+    if reunion.get("modo", "zoom_app") != "navegador_auto":
+        return 0
+    return float(reunion.get("precalentar_min", PRECALENTAR_MIN))
+
+def _perfil_de(incognito: bool, ligero: bool = False) -> str:
+    """
+    Perfil de Chrome que usa una apertura: el persistente o uno desechable (incógnito),
+    en su variante ligera si corresponde (las instancias ligeras no se mezclan con las normales).
+    """
+    if GUARDAR_SESION and not incognito:
+        return CHROME_PROFILE_LIGERO_DIR if ligero else CHROME_PROFILE_DIR
+    return "incognito-ligero" if ligero else "incognito"
+
+def _rss_arbol_mb(pid: int) -> float | None:
+    """RSS total (MB) de un proceso y sus descendientes leyendo /proc; None fuera de Linux."""
+    if not pid or not os.path.isdir("/proc"):
+        return None
+    total_kb, pendientes, vistos = 0, [pid], set()
+    while pendientes:
+        actual = pendientes.pop()
+        if actual in vistos:
+            continue
+        vistos.add(actual)
+        try:
+            with open(f"/proc/{actual}/status") as f:
+                for linea in f:
+                    if linea.startswith("VmRSS:"):
+                        total_kb += int(linea.split()[1])
                         break
-                    except Exception:
-                        continue
-            except Exception:
-                pass
+            for tid in os.listdir(f"/proc/{actual}/task"):
+                with open(f"/proc/{actual}/task/{tid}/children") as f:
+                    pendientes.extend(int(h) for h in f.read().split())
+        except (OSError, ValueError):
+            continue
+    return total_kb / 1024
 
-        # ==============================
-        # Si no hay sesión → hacer SSO Google
-        # ==============================
-        if PRIMERA_VEZ or "signin" in driver.current_url or "accounts.google.com" in driver.current_url:
-            print("   🔑 Realizando inicio de sesión (SSO con Google)...")
-            tenant_base = "https://renata.zoom.us" if "renata.zoom.us" in url else "https://zoom.us"
-            login_zoom_via_google(driver, wait, tenant_base=tenant_base)
-            driver.get(wc_url)
-            time.sleep(2)
 
-        # ==============================
-        # Si queda en /profile → volver al Web Client
-        # ==============================
-        if "/profile" in driver.current_url:
-            driver.get(wc_url)
-            time.sleep(2)
+# Estado de sesión que se copia del perfil dorado a cada clon (rutas relativas al
+# user-data-dir). Las bases SQLite se copian con la API de backup de sqlite3, que da
+# una copia consistente aunque el perfil dorado esté abierto.
+BASES_PERFIL = ("Default/Cookies", "Default/Network/Cookies")
+ARCHIVOS_PERFIL = ("Local State", "Default/Preferences")
+DIRECTORIOS_PERFIL = ("Default/Local Storage",)
+_FICLONE = 0x40049409
 
-        # ==============================
-        # Intentar “Inicio de sesión del anfitrión”
-        # ==============================
-        def try_host_sign_in_on_wc(driver, wait, tenant_base):
+def _copiar_cow(origen: str, destino: str):
+    """Copia con reflink (copy-on-write) si el sistema de archivos lo permite; si no, copia normal."""
+    if fcntl is not None:
+        try:
+            with open(origen, "rb") as src, open(destino, "wb") as dst:
+                fcntl.ioctl(dst.fileno(), _FICLONE, src.fileno())
+            shutil.copystat(origen, destino)
+            return
+        except OSError:
+            pass
+    shutil.copy2(origen, destino)
+
+def _copiar_base(origen: str, destino: str):
+    src = sqlite3.connect(pathlib.Path(origen).as_uri() + "?mode=ro", uri=True)
+    try:
+        dst = sqlite3.connect(destino)
+        try:
+            src.backup(dst)
+        finally:
+            dst.close()
+    finally:
+        src.close()
+
+
+class GestorPerfiles:
+    """
+    Clones de usar y tirar del perfil dorado (el persistente, con la sesión de la cuenta).
+    Cada clon es un user-data-dir nuevo con solo el estado de sesión copiado, así que
+    se crea en milisegundos y admite un Chrome propio. Al cerrar su Chrome el clon se
+    borra; si trae una sesión más nueva (se hizo login en él) primero se promueven sus
+    cookies al dorado. Los clones huérfanos de procesos muertos se recogen al arrancar.
+    """
+
+    def __init__(self, directorio: str = None):
+        self.directorio = directorio or PERFILES_CLON_DIR
+        self._seq = itertools.count(1)
+        self._lock = threading.Lock()   # serializa copias desde/hacia el dorado
+
+    def clonar(self, dorado: str) -> str:
+        ruta = os.path.join(self.directorio, f"{os.getpid()}-{next(self._seq)}")
+        os.makedirs(os.path.join(ruta, "Default"), exist_ok=True)
+        with self._lock:
+            for rel in BASES_PERFIL:
+                origen = os.path.join(dorado, rel)
+                if os.path.exists(origen):
+                    os.makedirs(os.path.dirname(os.path.join(ruta, rel)), exist_ok=True)
+                    _copiar_base(origen, os.path.join(ruta, rel))
+            for rel in ARCHIVOS_PERFIL:
+                origen = os.path.join(dorado, rel)
+                if os.path.exists(origen):
+                    _copiar_cow(origen, os.path.join(ruta, rel))
+            for rel in DIRECTORIOS_PERFIL:
+                origen = os.path.join(dorado, rel)
+                if os.path.isdir(origen):
+                    shutil.copytree(origen, os.path.join(ruta, rel), copy_function=_copiar_cow,
+                                    ignore=shutil.ignore_patterns("LOCK"), dirs_exist_ok=True)
+        return ruta
+
+    def _promover(self, clon: str, dorado: str):
+        """Lleva las cookies del clon al dorado si son más nuevas y el dorado no está en uso."""
+        if os.path.lexists(os.path.join(dorado, "SingletonLock")):
+            return
+        with self._lock:
+            for rel in BASES_PERFIL:
+                origen, destino = os.path.join(clon, rel), os.path.join(dorado, rel)
+                if not os.path.exists(origen):
+                    continue
+                if os.path.exists(destino) and os.path.getmtime(destino) >= os.path.getmtime(origen):
+                    continue
+                os.makedirs(os.path.dirname(destino), exist_ok=True)
+                _copiar_base(origen, destino)
+
+    def liberar(self, clon: str, dorado: str = None):
+        """Borra el clon (tras cerrar su Chrome); con 'dorado', antes promueve su sesión."""
+        if dorado:
             try:
-                link_selectors = [
-                    "//a[contains(.,'Inicio de sesión del anfitrión')]",
-                    "//a[contains(.,'Host sign in')]",
-                    "//a[contains(@href,'signin')]"
-                ]
-                for sx in link_selectors:
-                    try:
-                        a = WebDriverWait(driver, 3).until(EC.element_to_be_clickable((By.XPATH, sx)))
-                        driver.execute_script("arguments[0].click();", a)
-                        time.sleep(3)
-                        if "signin" in driver.current_url or "accounts.google.com" in driver.current_url:
-                            login_zoom_via_google(driver, wait, tenant_base=tenant_base)
-                            driver.get(wc_url)
-                            time.sleep(2)
-                        return True
-                    except Exception:
-                        continue
-                return False
-            except Exception:
-                return False
+                self._promover(clon, dorado)
+            except Exception as e:
+                print(f"   ⚠️ No pude actualizar el perfil dorado desde {clon}: {e}")
+        shutil.rmtree(clon, ignore_errors=True)
 
-        tenant_base = "https://renata.zoom.us" if "renata.zoom.us" in url else "https://zoom.us"
-        try_host_sign_in_on_wc(driver, wait, tenant_base)
+    def recolectar(self) -> int:
+        """Borra clones de procesos que ya no existen; devuelve cuántos."""
+        try:
+            nombres = os.listdir(self.directorio)
+        except OSError:
+            return 0
+        borrados = 0
+        for nombre in nombres:
+            pid = nombre.split("-", 1)[0]
+            if not pid.isdigit() or int(pid) == os.getpid() or _proceso_vivo(int(pid)):
+                continue
+            shutil.rmtree(os.path.join(self.directorio, nombre), ignore_errors=True)
+            borrados += 1
+        return borrados
 
-        # ==============================
-        # Autocompletar y pulsar "Entrar" si está la pre-unión
-        # ==============================
+
+def _proceso_vivo(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+        return True
+    except ProcessLookupError:
+        return False
+    except OSError:
+        return True
+
+
+GESTOR_PERFILES = GestorPerfiles()
+
+
+class _InstanciaChrome:
+    """Un Chrome de larga vida del pool: pestaña base + una pestaña por reunión."""
+
+    def __init__(self, perfil: str, driver, clon: str = None):
+        self.perfil = perfil
+        self.driver = driver
+        self.clon = clon                           # user-data-dir clonado (None = el propio perfil)
+        self.base = driver.current_window_handle   # pestaña de estacionamiento (about:blank)
+        self.lock = threading.Lock()               # WebDriver no admite comandos concurrentes
+        self.foco = None                           # vista de pestaña con el foco real (None = desconocido)
+        self.pestanas = {}                         # clave de reunión -> window handle
+        self.usos = 0
+        self.sesion_verificada = False
+        self.retirando = False
+        self.precalentada = 0.0                    # time.monotonic() del último precalentamiento
+
+    def viva(self) -> bool:
+        try:
+            self.driver.window_handles
+            return True
+        except Exception:
+            return False
+
+    def rss_mb(self) -> float | None:
+        try:
+            return _rss_arbol_mb(self.driver.service.process.pid)
+        except Exception:
+            return None
+
+    def cerrar(self):
+        try:
+            self.driver.quit()
+        except Exception:
+            pass
+        if self.clon:
+            GESTOR_PERFILES.liberar(self.clon, self.perfil)
+
+
+def _driver_de_pestana(inst: _InstanciaChrome, handle: str):
+    """
+    Copia del driver de 'inst' fijada a la pestaña 'handle'. Cada comando WebDriver
+    (también los de sus WebElement y de switch_to) toma inst.lock solo mientras se
+    ejecuta y, si otra pestaña se llevó el foco, antes vuelve a esta y a su iframe.
+    Así varias uniones avanzan a la vez en el mismo Chrome sin bloquear al pool.
+    """
+    vista = copy.copy(inst.driver)
+    ejecutar = type(inst.driver).execute   # sin enlazar: los WebElement quedan ligados a la vista
+    foco = {"handle": handle, "marcos": []}
+
+    def execute(comando, params=None):
+        with inst.lock:
+            if inst.foco is not vista:
+                ejecutar(vista, Command.SWITCH_TO_WINDOW, {"handle": foco["handle"]})
+                for marco in foco["marcos"]:
+                    ejecutar(vista, Command.SWITCH_TO_FRAME, {"id": marco})
+                inst.foco = vista
+            resultado = ejecutar(vista, comando, params)
+            if comando == Command.SWITCH_TO_FRAME:
+                if params["id"] is None:
+                    foco["marcos"].clear()
+                else:
+                    foco["marcos"].append(params["id"])
+            elif comando == Command.SWITCH_TO_PARENT_FRAME and foco["marcos"]:
+                foco["marcos"].pop()
+            elif comando == Command.GET:
+                foco["marcos"].clear()
+            elif comando == Command.SWITCH_TO_WINDOW:
+                foco.update(handle=params["handle"], marcos=[])
+            return resultado
+
+    vista.execute = execute
+    vista._switch_to = SwitchTo(vista)
+    # Los eventos BiDi van por pestaña: la vista comparte la suscripción del driver
+    eventos = eventos_de(inst.driver)
+    with _eventos_lock:
+        _eventos_por_driver[vista] = eventos
+    return vista
+
+
+class PoolNavegadores:
+    """
+    Instancias de Chrome de larga vida por perfil. Cada reunión se abre en una
+    pestaña nueva de una instancia libre, así el arranque en frío de Chrome solo se
+    paga una vez. Una instancia se recicla tras RECICLAR_NAVEGADOR_USOS aperturas o
+    si su RSS supera RECICLAR_NAVEGADOR_RSS_MB, cuando ya no tiene reuniones abiertas.
+    """
+
+    def __init__(self, max_por_perfil: int = None):
+        self.max_por_perfil = max_por_perfil or MAX_NAVEGADORES_POR_PERFIL
+        self._cond = threading.Condition()
+        self._instancias = {}   # perfil -> [ _InstanciaChrome ]
+        self._creando = {}      # perfil -> instancias en arranque
+        self._de_reunion = {}   # clave de reunión -> _InstanciaChrome
+
+    @staticmethod
+    def _cerrar_muertas(muertas: list):
+        """quit() de las instancias que dejaron de responder (fuera de la Condition: puede tardar)."""
+        for inst in muertas:
+            print("   ⚠️ Una instancia de Chrome del pool dejó de responder; se descarta.")
+            inst.cerrar()
+            inst.lock.release()
+
+    def _limite(self, perfil: str) -> int:
+        # Chrome bloquea un user-data-dir a un solo proceso (SingletonLock)
+        # salvo que cada instancia use su propio clon del perfil
+        return self.max_por_perfil if perfil.startswith("incognito") or CLONAR_PERFILES else 1
+
+    def _tomar_instancia(self, incognito: bool, timeout: float, ligero: bool = False) -> _InstanciaChrome:
+        """Devuelve una instancia libre (con su lock tomado), creándola si hace falta."""
+        perfil = _perfil_de(incognito, ligero)
+        limite = time.monotonic() + timeout
+        while True:
+            with self._cond:
+                candidatas = sorted(self._instancias.get(perfil, []), key=lambda i: i.retirando)
+            # viva() es un viaje a chromedriver: se hace fuera de la Condition y con el
+            # lock de la instancia (sin competir con sus vistas). Las ocupadas están vivas.
+            libre, crear, muertas = None, False, []
+            for inst in candidatas:
+                if not inst.lock.acquire(blocking=False):
+                    continue
+                if inst.viva():
+                    libre = inst
+                    break
+                muertas.append(inst)   # su lock queda tomado hasta cerrarla
+            with self._cond:
+                vivas = [i for i in self._instancias.get(perfil, []) if i not in muertas]
+                self._instancias[perfil] = vivas
+                hay_lugar = len(vivas) + self._creando.get(perfil, 0) < self._limite(perfil)
+                # Las instancias por reciclar solo reciben pestañas si no se puede
+                # levantar otra (p. ej. el perfil persistente, que admite una sola);
+                # tampoco una que otro hilo sacó del pool mientras se revisaba.
+                if libre is not None and ((libre.retirando and hay_lugar) or libre not in vivas):
+                    libre.lock.release()
+                    libre = None
+                if libre is None and hay_lugar:
+                    self._creando[perfil] = self._creando.get(perfil, 0) + 1
+                    crear = True
+                elif libre is None and not muertas:
+                    restante = limite - time.monotonic()
+                    if restante <= 0:
+                        raise TimeoutError("no hay navegadores libres en el pool")
+                    self._cond.wait(min(restante, 1.0))
+            self._cerrar_muertas(muertas)
+            if libre is not None:
+                return libre
+            if crear:
+                break
+
+        try:
+            inst = self._nueva_instancia(perfil, incognito, ligero)
+            inst.lock.acquire()
+        finally:
+            with self._cond:
+                self._creando[perfil] -= 1
+        with self._cond:
+            self._instancias.setdefault(perfil, []).append(inst)
+        return inst
+
+    @staticmethod
+    def _nueva_instancia(perfil: str, incognito: bool, ligero: bool) -> _InstanciaChrome:
+        if not CLONAR_PERFILES or perfil.startswith("incognito"):
+            return _InstanciaChrome(perfil, iniciar_navegador(incognito, ligero))
+        clon = GESTOR_PERFILES.clonar(perfil)
+        try:
+            driver = iniciar_navegador(incognito, ligero, user_data_dir=clon)
+        except Exception:
+            GESTOR_PERFILES.liberar(clon)
+            raise
+        print(f"   🧬 Chrome sobre un clon del perfil ({os.path.basename(clon)})")
+        return _InstanciaChrome(perfil, driver, clon)
+
+    def _devolver(self, inst: _InstanciaChrome):
+        """Suelta el lock de la instancia y la retira si ya cumplió su ciclo."""
+        rss = inst.rss_mb()
+        if inst.usos >= RECICLAR_NAVEGADOR_USOS or (rss is not None and rss > RECICLAR_NAVEGADOR_RSS_MB):
+            if not inst.retirando:
+                print(f"   ♻️  Instancia de Chrome marcada para reciclar ({inst.usos} usos, RSS {rss or 0:.0f} MB).")
+            inst.retirando = True
+        cerrar = inst.retirando and not inst.pestanas
+        inst.foco = None   # se usó el driver sin vista: la pestaña activa ya no es conocida
+        inst.lock.release()
+        with self._cond:
+            if cerrar:
+                self._instancias[inst.perfil] = [i for i in self._instancias.get(inst.perfil, []) if i is not inst]
+            self._cond.notify_all()
+        if cerrar:
+            inst.cerrar()
+
+    def precalentar(self, incognito: bool, verificar_sesion, forzar: bool = False, ligero: bool = False) -> bool:
+        """
+        Asegura una instancia viva para el perfil y verifica la sesión con
+        verificar_sesion(driver); forzar=True la vuelve a verificar aunque ya se hubiera hecho.
+        """
+        inst = self._tomar_instancia(incognito, timeout=PRECALENTAR_ESPERA_S, ligero=ligero)
+        try:
+            inst.driver.switch_to.window(inst.base)
+            if forzar or not inst.sesion_verificada:
+                verificar_sesion(inst.driver)
+                inst.sesion_verificada = True
+            inst.driver.get("about:blank")
+            inst.precalentada = time.monotonic()
+            return True
+        finally:
+            self._devolver(inst)
+
+    @contextmanager
+    def pestana(self, clave, incognito: bool, ligero: bool = False):
+        """
+        Presta (driver, sesion_verificada) con el driver fijado a una pestaña nueva para
+        la reunión 'clave' (_driver_de_pestana). La instancia solo queda tomada mientras
+        se abre la pestaña y durante cada comando, así otras aperturas y el ciclo de vida
+        la usan en paralelo; la pestaña sigue abierta hasta liberar(clave).
+        """
+        inst = self._tomar_instancia(incognito, timeout=PRECALENTAR_ESPERA_S, ligero=ligero)
+        try:
+            inst.driver.switch_to.window(inst.base)
+            inst.driver.switch_to.new_window("tab")
+            handle = inst.driver.current_window_handle
+            with self._cond:
+                inst.pestanas[clave] = handle
+                self._de_reunion[clave] = inst
+            inst.usos += 1
+            verificada = inst.sesion_verificada
+        finally:
+            self._devolver(inst)
+        yield _driver_de_pestana(inst, handle), verificada
+
+    @contextmanager
+    def usar(self, clave, timeout: float | None = None):
+        """
+        Toma el driver de la reunión 'clave' en su pestaña (None si ya no existe).
+        timeout: segundos máximos esperando a que la instancia quede libre
+        (None = sin límite); si se agotan, TimeoutError.
+        """
+        with self._cond:
+            inst = self._de_reunion.get(clave)
+        if inst is None:
+            yield None
+            return
+        if not inst.lock.acquire(timeout=-1 if timeout is None else timeout):
+            raise TimeoutError("el navegador de la reunión está ocupado")
         try:
-            posibles_botones = [
-                "//button[@id='joinBtn']",
-                "//button[contains(translate(text(),'ENTRAR','entrar'),'entrar')]",
-                "//button[contains(translate(text(),'JOIN','join'),'join')]",
-                "//button[contains(translate(text(),'UNIRSE','unirse'),'unirse')]",
-                "//button[contains(@class,'preview-join-button')]",
-            ]
             try:
-                name_input = driver.find_element(By.XPATH, "//input[@id='inputname' or @name='uname']")
-                if name_input.get_attribute("value").strip() == "":
-                    name_input.clear()
-                    name_input.send_keys(nombre_usuario)
-                    time.sleep(0.3)
+                inst.driver.switch_to.window(inst.pestanas[clave])
             except Exception:
-                pass
+                yield None
+                return
+            yield inst.driver
+        finally:
+            inst.foco = None
+            inst.lock.release()
 
-            for sx in posibles_botones:
-                try:
-                    btn = WebDriverWait(driver, 4).until(EC.element_to_be_clickable((By.XPATH, sx)))
-                    driver.execute_script("arguments[0].scrollIntoView(true);", btn)
-                    driver.execute_script("arguments[0].click();", btn)
-                    print("   ✅ Botón 'Entrar' presionado.")
-                    time.sleep(2)
-                    break
-                except Exception:
-                    continue
-        except Exception as e:
-            print(f"   ⚠️ Error en pre-unión: {e}")
+    def liberar(self, clave, cerrar_si_ociosa: bool = False):
+        """
+        Cierra la pestaña de una reunión (y la instancia si estaba por reciclarse).
+        cerrar_si_ociosa: cerrar también el Chrome si queda sin reuniones, salvo que
+        se haya precalentado hace poco para otra (RETENER_PRECALENTADA_S).
+        """
+        with self._cond:
+            inst = self._de_reunion.pop(clave, None)
+        if inst is None:
+            return
+        inst.lock.acquire()
+        handle = inst.pestanas.pop(clave, None)
+        if (cerrar_si_ociosa and not inst.pestanas
+                and time.monotonic() - inst.precalentada > RETENER_PRECALENTADA_S):
+            inst.retirando = True
+        try:
+            if handle is not None and handle in inst.driver.window_handles:
+                inst.driver.switch_to.window(handle)
+                inst.driver.close()
+            inst.driver.switch_to.window(inst.base)
+        except Exception:
+            pass
+        self._devolver(inst)
 
-        # ==============================
-        # Confirmar si entró al Web Client y PAUSAR grabación
-        # ==============================
-        cur = driver.current_url
-       # Confirmar si entró al Web Client (y pausar grabación)
-        cur = driver.current_url
-        if '/wc/' in cur:
-            print("   🎉 ¡ÉXITO! Ya estás en la reunión de Zoom (Web Client).")
-            time.sleep(4)  # dar tiempo a que aparezcan los controles
-            pause_recording_in_webclient(driver, wait)
+    def estado(self) -> list:
+        with self._cond:
+            return [{"perfil": inst.perfil, "pestanas": len(inst.pestanas), "usos": inst.usos,
+                     "retirando": inst.retirando}
+                    for instancias in self._instancias.values() for inst in instancias]
+
+    def cerrar_todo(self):
+        with self._cond:
+            instancias = [i for lista in self._instancias.values() for i in lista]
+            self._instancias.clear()
+            self._de_reunion.clear()
+        for inst in instancias:
+            inst.cerrar()
+
+
+POOL_NAVEGADORES = PoolNavegadores()
+
+def _verificar_sesion_zoom(base: str):
+    """Devuelve verificar_sesion(driver) para el tenant 'base' (usado al precalentar)."""
+    def verificar(driver):
+        driver.get(f"{base}/profile")
+        esperar_carga(driver, "precalentar: /profile")
+        if PRIMERA_VEZ or not zoom_logged_in(driver):
+            print("   🔑 Sesión de Zoom no activa: iniciando sesión antes de la apertura...")
+            with TRAZADOR.span("login: SSO Google"):
+                login_zoom_via_google(driver, WebDriverWait(driver, 15), tenant_base=base)
         else:
-            print(f"   ℹ️ Revisa manualmente, URL actual: {cur}")
+            print("   ✅ Sesión de Zoom activa")
+            # Mantener fresca la copia guardada (nuevos vencimientos)
+            ALMACEN_SESIONES.exportar(driver, ZOOM_EMAIL)
+    return verificar
 
+def precalentar_navegador(reunion: dict, inicio: datetime | None = None) -> bool:
+    """
+    Fase previa a la apertura: levanta (o reutiliza) el Chrome del pool para el perfil
+    de la reunión, verifica o renueva la sesión de Zoom y lo deja estacionado en
+    about:blank. A la hora de apertura solo falta navegar al Web Client y pulsar 'Entrar'.
+    inicio: hora de inicio de la clase (solo informativa).
+    """
+    nombre = reunion.get("nombre")
+    clase = f" (clase de las {inicio.astimezone(TZ).strftime('%H:%M')})" if inicio else ""
+    print(f"\n♨️  Precalentando navegador para: {nombre}{clase}")
+    try:
+        with TRAZADOR.lanzamiento("precalentamiento", reunion=nombre):
+            POOL_NAVEGADORES.precalentar(reunion.get("incognito", False),
+                                         _verificar_sesion_zoom(tenant_de_url(reunion["url"])),
+                                         ligero=es_ligero(reunion))
+        print(f"   ♨️  {nombre}: navegador listo, esperando la hora de apertura.")
         return True
-
     except Exception as e:
-        print(f"   ❌ Error general: {e}")
+        print(f"   ⚠️ {nombre}: no se pudo precalentar ({e}); se abrirá en frío.")
+        return False
+
+def clave_pestana(reunion: dict) -> str:
+    """Identifica la pestaña de una apertura concreta dentro del pool."""
+    return f"{reunion.get('nombre')}|{reunion.get('url')}|{time.monotonic_ns()}"
+
+
+def abrir_reunion(reunion, inicio: datetime | None = None):
+    """
+    Abre una reunión según su configuración. inicio: hora de inicio de la clase, para
+    calcular cuándo termina (ciclo de vida del navegador); por defecto, ahora.
+    Cada apertura deja su traza (TRAZADOR) con el tiempo de cada fase.
+    """
+    modo = reunion.get("modo", "zoom_app")
+    with TRAZADOR.lanzamiento("lanzamiento", reunion=reunion.get("nombre"), modo=modo) as span:
+        ok = _abrir_reunion(reunion, modo, inicio)
+        if not ok:
+            span["resultado"] = "fallo"
+        return ok
+
+def _abrir_reunion(reunion, modo: str, inicio: datetime | None):
+    url = reunion["url"]
+
+    if modo == "zoom_app":
+        return abrir_zoom_app(url)
+    elif modo == "navegador_auto":
+        nombre = reunion.get("nombre_usuario", "Usuario")
+        incognito = reunion.get("incognito", False)
+        ligero = es_ligero(reunion)
+        fin = fin_de_reunion(reunion, inicio or datetime.now(TZ))
+        if not USAR_POOL_NAVEGADORES:
+            # Chrome propio: se conserva el handle para cerrarlo al terminar la clase
+            try:
+                driver = iniciar_navegador(incognito, ligero)
+            except Exception as e:
+                print(f"   ❌ No pude iniciar el navegador: {e}")
+                return False
+            ok = abrir_navegador_automatico(url, nombre, incognito, driver=driver, ligero=ligero)
+            return _entregar_a_ciclo_vida(reunion.get("nombre"), fin, ok,
+                                          lambda timeout=None: nullcontext(driver), driver.quit)
+        clave = clave_pestana(reunion)
         try:
-            if driver:
-                driver.quit()
+            with POOL_NAVEGADORES.pestana(clave, incognito, ligero) as (driver, verificada):
+                ok = abrir_navegador_automatico(url, nombre, incognito, driver=driver, sesion_verificada=verificada)
+        except Exception as e:
+            print(f"   ❌ No pude obtener un navegador del pool: {e}")
+            POOL_NAVEGADORES.liberar(clave)
+            return False
+        return _entregar_a_ciclo_vida(reunion.get("nombre"), fin, ok,
+                                      lambda timeout=None: POOL_NAVEGADORES.usar(clave, timeout),
+                                      lambda: POOL_NAVEGADORES.liberar(clave, cerrar_si_ociosa=True))
+    else:
+        print(f"⚠️  Modo desconocido: {modo}")
+        return False
+
+def _entregar_a_ciclo_vida(nombre: str, fin: datetime | None, ok: bool, usar, cerrar) -> bool:
+    """
+    Registra el navegador de la apertura en CICLO_VIDA y devuelve ok. Una unión fallida
+    también se registra (para terminarla a mano; se libera a la hora de fin), salvo con
+    CERRAR_NAVEGADOR_SI_FALLA, que la cierra en el acto.
+    """
+    if ok:
+        CICLO_VIDA.registrar(nombre, fin, usar, cerrar)
+    elif not CERRAR_NAVEGADOR_SI_FALLA:
+        print("   🖐️ El navegador queda abierto para terminar la unión a mano.")
+        CICLO_VIDA.registrar(f"{nombre} (revisión manual)", fin, usar, cerrar)
+    else:
+        try:
+            cerrar()
         except Exception:
             pass
+    return ok
+
+# =====================================
+# CICLO DE VIDA DE LAS REUNIONES
+# =====================================
+def fin_de_reunion(reunion: dict, inicio: datetime) -> datetime | None:
+    """Hora de fin declarada ("duracion_min" o "hora_fin" HH:MM); None si no declara ninguna."""
+    if reunion.get("duracion_min") is not None:
+        return inicio + timedelta(minutes=float(reunion["duracion_min"]))
+    if reunion.get("hora_fin"):
+        hora = _parse_hhmm(reunion["hora_fin"])
+        inicio = inicio.astimezone(TZ)
+        fin = inicio.replace(hour=hora.hour, minute=hora.minute, second=0, microsecond=0)
+        return fin if fin > inicio else fin + timedelta(days=1)
+    return None
+
+# Textos con los que el Web Client avisa que la reunión terminó (en minúsculas)
+FRASES_REUNION_TERMINADA = [
+    "this meeting has been ended",
+    "the meeting has ended",
+    "meeting has been ended by host",
+    "la reunión ha finalizado",
+    "esta reunión ha sido finalizada",
+    "el anfitrión ha finalizado la reunión",
+    "el anfitrión finalizó la reunión",
+]
+
+_JS_ESTADO_REUNION = """
+let texto = ((document.body && document.body.innerText) || '').toLowerCase();
+for (let i = 0; i < window.frames.length; i++) {
+    try { texto += ' ' + (window.frames[i].document.body.innerText || '').toLowerCase(); }
+    catch (e) { /* iframe de otro origen */ }
+}
+if (arguments[0].some(f => texto.indexOf(f) !== -1)) return 'terminada';
+return location.pathname.startsWith('/wc/') ? 'en_curso' : 'fuera';
+"""
+
+def estado_reunion(driver) -> str:
+    """'en_curso', 'terminada' (aviso de fin en la UI) o 'fuera' (ya no está en el Web Client)."""
+    try:
+        return driver.execute_script(_JS_ESTADO_REUNION, FRASES_REUNION_TERMINADA)
+    except Exception:
+        return "fuera"
+
+def salir_de_reunion(driver) -> bool:
+    """Pulsa 'Salir' y confirma 'Salir de la reunión' (nunca 'Finalizar para todos')."""
+    _, salir = carrera_selectores(driver, [
+        "//button[contains(@class,'footer__leave-btn')]",
+        "//button[@aria-label='Leave' or @aria-label='Salir']",
+        "//button[normalize-space(.)='Leave' or normalize-space(.)='Salir']",
+    ], 3)
+    if salir is None:
         return False
+    driver.execute_script("arguments[0].click();", salir)
+    _, confirmar = carrera_selectores(driver, [
+        "//button[contains(.,'Leave Meeting') or contains(.,'Leave meeting')]",
+        "//button[contains(.,'Salir de la reunión')]",
+    ], 3)
+    if confirmar is not None:
+        driver.execute_script("arguments[0].click();", confirmar)
+    return True
+
+
+class CicloVidaReuniones:
+    """
+    Guarda el navegador de cada reunión abierta y lo libera cuando la clase termina:
+    a la hora de fin declarada (+ MARGEN_FIN_MIN) o antes, si la UI avisa que la
+    reunión terminó. Un solo hilo revisa todas las reuniones con un min-heap de
+    próximas revisiones (cada CICLO_VIDA_SONDEO_S como máximo).
+    usar(timeout=None): context manager que da el driver posicionado en la reunión (o None);
+      TimeoutError si el navegador sigue ocupado tras 'timeout' segundos.
+    cerrar(): libera el navegador (cierra la pestaña del pool o hace quit()).
+    """
+
+    def __init__(self, sondeo_s: float = None):
+        self.sondeo_s = sondeo_s or CICLO_VIDA_SONDEO_S
+        self._heap = []    # (próxima revisión monotónica, seq, entrada)
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._hilo = None
+        self._activas = 0        # registradas y aún no terminadas (incluye la que se está revisando)
+        self._cerrando = False
+
+    def registrar(self, nombre: str, fin: datetime | None, usar, cerrar):
+        entrada = {"nombre": nombre, "fin": fin, "usar": usar, "cerrar": cerrar}
+        with self._cond:
+            cerrando = self._cerrando
+            self._activas += 1
+        if cerrando:
+            # Una apertura que terminó mientras el script se cierra
+            self._terminar(entrada, "fin del script")
+            return
+        if fin is not None:
+            print(f"   🕓 {nombre}: se saldrá de la reunión a las "
+                  f"{(fin + timedelta(minutes=MARGEN_FIN_MIN)).astimezone(TZ).strftime('%H:%M')}.")
+        with self._cond:
+            heapq.heappush(self._heap, (time.monotonic() + self._espera(entrada), next(self._seq), entrada))
+            if self._hilo is None:
+                self._hilo = threading.Thread(target=self._bucle, name="ciclo-vida", daemon=True)
+                self._hilo.start()
+            self._cond.notify()
+
+    def activas(self) -> int:
+        with self._cond:
+            return self._activas
+
+    def cerrar_todas(self, timeout: float = 60):
+        """
+        Sale de todas las reuniones abiertas y libera sus navegadores (al cerrar el script).
+        Espera hasta 'timeout' s a la que el hilo esté revisando en ese momento.
+        """
+        with self._cond:
+            self._cerrando = True
+            entradas = [entrada for _, _, entrada in self._heap]
+            self._heap.clear()
+        for entrada in entradas:
+            self._terminar(entrada, "fin del script")
+        with self._cond:
+            self._cond.wait_for(lambda: self._activas <= 0, timeout)
+
+    def _espera(self, entrada: dict) -> float:
+        """Segundos hasta la próxima revisión: el sondeo o la hora de fin, lo que llegue antes."""
+        if entrada["fin"] is None:
+            return self.sondeo_s
+        limite = entrada["fin"] + timedelta(minutes=MARGEN_FIN_MIN)
+        return max(0.0, min(self.sondeo_s, (limite - datetime.now(TZ)).total_seconds()))
+
+    def _bucle(self):
+        while True:
+            with self._cond:
+                while not self._heap or self._heap[0][0] > time.monotonic():
+                    self._cond.wait(self._heap[0][0] - time.monotonic() if self._heap else None)
+                _, _, entrada = heapq.heappop(self._heap)
+            motivo = self._revisar(entrada)
+            with self._cond:
+                if motivo is None and self._cerrando:
+                    motivo = "fin del script"
+                if motivo is None:
+                    heapq.heappush(self._heap, (time.monotonic() + self._espera(entrada), next(self._seq), entrada))
+            if motivo is not None:
+                self._terminar(entrada, motivo)
+
+    def _revisar(self, entrada: dict) -> str | None:
+        """Motivo para terminar la reunión, o None si sigue."""
+        fin = entrada["fin"]
+        if fin is not None and datetime.now(TZ) >= fin + timedelta(minutes=MARGEN_FIN_MIN):
+            return "hora de fin"
+        try:
+            # Sin esperar a una unión en curso en el mismo Chrome: este hilo revisa todas las reuniones
+            with entrada["usar"](CICLO_VIDA_ESPERA_NAVEGADOR_S) as driver:
+                if driver is None:
+                    return "pestaña cerrada"
+                estado = estado_reunion(driver)
+        except TimeoutError:
+            return None
+        except Exception:
+            return "navegador no disponible"
+        if estado == "terminada":
+            return "el anfitrión finalizó la reunión"
+        if estado == "en_curso":
+            entrada["vista"] = True
+        elif entrada.get("vista"):
+            # Solo si antes estuvo dentro: una unión fallida sigue abierta para terminarla
+            # a mano y se libera a la hora de fin (o al cerrar su pestaña)
+            return "ya no está en el Web Client"
+        return None
+
+    def _terminar(self, entrada: dict, motivo: str):
+        nombre = entrada["nombre"]
+        print(f"\n🏁 {nombre}: fin de la reunión ({motivo}); liberando el navegador.")
+        try:
+            with entrada["usar"]() as driver:
+                if driver is not None and motivo in ("hora de fin", "fin del script"):
+                    salir_de_reunion(driver)
+        except Exception as e:
+            print(f"   ⚠️ {nombre}: no pude salir de la reunión limpiamente: {e}")
+        try:
+            entrada["cerrar"]()
+        except Exception as e:
+            print(f"   ⚠️ {nombre}: error al cerrar el navegador: {e}")
+        finally:
+            with self._cond:
+                self._activas -= 1
+                self._cond.notify_all()
+
+
+CICLO_VIDA = CicloVidaReuniones()
+
+# =====================================
+# TEMPORIZACIÓN (RELOJ MONOTÓNICO)
+# =====================================
+# Ninguna espera dura más que esto sin volver a mirar el reloj de pared:
+# así se detectan saltos (NTP, suspensión/reanudación) sin despertar seguido.
+RECHEQUEO_RELOJ_S = 60.0
+# Diferencia entre el avance del reloj de pared y el monotónico que se considera un salto
+TOLERANCIA_SALTO_S = 2.0
+
+def _percentil(valores: list, p: float) -> float:
+    """Percentil p (0-100) por rango más cercano; valores no vacío."""
+    orden = sorted(valores)
+    k = max(0, min(len(orden) - 1, int(round(p / 100 * len(orden) + 0.5)) - 1))
+    return orden[k]
+
+
+class RelojSistema:
+    """Reloj real del planificador: hora de pared en TZ, monotónico y esperas de verdad."""
+
+    def ahora(self) -> datetime:
+        return datetime.now(TZ)
+
+    def monotonic(self) -> float:
+        return time.monotonic()
+
+    def dormir(self, segundos: float):
+        time.sleep(segundos)
+
+    def esperar(self, cond: threading.Condition, timeout: float | None = None) -> bool:
+        """cond.wait(timeout): vuelve antes si otro hilo notifica un cambio."""
+        return cond.wait(timeout)
+
+
+class RelojSimulado:
+    """
+    Reloj virtual: el tiempo solo avanza cuando el planificador duerme o espera (o con
+    avanzar()), así un semestre de aperturas corre en segundos. Pensado para un único
+    hilo planificador. Cuenta cada despertar y puede sumar una latencia fija a cada uno.
+    """
+
+    def __init__(self, inicio: datetime, latencia_despertar_s: float = 0.0):
+        self._ahora = inicio
+        self._mono = 0.0
+        self.latencia_despertar_s = latencia_despertar_s
+        self.despertares = 0
+
+    def ahora(self) -> datetime:
+        return self._ahora
+
+    def monotonic(self) -> float:
+        return self._mono
+
+    def avanzar(self, segundos: float):
+        self._ahora += timedelta(seconds=segundos)
+        self._mono += segundos
+
+    def dormir(self, segundos: float):
+        self.despertares += 1
+        self.avanzar(max(0.0, segundos) + self.latencia_despertar_s)
+
+    def esperar(self, cond: threading.Condition, timeout: float | None = None) -> bool:
+        if timeout is None:
+            # Sin deadline solo otro hilo puede despertarlo
+            return cond.wait()
+        self.dormir(timeout)
+        return False
+
+
+# Reloj que usan el planificador y el cálculo de próximos runs (RelojSimulado en simulaciones)
+RELOJ = RelojSistema()
+
+
+class VigiaReloj:
+    """
+    Convierte deadlines de pared (datetime en TZ) en esperas sobre el reloj monotónico
+    y avisa cuando el reloj de pared salta respecto al monotónico.
+    """
+
+    def __init__(self, tolerancia: float = TOLERANCIA_SALTO_S, reloj=None):
+        self.tolerancia = tolerancia
+        self.reloj = reloj or RELOJ
+        self._pared = None
+        self._mono = None
+
+    def ahora(self) -> datetime:
+        """Hora de pared actual; si saltó desde la última lectura, lo informa."""
+        pared, mono = self.reloj.ahora(), self.reloj.monotonic()
+        if self._pared is not None:
+            salto = (pared - self._pared).total_seconds() - (mono - self._mono)
+            if abs(salto) > self.tolerancia:
+                print(f"⚠️  Salto del reloj de {salto:+.1f}s (NTP o suspensión); se recalculan las esperas.")
+        self._pared, self._mono = pared, mono
+        return pared
+
+    @staticmethod
+    def espera_hasta(deadline: datetime, now: datetime) -> float:
+        """Segundos a dormir (monotónicos) hacia 'deadline', acotados a RECHEQUEO_RELOJ_S."""
+        return min(max(0.0, (deadline - now).total_seconds()), RECHEQUEO_RELOJ_S)
+
+
+def esperar_hasta(deadline: datetime) -> datetime:
+    """Duerme exactamente hasta la hora de pared 'deadline'; devuelve la hora al despertar."""
+    reloj = VigiaReloj()
+    while True:
+        now = reloj.ahora()
+        espera = reloj.espera_hasta(deadline, now)
+        if espera <= 0:
+            return now
+        fin = reloj.reloj.monotonic() + espera
+        while (restante := fin - reloj.reloj.monotonic()) > 0:
+            reloj.reloj.dormir(restante)
+
+
+class RegistroRetrasos:
+    """Cuánto tarde (en segundos) se disparó cada apertura respecto a su hora objetivo."""
+
+    def __init__(self, max_muestras: int = 10000):
+        self._muestras = deque(maxlen=max_muestras)   # (nombre, objetivo, real, retraso_s)
+        self._lock = threading.Lock()
+
+    def registrar(self, nombre, objetivo: datetime, real: datetime):
+        retraso = max(0.0, (real - objetivo).total_seconds())
+        with self._lock:
+            self._muestras.append((nombre, objetivo, real, retraso))
+        METRICAS.observar_retraso(retraso)
+        return retraso
+
+    def retrasos(self) -> list:
+        with self._lock:
+            return [m[3] for m in self._muestras]
+
+    def resumen(self) -> str:
+        valores = self.retrasos()
+        if not valores:
+            return "sin disparos registrados"
+        return (f"n={len(valores)} p50={_percentil(valores, 50) * 1000:.0f}ms "
+                f"p95={_percentil(valores, 95) * 1000:.0f}ms max={max(valores) * 1000:.0f}ms")
+
+
+REGISTRO_RETRASOS = RegistroRetrasos()
+
+# =====================================
+# POOL DE LANZAMIENTOS
+# =====================================
+class PoolLanzamientos:
+    """
+    Workers con límite de concurrencia para las aperturas (cada una puede levantar
+    un ChromeDriver + Chrome). Las aperturas que esperan turno salen por orden EDF:
+    primero la reunión cuya hora de inicio es más temprana.
+    """
+
+    def __init__(self, max_concurrentes: int = None, abrir=None):
+        self.max_concurrentes = max_concurrentes or MAX_LANZAMIENTOS_CONCURRENTES
+        self._abrir = abrir or abrir_reunion
+        self._heap = []            # (inicio_reunion, seq, encolado_mono, reunion, fn, future)
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._activos = 0
+        self._cerrado = False
+        self._esperas = deque(maxlen=1000)  # segundos en cola de las últimas aperturas
+        self._workers = [
+            threading.Thread(target=self._worker, name=f"lanzador-{i}", daemon=True)
+            for i in range(self.max_concurrentes)
+        ]
+        for w in self._workers:
+            w.start()
 
+    def enviar(self, reunion: dict, inicio: datetime | None = None, fn=None) -> Future:
+        """
+        Encola una apertura. 'inicio' es la hora de inicio de la reunión (clave EDF);
+        devuelve un Future con el resultado de fn(reunion, inicio) (por defecto, abrir_reunion).
+        """
+        fut = Future()
+        if inicio is None:
+            inicio = RELOJ.ahora()
+        with self._cond:
+            if self._cerrado:
+                raise RuntimeError("el pool de lanzamientos está cerrado")
+            heapq.heappush(self._heap, (inicio, next(self._seq), time.monotonic(), reunion, fn or self._abrir, fut))
+            if self._activos >= self.max_concurrentes:
+                print(f"⌛ {reunion.get('nombre')}: en cola de lanzamiento "
+                      f"({len(self._heap)} en espera, {self._activos} en curso).")
+            self._cond.notify()
+        return fut
 
+    def profundidad(self) -> int:
+        with self._cond:
+            return len(self._heap)
 
+    def en_curso(self) -> int:
+        with self._cond:
+            return self._activos
 
-def abrir_reunion(reunion):
-    """Abre una reunión según su configuración."""
-    modo = reunion.get("modo", "zoom_app")
-    url = reunion["url"]
+    def estadisticas(self) -> dict:
+        """Profundidad de la cola, aperturas en curso y tiempos de espera en cola (s)."""
+        with self._cond:
+            esperas = list(self._esperas)
+            datos = {"profundidad": len(self._heap), "en_curso": self._activos,
+                     "max_concurrentes": self.max_concurrentes, "lanzadas": len(esperas)}
+        if esperas:
+            datos.update(espera_p50=_percentil(esperas, 50), espera_p95=_percentil(esperas, 95),
+                         espera_max=max(esperas))
+        return datos
+
+    def cerrar(self, cancelar_pendientes: bool = True):
+        """Deja de aceptar aperturas; las pendientes se cancelan y las que corren terminan solas."""
+        with self._cond:
+            self._cerrado = True
+            if cancelar_pendientes:
+                for *_, fut in self._heap:
+                    fut.cancel()
+                self._heap.clear()
+            self._cond.notify_all()
+
+    def _worker(self):
+        while True:
+            with self._cond:
+                while not self._heap and not self._cerrado:
+                    self._cond.wait()
+                if not self._heap:
+                    return
+                inicio, _, encolado, reunion, fn, fut = heapq.heappop(self._heap)
+                if not fut.set_running_or_notify_cancel():
+                    continue
+                self._activos += 1
+                espera = time.monotonic() - encolado
+                self._esperas.append(espera)
+            if espera >= 1:
+                print(f"   ⌛ {reunion.get('nombre')}: esperó {espera:.1f}s por un lugar libre.")
+            try:
+                fut.set_result(fn(reunion, inicio))
+            except BaseException as e:
+                print(f"❌ {reunion.get('nombre')}: error en la apertura: {e}")
+                fut.set_exception(e)
+            finally:
+                with self._cond:
+                    self._activos -= 1
 
-    if modo == "zoom_app":
-        return abrir_zoom_app(url)
-    elif modo == "navegador_auto":
-        nombre = reunion.get("nombre_usuario", "Usuario")
-        incognito = reunion.get("incognito", False)
-        return abrir_navegador_automatico(url, nombre, incognito)
-    else:
-        print(f"⚠️  Modo desconocido: {modo}")
-        return False
+
+def hora_inicio(reunion: dict, run: datetime) -> datetime:
+    """Hora de inicio de la clase correspondiente a un run (run + abrir_antes_min)."""
+    return run + timedelta(minutes=int(reunion.get("abrir_antes_min", 20)))
 
 # =====================================
 # PLANIFICADOR
@@ -638,14 +3082,16 @@ def _next_weekday_datetime(target_wd: int, hhmm: dtime, now: datetime) -> dateti
         candidate += timedelta(days=7)
     return candidate
 
-def compute_next_run(reu: dict) -> datetime | None:
+def compute_next_run(reu: dict, now: datetime | None = None) -> datetime | None:
     """
     Devuelve el próximo datetime (en TZ local) para abrir la reunión,
     restando 'abrir_antes_min' al horario programado.
+    now: instante de referencia (por defecto, la hora actual).
     """
     prog = reu.get("programacion") or {}
     abrir_antes = int(reu.get("abrir_antes_min", 20))
-    now = datetime.now(TZ)
+    if now is None:
+        now = RELOJ.ahora()
 
     if prog.get("tipo") == "unico":
         fh = prog.get("fecha_hora")  # "YYYY-MM-DD HH:MM"
@@ -681,60 +3127,1347 @@ def compute_next_run(reu: dict) -> datetime | None:
         return now
 
 def planificar_reunion(reunion: dict):
-    """Thread que espera hasta el siguiente run y abre la reunión."""
+    """Thread que espera hasta el siguiente run y abre la reunión (motor 'hilos')."""
     nombre = reunion.get("nombre")
+    programacion = compilar_programacion(reunion)
+    proximo = programacion.siguiente(RELOJ.ahora()) if programacion else None
     while True:
-        proximo = compute_next_run(reunion)
-        now = datetime.now(TZ)
         if proximo is None:
             print(f"⏭️  {nombre}: no hay próximas ejecuciones (quizá ya pasó o falta configurar).")
             return
 
-        delta = (proximo - now).total_seconds()
-        if delta <= 0:
-            # Ejecutar ya
-            print(f"\n🕒 [{now.strftime('%Y-%m-%d %H:%M:%S')}] Abriendo: {nombre}")
-            abrir_reunion(reunion)
-            # Si es único, terminar; si es semanal, recalcular para la próxima vuelta
-            if (reunion.get("programacion") or {}).get("tipo") == "unico":
-                print(f"✅ {nombre}: ejecución única realizada. Fin.")
-                return
+        objetivo = max(proximo, RELOJ.ahora())
+        delta = (proximo - RELOJ.ahora()).total_seconds()
+        if delta > 0:
+            print(f"⏳ {nombre}: se abrirá en {int(delta // 60)}m {int(delta % 60)}s "
+                  f"(a las {proximo.astimezone(TZ).strftime('%H:%M')} local).")
+        now = esperar_hasta(proximo)
+
+        print(f"\n🕒 [{now.strftime('%Y-%m-%d %H:%M:%S')}] Abriendo: {nombre}")
+        REGISTRO_RETRASOS.registrar(nombre, objetivo, now)
+        abrir_reunion(reunion, hora_inicio(reunion, proximo))
+        # Si es único, terminar; si es semanal, pasar directo a la siguiente ocurrencia
+        if (reunion.get("programacion") or {}).get("tipo") == "unico":
+            print(f"✅ {nombre}: ejecución única realizada. Fin.")
+            return
+        proximo = programacion.siguiente_despues(proximo)
+
+
+class ColaProgramacion:
+    """
+    Min-heap (heapq) con el próximo disparo de cada reunión, ordenado por hora.
+    Insertar y extraer cuestan O(log n). Quitar o reprogramar una reunión no
+    recorre el heap: la entrada vieja queda invalidada (borrado perezoso) y se
+    descarta cuando llega a la cima.
+    No es thread-safe: el Planificador la protege con su propio lock.
+    """
+
+    def __init__(self, reloj=None):
+        self.reloj = reloj or RELOJ
+        self._heap = []        # (run, seq, clave)
+        self._vigente = {}     # clave -> seq de su única entrada válida
+        self._reuniones = {}   # clave -> dict de la reunión
+        self._seq = itertools.count()
+        self.ultimo_disparo = {}  # clave -> último run ya entregado al lanzador
+        self._encolado = {}       # clave -> cuándo se programó su entrada vigente
+        self._precalentamientos = 0  # claves de precalentamiento en _reuniones
+        self._compiladas = {}     # clave -> (reunion, ProgramacionCompilada) para reprogramar
+
+    def __len__(self):
+        return len(self._reuniones)
+
+    def aperturas(self) -> int:
+        """Reuniones en cola sin contar sus precalentamientos (O(1))."""
+        return len(self._reuniones) - self._precalentamientos
+
+    def __contains__(self, clave):
+        return clave in self._reuniones
+
+    def reunion(self, clave):
+        return self._reuniones.get(clave)
+
+    def claves(self):
+        return self._reuniones.keys()
+
+    def programar(self, clave, reunion: dict, run: datetime | None):
+        """Agrega o reprograma 'clave'. Con run=None la reunión sale de la cola."""
+        if run is None:
+            self.quitar(clave)
+            return
+        seq = next(self._seq)
+        if clave not in self._reuniones and _es_precalentamiento(clave):
+            self._precalentamientos += 1
+        self._reuniones[clave] = reunion
+        self._vigente[clave] = seq
+        self._encolado[clave] = self.reloj.ahora()
+        heapq.heappush(self._heap, (run, seq, clave))
+        # Si se acumulan demasiadas entradas invalidadas, reconstruir el heap
+        if len(self._heap) > 2 * len(self._vigente) + 64:
+            self._heap = [e for e in self._heap if self._vigente.get(e[2]) == e[1]]
+            heapq.heapify(self._heap)
+
+    def quitar(self, clave):
+        if self._reuniones.pop(clave, None) is not None and _es_precalentamiento(clave):
+            self._precalentamientos -= 1
+        self._vigente.pop(clave, None)
+        self._encolado.pop(clave, None)
+
+    def olvidar(self, clave):
+        """Quita la reunión y también su historial de disparos (baja definitiva)."""
+        self.quitar(clave)
+        self.ultimo_disparo.pop(clave, None)
+        self._compiladas.pop(clave, None)
+
+    def siguiente_despues(self, clave, reunion: dict, previo: datetime) -> datetime | None:
+        """
+        Próximo run de 'reunion' estrictamente posterior a 'previo' (un run ya disparado).
+        La programación se compila una sola vez por versión del dict de la reunión
+        (una recarga del catálogo trae dicts nuevos); solo las semanales se repiten.
+        """
+        cache = self._compiladas.get(clave)
+        if cache is None or cache[0] is not reunion:
+            cache = self._compiladas[clave] = (reunion, compilar_programacion(reunion))
+        programacion = cache[1]
+        return programacion.siguiente_despues(previo) if programacion is not None else None
+
+    def _limpiar_cima(self):
+        heap = self._heap
+        while heap and self._vigente.get(heap[0][2]) != heap[0][1]:
+            heapq.heappop(heap)
+
+    def proximo(self):
+        """(run, clave) del disparo más cercano, o None si la cola está vacía."""
+        self._limpiar_cima()
+        if not self._heap:
+            return None
+        run, _, clave = self._heap[0]
+        return run, clave
+
+    def proximas(self, n: int) -> list:
+        """[(run, clave, reunion)] de las n aperturas más cercanas (sin precalentamientos)."""
+        vigentes = ((run, seq, clave) for run, seq, clave in self._heap
+                    if self._vigente.get(clave) == seq and not _es_precalentamiento(clave))
+        return [(run, clave, self._reuniones.get(clave)) for run, _, clave in heapq.nsmallest(n, vigentes)]
+
+    def extraer_vencidas(self, now: datetime) -> list:
+        """
+        Saca de la cola todas las entradas con run <= now: [(clave, reunion, run, objetivo)].
+        objetivo es la hora a la que debía dispararse: el run, o el momento en que se
+        programó si para entonces el run ya había pasado (no es retraso del planificador).
+        """
+        vencidas = []
+        while True:
+            self._limpiar_cima()
+            if not self._heap or self._heap[0][0] > now:
+                return vencidas
+            run, _, clave = heapq.heappop(self._heap)
+            del self._vigente[clave]
+            self.ultimo_disparo[clave] = run
+            objetivo = max(run, self._encolado.pop(clave))
+            if _es_precalentamiento(clave):
+                self._precalentamientos -= 1
+            vencidas.append((clave, self._reuniones.pop(clave), run, objetivo))
+
+
+def _clave_precalentar(clave):
+    """Clave en la cola del precalentamiento asociado a la reunión 'clave'."""
+    return ("precalentar", clave)
+
+def _es_precalentamiento(clave) -> bool:
+    return isinstance(clave, tuple) and len(clave) == 2 and clave[0] == "precalentar"
+
+def _programar_con_precalentamiento(cola: ColaProgramacion, clave, reu: dict, run: datetime | None, now: datetime):
+    """Programa el run de una reunión y, si aplica, su precalentamiento minutos antes."""
+    cola.programar(clave, reu, run)
+    minutos = minutos_precalentar(reu)
+    if run is not None and minutos and run > now:
+        cola.programar(_clave_precalentar(clave), reu, max(run - timedelta(minutes=minutos), now))
+    else:
+        cola.quitar(_clave_precalentar(clave))
+
+def _extraer_y_reprogramar(cola: ColaProgramacion, now: datetime) -> list:
+    """
+    Saca las entradas vencidas, registra con qué retraso se dispararon las aperturas
+    y vuelve a encolar su siguiente ocurrencia (si la hay).
+    Devuelve [(accion, clave, reunion, run)] con accion "precalentar" o "abrir".
+    """
+    vencidas = []
+    for clave, reu, run, objetivo in cola.extraer_vencidas(now):
+        if _es_precalentamiento(clave):
+            vencidas.append(("precalentar", clave[1], reu, run))
+            continue
+        REGISTRO_RETRASOS.registrar(reu.get("nombre"), objetivo, now)
+        siguiente = cola.siguiente_despues(clave, reu, run)
+        if siguiente is not None:
+            _programar_con_precalentamiento(cola, clave, reu, siguiente, now)
+        vencidas.append(("abrir", clave, reu, run))
+    return vencidas
+
+def _anunciar_proximo(cola: ColaProgramacion, proximo, anunciado, now: datetime):
+    """Imprime la próxima apertura solo cuando cambia; devuelve lo anunciado."""
+    if proximo == anunciado:
+        return anunciado
+    run, clave = proximo
+    delta = (run - now).total_seconds()
+    nombre = cola.reunion(clave).get("nombre")
+    que = "Próximo precalentamiento" if _es_precalentamiento(clave) else "Próxima apertura"
+    print(f"⏳ {que}: {nombre} en {int(delta // 60)}m {int(delta % 60)}s "
+          f"(a las {run.astimezone(TZ).strftime('%Y-%m-%d %H:%M')} local). "
+          f"Reuniones programadas: {cola.aperturas()}")
+    return proximo
+
+def _anunciar_apertura(reu: dict, now: datetime):
+    print(f"\n🕒 [{now.strftime('%Y-%m-%d %H:%M:%S')}] Abriendo: {reu.get('nombre')}")
+    if (reu.get("programacion") or {}).get("tipo") == "unico":
+        print(f"✅ {reu.get('nombre')}: ejecución única realizada. Fin.")
+
+
+class _PlanificadorBase(abc.ABC):
+    """Parte común de Planificador y PlanificadorAsync: alta y baja de reuniones en la cola."""
+
+    def __init__(self, salir_si_vacio=True, reloj=None):
+        self.reloj = reloj or RELOJ
+        self.cola = ColaProgramacion(self.reloj)
+        self.salir_si_vacio = salir_si_vacio
+        self._claves = itertools.count()
+
+    @abc.abstractmethod
+    def _modificar(self, fn):
+        """Aplica fn() a la cola de forma segura y despierta al bucle."""
+
+    def agregar(self, reunion: dict, clave=None):
+        """Programa una reunión y devuelve su clave (o None si no tiene próximas ejecuciones)."""
+        return self.agregar_varias([reunion], [clave])[0]
+
+    def agregar_varias(self, reus: list, claves: list | None = None) -> list:
+        """
+        Programa varias reuniones calculando todos sus próximos runs en lote
+        (compute_next_runs) y aplicándolos a la cola de una sola vez.
+        """
+        if claves is None:
+            claves = [None] * len(reus)
+        claves = [next(self._claves) if c is None else c for c in claves]
+        runs = compute_next_runs(reus, now=self.reloj.ahora())
+        altas, sin_runs = [], []
+        for clave, reu, run in zip(claves, reus, runs):
+            if run is None:
+                print(f"⏭️  {reu.get('nombre')}: no hay próximas ejecuciones (quizá ya pasó o falta configurar).")
+                sin_runs.append(clave)
             else:
-                # Esperar 60s antes de calcular la próxima
-                time.sleep(60)
-                continue
+                altas.append((clave, reu, run))
+
+        def _aplicar():
+            now = self.reloj.ahora()
+            # Una reunión editada sin próximas ejecuciones no debe dispararse a su hora vieja
+            for clave in sin_runs:
+                self.cola.olvidar(clave)
+                self.cola.olvidar(_clave_precalentar(clave))
+            for clave, reu, run in altas:
+                # Al reprogramar una reunión ya existente (p. ej. tras una recarga)
+                # no se vuelve a abrir una ocurrencia que ya se lanzó.
+                previo = self.cola.ultimo_disparo.get(clave)
+                if previo is not None and run <= previo:
+                    run = self.cola.siguiente_despues(clave, reu, previo)
+                _programar_con_precalentamiento(self.cola, clave, reu, run, now)
+        self._modificar(_aplicar)
+        return [c if r is not None else None for c, r in zip(claves, runs)]
+
+    def quitar(self, clave):
+        def _quitar():
+            self.cola.olvidar(clave)
+            self.cola.olvidar(_clave_precalentar(clave))
+        self._modificar(_quitar)
+
+    def instantanea(self, n: int) -> tuple[int, list]:
+        """(reuniones programadas, sus n próximas aperturas) para las métricas."""
+        return self.cola.aperturas(), self.cola.proximas(n)
+
+
+class Planificador(_PlanificadorBase):
+    """
+    Planificador único: un solo hilo duerme hasta el disparo más cercano de la
+    ColaProgramacion y entrega las reuniones vencidas al lanzador.
+    Reemplaza el esquema de un hilo por reunión (planificar_reunion).
+    lanzador(reunion, run): por defecto, encolar en un PoolLanzamientos.
+    precalentador(reunion, run): idem para los precalentamientos del navegador.
+    reloj: RelojSistema (por defecto RELOJ) o un RelojSimulado (simular_planificador).
+    """
+
+    def __init__(self, lanzador=None, salir_si_vacio=True, pool: PoolLanzamientos | None = None,
+                 precalentador=None, reloj=None):
+        super().__init__(salir_si_vacio, reloj)
+        self.pool = pool
+        if lanzador is None or precalentador is None:
+            self.pool = pool or PoolLanzamientos()
+        if lanzador is None:
+            lanzador = lambda reu, run: self.pool.enviar(reu, hora_inicio(reu, run))
+        if precalentador is None:
+            precalentador = lambda reu, run: self.pool.enviar(
+                reu, hora_inicio(reu, run + timedelta(minutes=minutos_precalentar(reu))), fn=precalentar_navegador)
+        self.lanzador = lanzador
+        self.precalentador = precalentador
+        self._cond = threading.Condition()
+        self._detenido = False
+
+    # ---- API pública (thread-safe) ----
+    def _modificar(self, fn):
+        with self._cond:
+            fn()
+            self._cond.notify()
+
+    def detener(self):
+        self._modificar(lambda: setattr(self, "_detenido", True))
+
+    def lanzamientos_en_curso(self) -> int:
+        if self.pool is None:
+            return 0
+        return self.pool.profundidad() + self.pool.en_curso()
+
+    def instantanea(self, n: int) -> tuple[int, list]:
+        with self._cond:
+            return super().instantanea(n)
+
+    # ---- Bucle principal ----
+    def ejecutar(self):
+        """Bucle del planificador: bloquea hasta detener() o hasta que no queden reuniones."""
+        anunciado = None
+        reloj = VigiaReloj(reloj=self.reloj)
+        while True:
+            with self._cond:
+                if self._detenido:
+                    return
+                now = reloj.ahora()
+                vencidas = _extraer_y_reprogramar(self.cola, now)
+                if not vencidas:
+                    proximo = self.cola.proximo()
+                    if proximo is None:
+                        if self.salir_si_vacio:
+                            print("⏭️  No quedan reuniones por abrir.")
+                            return
+                        self.reloj.esperar(self._cond)
+                        continue
+                    anunciado = _anunciar_proximo(self.cola, proximo, anunciado, now)
+                    # Un único sleep (reloj monotónico) hasta el deadline más cercano,
+                    # o hasta un cambio en la cola
+                    self.reloj.esperar(self._cond, reloj.espera_hasta(proximo[0], now))
+                    continue
+
+            for accion, clave, reu, run in vencidas:
+                if accion == "precalentar":
+                    self.precalentador(reu, run)
+                else:
+                    _anunciar_apertura(reu, now)
+                    self.lanzador(reu, run)
+
+class PlanificadorAsync(_PlanificadorBase):
+    """
+    Variante asyncio del Planificador (--engine asyncio).
+    La espera usa un timer del event loop (call_later) hasta el disparo más
+    cercano y cada apertura corre como una Task; el trabajo bloqueante
+    (Selenium, xdg-open, pyautogui) se delega a un PoolLanzamientos acotado (EDF),
+    así varias aperturas del mismo minuto avanzan a la vez sin un hilo por reunión.
+    """
+
+    def __init__(self, max_workers: int = None, salir_si_vacio=True, pool: PoolLanzamientos | None = None):
+        super().__init__(salir_si_vacio)
+        self.max_workers = max_workers or MAX_LANZAMIENTOS_CONCURRENTES
+        self.pool = pool
+        self._cambio = asyncio.Event()
+        self._tareas = set()
+        self._loop = None
+        self._loop_thread = None
+
+    # ---- API pública ----
+    def lanzamientos_en_curso(self) -> int:
+        return len(self._tareas)
+
+    def _modificar(self, fn):
+        """Aplica el cambio en el hilo del loop (seguro desde otros hilos) y despierta al planificador."""
+        def _aplicar():
+            fn()
+            self._cambio.set()
+        if self._loop is None:
+            fn()
+        elif threading.get_ident() == self._loop_thread:
+            _aplicar()
+        else:
+            self._loop.call_soon_threadsafe(_aplicar)
+
+    # ---- Bucle principal ----
+    async def ejecutar(self):
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread = threading.get_ident()
+        if self.pool is None:
+            self.pool = PoolLanzamientos(self.max_workers)
+        anunciado = None
+        reloj = VigiaReloj(reloj=self.reloj)
+        try:
+            while True:
+                now = reloj.ahora()
+                for accion, clave, reu, run in _extraer_y_reprogramar(self.cola, now):
+                    if accion == "precalentar":
+                        self.pool.enviar(reu, hora_inicio(reu, run + timedelta(minutes=minutos_precalentar(reu))),
+                                         fn=precalentar_navegador)
+                        continue
+                    _anunciar_apertura(reu, now)
+                    tarea = asyncio.create_task(self._lanzar(reu, run), name=f"lanzar-{reu.get('nombre')}")
+                    self._tareas.add(tarea)
+                    tarea.add_done_callback(self._tareas.discard)
+
+                proximo = self.cola.proximo()
+                if proximo is None:
+                    if self.salir_si_vacio:
+                        print("⏭️  No quedan reuniones por abrir.")
+                        break
+                    timer = None
+                else:
+                    anunciado = _anunciar_proximo(self.cola, proximo, anunciado, now)
+                    timer = self._loop.call_later(reloj.espera_hasta(proximo[0], now), self._cambio.set)
+                self._cambio.clear()
+                try:
+                    await self._cambio.wait()
+                finally:
+                    if timer is not None:
+                        timer.cancel()
+
+            # Dejar terminar las aperturas que siguen en curso
+            if self._tareas:
+                await asyncio.gather(*self._tareas, return_exceptions=True)
+        finally:
+            await self._cerrar()
+
+    async def _lanzar(self, reunion: dict, run: datetime):
+        try:
+            return await asyncio.wrap_future(self.pool.enviar(reunion, hora_inicio(reunion, run)))
+        except asyncio.CancelledError:
+            print(f"🛑 {reunion.get('nombre')}: apertura cancelada.")
+            raise
+        except Exception:
+            return False
+
+    async def _cerrar(self):
+        """Cancela las tareas pendientes y cierra el pool sin bloquear el loop."""
+        for tarea in list(self._tareas):
+            tarea.cancel()
+        if self._tareas:
+            await asyncio.gather(*self._tareas, return_exceptions=True)
+        if self.pool is not None:
+            # Las aperturas aún en cola se descartan; las que ya corren en un hilo
+            # (Selenium no se puede interrumpir) terminan por su cuenta.
+            self.pool.cerrar()
+        self._loop = None
+
+# =====================================
+# ÍNDICE DE OCURRENCIAS
+# =====================================
+@dataclass(frozen=True)
+class ProgramacionCompilada:
+    """
+    'programacion' + 'abrir_antes_min' de una reunión ya parseados una sola vez
+    (sin volver a pasar por _parse_hhmm ni WEEKDAY_MAP en cada consulta).
+    tipo: "semanal", "unico" o "inmediata" (sin programación).
+    """
+    tipo: str
+    abrir_antes: timedelta
+    dias: tuple = ()            # weekdays 0..6 (solo semanal)
+    hora: int = 0
+    minuto: int = 0
+    fecha_hora: datetime | None = None  # inicio de la reunión (solo unico)
+
+    def ocurrencias(self, inicio: datetime, fin: datetime):
+        """Genera, en orden, los runs r con inicio < r <= fin."""
+        if self.tipo == "unico":
+            run = self.fecha_hora - self.abrir_antes
+            if inicio < run <= fin:
+                yield run
+            return
+        if self.tipo != "semanal":
+            return
+        dia = (inicio + self.abrir_antes).date()
+        ultimo = (fin + self.abrir_antes).date()
+        while dia <= ultimo:
+            if dia.weekday() in self.dias:
+                run = datetime(dia.year, dia.month, dia.day, self.hora, self.minuto, tzinfo=TZ) - self.abrir_antes
+                if inicio < run <= fin:
+                    yield run
+            dia += timedelta(days=1)
+
+    def siguiente(self, now: datetime) -> datetime | None:
+        """Misma semántica que compute_next_run(reu, now)."""
+        if self.tipo == "inmediata":
+            return now
+        if self.tipo == "unico":
+            run = self.fecha_hora - self.abrir_antes
+            return run if run > now else None
+        # semanal: la próxima clase que empieza después de now
+        return next(self.ocurrencias(now - self.abrir_antes, now + timedelta(days=8)), None)
+
+    def siguiente_despues(self, run: datetime) -> datetime | None:
+        """Próximo run estrictamente posterior a 'run' (ya disparado); solo las semanales se repiten."""
+        if self.tipo != "semanal":
+            return None
+        return next(self.ocurrencias(run, run + timedelta(days=8)), None)
+
+
+def compilar_programacion(reu: dict) -> ProgramacionCompilada | None:
+    """Compila la programación de una reunión; None si está incompleta o es inválida."""
+    prog = reu.get("programacion") or {}
+    abrir_antes = timedelta(minutes=int(reu.get("abrir_antes_min", 20)))
+    tipo = prog.get("tipo")
+
+    if tipo == "unico":
+        fh = prog.get("fecha_hora")
+        if not fh:
+            return None
+        try:
+            dt = datetime.strptime(fh, "%Y-%m-%d %H:%M").replace(tzinfo=TZ)
+        except ValueError:
+            print(f"⚠️  fecha_hora inválida: {fh} (usa 'YYYY-MM-DD HH:MM')")
+            return None
+        return ProgramacionCompilada("unico", abrir_antes, fecha_hora=dt)
+
+    elif tipo == "semanal":
+        dias = prog.get("dias") or []
+        if not dias or not prog.get("hora"):
+            return None
+        hhmm = _parse_hhmm(prog["hora"])
+        wds = {WEEKDAY_MAP.get(d.strip().lower()) for d in dias} - {None}
+        if not wds:
+            return None
+        return ProgramacionCompilada("semanal", abrir_antes, dias=tuple(sorted(wds)),
+                                     hora=hhmm.hour, minuto=hhmm.minute)
+
+    return ProgramacionCompilada("inmediata", abrir_antes)
+
+
+class IndiceOcurrencias:
+    """
+    Línea de tiempo ordenada con los próximos runs de todas las reuniones (--proximas).
+    Cada reunión se compila una vez; sus ocurrencias se materializan de forma
+    perezosa hasta un horizonte que se extiende por ventanas a medida que se
+    consulta. Sobre la SortedList, "próximas N aperturas" cuesta O(log n + k).
+    El planificador no la usa: su ColaProgramacion guarda la ProgramacionCompilada
+    de cada reunión y solo pide la siguiente ocurrencia al disparar la actual.
+    """
+
+    def __init__(self, now: datetime | None = None, ventana: timedelta = timedelta(days=7)):
+        self.ventana = ventana
+        self._desde = now or RELOJ.ahora()   # ocurrencias <= _desde ya consumidas
+        self._hasta = self._desde + ventana     # horizonte materializado
+        self._linea = SortedList()              # (run, seq, clave)
+        self._por_clave = {}                    # clave -> deque de entradas en _linea
+        self._compiladas = {}                   # clave -> (ProgramacionCompilada, reunion)
+        self._seq = itertools.count()
+
+    def __len__(self):
+        return len(self._compiladas)
+
+    def agregar(self, clave, reunion: dict) -> bool:
+        """Compila y materializa las ocurrencias de una reunión hasta el horizonte actual."""
+        self.quitar(clave)
+        comp = compilar_programacion(reunion)
+        if comp is None:
+            return False
+        self._compiladas[clave] = (comp, reunion)
+        entradas = self._por_clave[clave] = deque()
+        if comp.tipo == "inmediata":
+            runs = [self._desde]
         else:
-            # Informar y dormir en intervalos razonables
-            mins = int(delta // 60)
-            secs = int(delta % 60)
-            print(f"⏳ {nombre}: se abrirá en {mins}m {secs}s (a las {proximo.astimezone(TZ).strftime('%H:%M')} local).")
-            sleep_chunk = min(30, int(delta))  # dormimos en trozos de hasta 30s
-            time.sleep(max(1, sleep_chunk))
+            # Igual que compute_next_run: se incluye la clase que aún no empieza
+            # aunque su hora de apertura ya haya pasado.
+            runs = comp.ocurrencias(self._desde - comp.abrir_antes, self._hasta)
+        for run in runs:
+            entrada = (run, next(self._seq), clave)
+            self._linea.add(entrada)
+            entradas.append(entrada)
+        return True
+
+    def quitar(self, clave):
+        self._compiladas.pop(clave, None)
+        for entrada in self._por_clave.pop(clave, ()):
+            self._linea.discard(entrada)
+
+    def _extender(self, hasta: datetime):
+        """Materializa las ocurrencias en (_hasta, hasta] de todas las reuniones recurrentes."""
+        while self._hasta < hasta:
+            fin = self._hasta + self.ventana
+            nuevas = []
+            for clave, (comp, _) in self._compiladas.items():
+                if comp.tipo != "semanal":
+                    continue
+                for run in comp.ocurrencias(self._hasta, fin):
+                    nuevas.append((run, next(self._seq), clave))
+            nuevas.sort()
+            self._linea.update(nuevas)
+            for entrada in nuevas:
+                self._por_clave[entrada[2]].append(entrada)
+            self._hasta = fin
+
+    def _hay_recurrentes(self) -> bool:
+        return any(comp.tipo == "semanal" for comp, _ in self._compiladas.values())
+
+    def proximas(self, n: int, desde: datetime | None = None) -> list:
+        """Las próximas n aperturas con run > desde: [(run, clave, reunion)]."""
+        desde = max(desde or self._desde, self._desde)
+        i = self._linea.bisect_right((desde, float("inf")))
+        # Extender el horizonte solo si faltan ocurrencias y alguna reunión se repite
+        while len(self._linea) - i < n and self._hay_recurrentes():
+            self._extender(self._hasta + self.ventana)
+            i = self._linea.bisect_right((desde, float("inf")))
+        return [(run, clave, self._compiladas[clave][1])
+                for run, _, clave in self._linea.islice(i, i + n)]
+
+
+def imprimir_proximas(reus: list, n: int):
+    """Lista las próximas n aperturas de la configuración (--proximas)."""
+    indice = IndiceOcurrencias()
+    for i, r in enumerate(reus):
+        indice.agregar(i, r)
+    for run, _, reu in indice.proximas(n):
+        print(f"  {run.astimezone(TZ).strftime('%a %Y-%m-%d %H:%M')}  {reu.get('nombre')} ({reu.get('modo', 'zoom_app')})")
+
+# =====================================
+# CÁLCULO EN LOTE (NumPy)
+# =====================================
+_TIPO_INVALIDO, _TIPO_INMEDIATA, _TIPO_UNICO, _TIPO_SEMANAL = range(4)
+
+def _fecha_hora_o_nat(reu: dict):
+    comp = compilar_programacion(reu)
+    if comp is None or comp.tipo != "unico":
+        return "NaT"
+    return comp.fecha_hora.replace(tzinfo=None)
+
+
+class TablaReuniones:
+    """
+    Catálogo de reuniones en forma columnar para proximos_runs_batch:
+    tipo, máscara de días (7 bits), minuto del día, abrir_antes (min) y
+    fecha_hora de los eventos únicos. Se arma una vez por carga de configuración.
+    """
+
+    def __init__(self, reus: list):
+        tipos, bits, minutos, antes, fechas = [], [], [], [], []
+        # Los catálogos repiten mucho las mismas horas y combinaciones de días:
+        # se parsea cada valor distinto una sola vez.
+        cache_hora, cache_dias = {}, {}
+        for reu in reus:
+            prog = reu.get("programacion") or {}
+            tipo, b, minuto, fecha = _TIPO_INVALIDO, 0, 0, None
+            t = prog.get("tipo")
+            if t == "semanal":
+                dias, hora = prog.get("dias"), prog.get("hora")
+                if dias and hora:
+                    clave_dias = tuple(dias)
+                    b = cache_dias.get(clave_dias)
+                    if b is None:
+                        wds = {WEEKDAY_MAP.get(d.strip().lower()) for d in dias} - {None}
+                        b = cache_dias[clave_dias] = sum(1 << wd for wd in wds)
+                    minuto = cache_hora.get(hora)
+                    if minuto is None:
+                        hhmm = _parse_hhmm(hora)
+                        minuto = cache_hora[hora] = hhmm.hour * 60 + hhmm.minute
+                    if b:
+                        tipo = _TIPO_SEMANAL
+            elif t == "unico":
+                fh = prog.get("fecha_hora")
+                if fh:
+                    tipo, fecha = _TIPO_UNICO, fh.replace(" ", "T", 1)
+            else:
+                tipo = _TIPO_INMEDIATA
+            tipos.append(tipo)
+            bits.append(b)
+            minutos.append(minuto)
+            antes.append(int(reu.get("abrir_antes_min", 20)))
+            fechas.append(fecha or "NaT")
+
+        # Un solo paso de Python a NumPy por columna
+        self.tipo = np.array(tipos, dtype=np.int8)
+        self.mascara = (np.array(bits, dtype=np.int64)[:, None] >> np.arange(7)) & 1 == 1
+        self.minuto_dia = np.array(minutos, dtype=np.int64)
+        self.abrir_antes = np.array(antes, dtype=np.int64)
+        try:
+            self.fecha_hora = np.array(fechas, dtype="datetime64[m]")
+        except ValueError:
+            # Alguna fecha_hora mal escrita: validar una a una como compilar_programacion
+            self.fecha_hora = np.array([_fecha_hora_o_nat(reu) for reu in reus], dtype="datetime64[m]")
+            self.tipo[(self.tipo == _TIPO_UNICO) & np.isnat(self.fecha_hora)] = _TIPO_INVALIDO
+
+    def __len__(self):
+        return len(self.tipo)
+
+
+def proximos_runs_datetime64(tabla: TablaReuniones, now: datetime):
+    """
+    Núcleo vectorizado: una sola pasada datetime64 sobre toda la tabla.
+    Devuelve un array datetime64[us] en hora local de pared (NaT = sin próximo
+    run), igual que la aritmética con tzinfo de compute_next_run.
+    """
+    ahora = np.datetime64(now.astimezone(TZ).replace(tzinfo=None), "us")
+    hoy = ahora.astype("datetime64[D]")
+    n = len(tabla)
+    runs = np.full(n, np.datetime64("NaT"), dtype="datetime64[us]")
+
+    # Semanal: candidatos hoy+0..7 días a la hora programada; el primero que
+    # cae en un día permitido y aún no empezó es la próxima clase.
+    sem = tabla.tipo == _TIPO_SEMANAL
+    if sem.any():
+        offsets = np.arange(8)
+        wd_hoy = now.astimezone(TZ).weekday()
+        dias = (hoy + offsets).astype("datetime64[m]")                           # (8,)
+        cand = dias[None, :] + tabla.minuto_dia[sem, None].astype("timedelta64[m]")  # (k, 8)
+        ok = tabla.mascara[sem][:, (wd_hoy + offsets) % 7] & (cand > ahora)
+        primera = ok.argmax(axis=1)
+        clase = cand[np.arange(len(primera)), primera]
+        runs[sem] = clase - tabla.abrir_antes[sem].astype("timedelta64[m]")
+
+    uni = tabla.tipo == _TIPO_UNICO
+    if uni.any():
+        run_u = tabla.fecha_hora[uni] - tabla.abrir_antes[uni].astype("timedelta64[m]")
+        runs[uni] = np.where(run_u > ahora, run_u.astype("datetime64[us]"), np.datetime64("NaT"))
+
+    runs[tabla.tipo == _TIPO_INMEDIATA] = ahora
+    return runs
+
+
+def proximos_runs_batch(tabla: TablaReuniones, now: datetime | None = None) -> list:
+    """Equivalente en lote de [compute_next_run(r, now) for r in reus] (datetimes con TZ o None)."""
+    if now is None:
+        now = RELOJ.ahora()
+    runs = proximos_runs_datetime64(tabla, now)
+    return [None if r is None else r.replace(tzinfo=TZ) for r in runs.tolist()]
+
+
+def compute_next_runs(reus: list, now: datetime | None = None) -> list:
+    """
+    Próximo run de cada reunión. Con NumPy y catálogos medianos o grandes usa el
+    cálculo en lote; para pocas reuniones el camino por diccionario es más barato.
+    """
+    if np is None or len(reus) < 64:
+        return [compute_next_run(r, now=now) for r in reus]
+    return proximos_runs_batch(TablaReuniones(reus), now=now)
+
+# =====================================
+# SIMULACIÓN DEL PLANIFICADOR
+# =====================================
+@dataclass
+class ResultadoSimulacion:
+    """Lo que hizo el Planificador heap con un RelojSimulado entre 'desde' y 'hasta'."""
+    desde: datetime
+    hasta: datetime
+    disparos: list            # [(nombre, run, objetivo, real)] de cada apertura, en orden
+    precalentamientos: int
+    perdidas: list            # [(nombre, run)] ocurrencias del rango que no se abrieron
+    duplicados: int           # aperturas repetidas de una misma ocurrencia
+    despertares: int          # veces que el planificador durmió y volvió a mirar la cola
+    cpu_s: float              # CPU del proceso durante la simulación
+
+    def retrasos(self) -> list:
+        """Segundos (virtuales) entre la hora objetivo y la apertura de cada disparo."""
+        return [(real - objetivo).total_seconds() for _, _, objetivo, real in self.disparos]
+
+    def resumen(self) -> str:
+        dias = (self.hasta - self.desde).total_seconds() / 86400
+        retrasos = self.retrasos()
+        lineas = [
+            f"{len(self.disparos)} aperturas y {self.precalentamientos} precalentamientos en {dias:.0f} días "
+            f"simulados ({self.cpu_s:.2f}s de CPU)",
+            f"despertares del planificador: {self.despertares} ({self.despertares / max(dias, 1e-9):.0f}/día)",
+        ]
+        if retrasos:
+            lineas.append("retraso: " + " ".join(
+                f"p{p}={_percentil(retrasos, p) * 1000:.0f}ms" for p in (50, 95, 99)
+            ) + f" max={max(retrasos) * 1000:.0f}ms")
+        lineas.append(f"ocurrencias perdidas: {len(self.perdidas)}, aperturas duplicadas: {self.duplicados}")
+        return "\n".join(lineas)
+
+    def guardar_csv(self, ruta: str):
+        """Una fila por apertura: nombre, run, objetivo, real, retraso_s."""
+        with open(ruta, "w", newline="", encoding="utf-8") as f:
+            w = csv.writer(f)
+            w.writerow(["nombre", "run", "objetivo", "real", "retraso_s"])
+            for (nombre, run, objetivo, real), retraso in zip(self.disparos, self.retrasos()):
+                w.writerow([nombre, run.isoformat(), objetivo.isoformat(), real.isoformat(), f"{retraso:.3f}"])
+
+
+def simular_planificador(reus: list, desde: datetime, hasta: datetime, costo_apertura_s: float = 0.0,
+                         latencia_despertar_s: float = 0.0) -> ResultadoSimulacion:
+    """
+    Corre el Planificador heap sobre un RelojSimulado de 'desde' a 'hasta' con un lanzador
+    de prueba que solo anota cada apertura (y adelanta el reloj costo_apertura_s, como si
+    entregarla costara ese tiempo). Las ocurrencias esperadas salen de compilar_programacion,
+    independiente del camino que sigue el planificador.
+    """
+    global RELOJ
+    reloj = RelojSimulado(desde, latencia_despertar_s)
+    indices = {id(r): i for i, r in enumerate(reus)}
+    disparos, vistos = [], set()
+    precalentamientos = duplicados = 0
+
+    def lanzador(reu, run):
+        nonlocal duplicados
+        if run > hasta:
+            planificador.detener()
+            return
+        ocurrencia = (indices[id(reu)], run)
+        duplicados += ocurrencia in vistos
+        vistos.add(ocurrencia)
+        disparos.append((reu.get("nombre"), run, max(run, desde), reloj.ahora()))
+        reloj.avanzar(costo_apertura_s)
+
+    def precalentador(reu, run):
+        nonlocal precalentamientos
+        if run > hasta:
+            planificador.detener()
+            return
+        precalentamientos += 1
+
+    planificador = Planificador(lanzador, salir_si_vacio=True, precalentador=precalentador, reloj=reloj)
+    anterior, RELOJ = RELOJ, reloj
+    cpu0 = time.process_time()
+    try:
+        # Los anuncios por consola de cada apertura no interesan aquí
+        with open(os.devnull, "w") as nulo, redirect_stdout(nulo):
+            planificador.agregar_varias(reus)
+            planificador.ejecutar()
+    finally:
+        RELOJ = anterior
+    cpu_s = time.process_time() - cpu0
+
+    perdidas = []
+    for i, reu in enumerate(reus):
+        programacion = compilar_programacion(reu)
+        if programacion is None:
+            continue
+        for run in programacion.ocurrencias(desde, hasta):
+            if (i, run) not in vistos:
+                perdidas.append((reu.get("nombre"), run))
+    return ResultadoSimulacion(desde, hasta, disparos, precalentamientos, perdidas, duplicados,
+                               reloj.despertares, cpu_s)
+
+# =====================================
+# MÉTRICAS (OPENMETRICS)
+# =====================================
+BUCKETS_RETRASO_S = (0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 15, 60)
+BUCKETS_UNION_S = (1, 2.5, 5, 10, 15, 20, 30, 45, 60, 90, 120, 300)
+
+def _etiquetas(**kv) -> str:
+    """{k="v",...} con el escape de OpenMetrics."""
+    if not kv:
+        return ""
+    esc = lambda v: str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    return "{" + ",".join(f'{k}="{esc(v)}"' for k, v in kv.items()) + "}"
+
+
+class Histograma:
+    """Histograma de buckets fijos (cumulativos al exponerlo); observar() es O(log buckets)."""
+
+    def __init__(self, buckets: tuple):
+        self.buckets = tuple(buckets)
+        self.cuentas = [0] * (len(self.buckets) + 1)
+        self.suma = 0.0
+        self.n = 0
+
+    def observar(self, valor: float):
+        self.cuentas[bisect.bisect_left(self.buckets, valor)] += 1
+        self.suma += valor
+        self.n += 1
+
+    def lineas(self, nombre: str, **etiquetas) -> list:
+        lineas, acum = [], 0
+        for le, cuenta in zip(self.buckets + ("+Inf",), self.cuentas):
+            acum += cuenta
+            lineas.append(f"{nombre}_bucket{_etiquetas(**etiquetas, le=le if le == '+Inf' else float(le))} {acum}")
+        lineas.append(f"{nombre}_sum{_etiquetas(**etiquetas)} {self.suma:.6f}")
+        lineas.append(f"{nombre}_count{_etiquetas(**etiquetas)} {self.n}")
+        return lineas
+
+
+class Metricas:
+    """
+    Métricas del proceso en formato OpenMetrics: estado del planificador (reuniones
+    programadas, próximo disparo de cada una, cola y lanzamientos en curso), contadores
+    de resultado por modo y fase (de las trazas de cada lanzamiento) e histogramas del
+    retraso del planificador y del tiempo de unión de punta a punta. Todo se mantiene
+    en memoria al vuelo; exponer() solo formatea, así un scrape cada pocos segundos no pesa.
+    """
+
+    PREFIJO = "zoom_launcher"
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._fases = {}                               # (modo, fase, resultado) -> n
+        self._retraso = Histograma(BUCKETS_RETRASO_S)
+        self._union = {}                               # modo -> Histograma
+        self.planificador = None
+        self._detener = threading.Event()
+        self._servidor = None
+        self._hilo_archivo = None
+
+    def vigilar(self, planificador):
+        self.planificador = planificador
+
+    def observar_retraso(self, segundos: float):
+        with self._lock:
+            self._retraso.observar(segundos)
+
+    def registrar_traza(self, spans: list):
+        """Cuenta el resultado de cada fase de un lanzamiento terminado y su duración total."""
+        raiz = next((s for s in spans if s.get("padre") is None), None)
+        if raiz is None:
+            return
+        modo = raiz.get("modo") or raiz["fase"]
+        with self._lock:
+            for span in spans:
+                clave = (modo, span["fase"], span.get("resultado", "ok"))
+                self._fases[clave] = self._fases.get(clave, 0) + 1
+            if raiz["fase"] == "lanzamiento":
+                self._union.setdefault(modo, Histograma(BUCKETS_UNION_S)).observar(raiz["dur_s"])
+
+    def exponer(self) -> str:
+        p = self.PREFIJO
+        lineas = []
+        planificador = self.planificador
+        if planificador is not None:
+            programadas, proximas = planificador.instantanea(METRICAS_MAX_PROXIMAS)
+            lineas += [f"# TYPE {p}_reuniones_programadas gauge",
+                       f"# HELP {p}_reuniones_programadas Reuniones con una apertura en la cola.",
+                       f"{p}_reuniones_programadas {programadas}",
+                       f"# TYPE {p}_proximo_disparo_timestamp_seconds gauge",
+                       f"# HELP {p}_proximo_disparo_timestamp_seconds Próxima apertura (las más cercanas).",
+                       f"# UNIT {p}_proximo_disparo_timestamp_seconds seconds"]
+            lineas += [f"{p}_proximo_disparo_timestamp_seconds"
+                       f"{_etiquetas(reunion=(reu or {}).get('nombre', ''), clave=clave)} {run.timestamp():.0f}"
+                       for run, clave, reu in proximas]
+            pool = getattr(planificador, "pool", None)
+            if pool is not None:
+                lineas += [f"# TYPE {p}_cola_lanzamientos gauge",
+                           f"{p}_cola_lanzamientos {pool.profundidad()}",
+                           f"# TYPE {p}_lanzamientos_en_curso gauge",
+                           f"{p}_lanzamientos_en_curso {pool.en_curso()}"]
+        por_perfil = {}
+        for inst in POOL_NAVEGADORES.estado():
+            cuenta = por_perfil.setdefault(os.path.basename(inst["perfil"]), [0, 0])
+            cuenta[0] += 1
+            cuenta[1] += inst["pestanas"]
+        lineas += [f"# TYPE {p}_navegadores gauge",
+                   f"# HELP {p}_navegadores Chrome vivos del pool de navegadores por perfil."]
+        lineas += [f"{p}_navegadores{_etiquetas(perfil=perfil)} {n}" for perfil, (n, _) in sorted(por_perfil.items())]
+        lineas += [f"# TYPE {p}_pestanas_reunion gauge",
+                   f"# HELP {p}_pestanas_reunion Pestañas de reunión abiertas en el pool por perfil."]
+        lineas += [f"{p}_pestanas_reunion{_etiquetas(perfil=perfil)} {n}" for perfil, (_, n) in sorted(por_perfil.items())]
+        with self._lock:
+            lineas.append(f"# TYPE {p}_fases counter")
+            lineas.append(f"# HELP {p}_fases Fases de los lanzamientos por modo y resultado.")
+            lineas += [f"{p}_fases_total{_etiquetas(modo=modo, fase=fase, resultado=resultado)} {n}"
+                       for (modo, fase, resultado), n in sorted(self._fases.items())]
+            lineas += [f"# TYPE {p}_retraso_planificador_seconds histogram",
+                       f"# HELP {p}_retraso_planificador_seconds Apertura real menos la hora de compute_next_run.",
+                       f"# UNIT {p}_retraso_planificador_seconds seconds"]
+            lineas += self._retraso.lineas(f"{p}_retraso_planificador_seconds")
+            lineas += [f"# TYPE {p}_union_seconds histogram",
+                       f"# HELP {p}_union_seconds Duración de punta a punta de cada lanzamiento.",
+                       f"# UNIT {p}_union_seconds seconds"]
+            for modo, hist in sorted(self._union.items()):
+                lineas += hist.lineas(f"{p}_union_seconds", modo=modo)
+        lineas.append("# EOF")
+        return "\n".join(lineas) + "\n"
+
+    def servir(self, puerto: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+        """Endpoint local /metrics en un hilo de fondo."""
+        metricas = self
+
+        class _Manejador(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] not in ("/metrics", "/"):
+                    self.send_error(404)
+                    return
+                cuerpo = metricas.exponer().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/openmetrics-text; version=1.0.0; charset=utf-8")
+                self.send_header("Content-Length", str(len(cuerpo)))
+                self.end_headers()
+                self.wfile.write(cuerpo)
+
+            def log_message(self, *args):
+                pass
+
+        servidor = ThreadingHTTPServer((host, puerto), _Manejador)
+        servidor.daemon_threads = True
+        threading.Thread(target=servidor.serve_forever, daemon=True, name="metricas").start()
+        self._servidor = servidor
+        return servidor
+
+    def escribir_archivo(self, ruta: str):
+        """Reescribe 'ruta' de forma atómica (el collector nunca lee un archivo a medias)."""
+        tmp = f"{ruta}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(self.exponer())
+        os.replace(tmp, ruta)
+
+    def iniciar_archivo(self, ruta: str, intervalo: float = None):
+        def _bucle():
+            while True:
+                try:
+                    self.escribir_archivo(ruta)
+                except OSError as e:
+                    print(f"⚠️  No pude escribir las métricas en {ruta}: {e}")
+                if self._detener.wait(intervalo or METRICAS_INTERVALO_S):
+                    return
+        self._hilo_archivo = threading.Thread(target=_bucle, daemon=True, name="metricas-archivo")
+        self._hilo_archivo.start()
+
+    def detener(self, timeout: float = 5):
+        """Cierra el endpoint /metrics y termina el hilo que reescribe el archivo."""
+        self._detener.set()
+        if self._servidor is not None:
+            self._servidor.shutdown()
+            self._servidor.server_close()
+            self._servidor = None
+        if self._hilo_archivo is not None:
+            self._hilo_archivo.join(timeout)
+            self._hilo_archivo = None
+
+
+METRICAS = Metricas()
+
+def _iniciar_metricas(args, planificador=None):
+    """Arranca el endpoint y/o el archivo de métricas pedidos por CLI o configuración."""
+    if planificador is not None:
+        METRICAS.vigilar(planificador)
+    if args.metricas:
+        METRICAS.servir(args.metricas)
+        print(f"📊 Métricas en http://127.0.0.1:{args.metricas}/metrics")
+    if args.metricas_archivo:
+        METRICAS.iniciar_archivo(args.metricas_archivo)
+        print(f"📊 Métricas en {args.metricas_archivo} (cada {METRICAS_INTERVALO_S}s)")
+
+# =====================================
+# CATÁLOGO EXTERNO (RECARGA EN CALIENTE)
+# =====================================
+def cargar_reuniones(ruta: str) -> list:
+    """
+    Lee el catálogo de reuniones desde un archivo JSON: una lista con el mismo
+    formato que 'reuniones', o un objeto {"reuniones": [...]}.
+    """
+    with open(ruta, encoding="utf-8") as f:
+        datos = json.load(f)
+    if isinstance(datos, dict):
+        datos = datos.get("reuniones", [])
+    if not isinstance(datos, list):
+        raise ValueError("el archivo debe contener una lista de reuniones")
+    return datos
+
+def claves_catalogo(reus: list) -> list:
+    """
+    Clave estable de cada reunión para comparar catálogos: su campo 'id' si lo
+    tiene, o nombre|url|modo. Las repetidas se numeran en orden de aparición.
+    """
+    vistas = {}
+    claves = []
+    for reu in reus:
+        base = str(reu.get("id") or f"{reu.get('nombre')}|{reu.get('url')}|{reu.get('modo', 'zoom_app')}")
+        n = vistas.get(base, 0)
+        vistas[base] = n + 1
+        claves.append(base if n == 0 else f"{base}#{n + 1}")
+    return claves
+
+class RecargadorCatalogo:
+    """
+    Vigila el archivo de reuniones (inotify en Linux, sondeo de mtime en el resto)
+    y aplica al planificador solo el diff: altas, bajas y reuniones modificadas.
+    Las demás conservan su entrada en la cola y las aperturas en curso no se tocan.
+    """
+
+    def __init__(self, ruta: str, planificador, intervalo: float = 2.0):
+        self.ruta = os.path.abspath(ruta)
+        self.planificador = planificador
+        self.intervalo = intervalo
+        self._aplicadas = {}   # clave -> dict de la reunión ya aplicado al planificador
+        self._detener = threading.Event()
+        self._hilo = None
+
+    def cargar(self) -> bool:
+        """Lee el archivo y aplica el diff contra lo ya cargado. False si el archivo no es válido."""
+        t0 = time.perf_counter()
+        try:
+            reus = cargar_reuniones(self.ruta)
+        except (OSError, ValueError) as e:
+            # Archivo a medio guardar o con errores: se mantiene el catálogo actual
+            print(f"⚠️  No pude leer {self.ruta}: {e}. Se mantiene el catálogo actual.")
+            return False
+
+        # Cada carga produce dicts nuevos que nadie modifica: basta la igualdad de dicts
+        nuevas = dict(zip(claves_catalogo(reus), reus))
+        previas = self._aplicadas
+        bajas = previas.keys() - nuevas.keys()
+        altas = nuevas.keys() - previas.keys()
+        cambios = {c for c in nuevas.keys() & previas.keys() if nuevas[c] != previas[c]}
+
+        for clave in bajas:
+            self.planificador.quitar(clave)
+        actualizar = [c for c in nuevas if c in altas or c in cambios]
+        if actualizar:
+            self.planificador.agregar_varias([nuevas[c] for c in actualizar], actualizar)
+        self._aplicadas = nuevas
+
+        ms = (time.perf_counter() - t0) * 1000
+        if self._hilo is not None:
+            print(f"🔄 Catálogo recargado: +{len(altas)} −{len(bajas)} ~{len(cambios)} "
+                  f"({len(nuevas)} reuniones, {ms:.1f} ms)")
+        return True
+
+    # ---- Vigilancia del archivo ----
+    def iniciar(self):
+        self._hilo = threading.Thread(target=self._vigilar, name="recargador", daemon=True)
+        self._hilo.start()
+
+    def detener(self, timeout: float = 5):
+        """Deja de vigilar el archivo (el hilo revisa la señal al menos cada segundo)."""
+        self._detener.set()
+        if self._hilo is not None:
+            self._hilo.join(timeout)
+
+    def _vigilar(self):
+        try:
+            self._vigilar_inotify()
+        except OSError as e:
+            print(f"ℹ️  inotify no disponible ({e}); vigilando {self.ruta} cada {self.intervalo}s.")
+            self._vigilar_sondeo()
+
+    def _vigilar_sondeo(self):
+        firma = None
+        while not self._detener.is_set():
+            try:
+                st = os.stat(self.ruta)
+                actual = (st.st_mtime_ns, st.st_size)
+            except OSError:
+                actual = None
+            if firma is not None and actual is not None and actual != firma:
+                self.cargar()
+            firma = actual if actual is not None else firma
+            self._detener.wait(self.intervalo)
+
+    def _vigilar_inotify(self):
+        """inotify vía ctypes sobre el directorio (los editores suelen reemplazar el archivo con rename)."""
+        if platform.system() != "Linux":
+            raise OSError("solo disponible en Linux")
+        libc = ctypes.CDLL(None, use_errno=True)
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1")
+        try:
+            directorio, nombre = os.path.split(self.ruta)
+            mascara = 0x00000008 | 0x00000080 | 0x00000100  # IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+            if libc.inotify_add_watch(fd, directorio.encode(), mascara) < 0:
+                raise OSError(ctypes.get_errno(), "inotify_add_watch")
+            encabezado = struct.Struct("iIII")
+            while not self._detener.is_set():
+                listos, _, _ = select.select([fd], [], [], 1.0)
+                if not listos:
+                    continue
+                time.sleep(0.05)  # agrupar ráfagas de eventos de un mismo guardado
+                try:
+                    datos = os.read(fd, 64 * 1024)
+                except BlockingIOError:
+                    continue
+                tocado = False
+                i = 0
+                while i < len(datos):
+                    _, _, _, largo = encabezado.unpack_from(datos, i)
+                    evento = datos[i + encabezado.size:i + encabezado.size + largo].rstrip(b"\0")
+                    tocado |= evento.decode(errors="replace") == nombre
+                    i += encabezado.size + largo
+                if tocado:
+                    self.cargar()
+        finally:
+            os.close(fd)
 
 # =====================================
 # PROCESO PRINCIPAL
 # =====================================
-def main():
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Abre reuniones de Zoom X minutos antes de la hora programada.")
+    parser.add_argument(
+        "--engine", choices=["heap", "asyncio", "hilos"], default="heap",
+        help="heap: un solo planificador con min-heap (por defecto); asyncio: planificador y aperturas "
+             "en un event loop; hilos: un hilo por reunión (modo anterior)",
+    )
+    parser.add_argument(
+        "--max-lanzamientos", type=int, default=MAX_LANZAMIENTOS_CONCURRENTES, metavar="N",
+        help=f"aperturas simultáneas como máximo (por defecto {MAX_LANZAMIENTOS_CONCURRENTES})",
+    )
+    parser.add_argument(
+        "--chromedriver", metavar="RUTA",
+        help="ejecutable de ChromeDriver a usar (sin descargas); también ZOOM_CHROMEDRIVER",
+    )
+    parser.add_argument(
+        "--config", metavar="ARCHIVO",
+        help="archivo JSON con las reuniones; se vigila y se recarga en caliente al modificarlo",
+    )
+    parser.add_argument(
+        "--proximas", type=int, metavar="N",
+        help="muestra las próximas N aperturas programadas y termina",
+    )
+    parser.add_argument(
+        "--simular", type=float, metavar="DIAS",
+        help="simula DIAS días del catálogo con un reloj virtual (sin abrir nada), resume y termina",
+    )
+    parser.add_argument(
+        "--disparos", metavar="CSV",
+        help="con --simular, guarda cada apertura simulada (hora objetivo y real) en este CSV",
+    )
+    parser.add_argument(
+        "--ligero", action="store_true",
+        help="Chrome headless y sin servicios de fondo para todas las reuniones en navegador",
+    )
+    parser.add_argument(
+        "--metricas", type=int, default=METRICAS_PUERTO, metavar="PUERTO",
+        help="expone métricas OpenMetrics en http://127.0.0.1:PUERTO/metrics",
+    )
+    parser.add_argument(
+        "--metricas-archivo", default=METRICAS_ARCHIVO, metavar="RUTA",
+        help=f"escribe las métricas en RUTA cada {METRICAS_INTERVALO_S}s (textfile collector)",
+    )
+    parser.add_argument(
+        "--trazas", nargs="?", const=TRAZAS_ARCHIVO, metavar="ARCHIVO",
+        help="p50/p95/p99 por fase de las trazas de lanzamiento guardadas y termina",
+    )
+    parser.add_argument(
+        "--selectores", action="store_true",
+        help="muestra las estadísticas aprendidas de los selectores de respaldo y termina",
+    )
+    return parser.parse_args(argv)
+
+def _cargar_en_planificador(planificador, reus, args):
+    """Carga inicial: desde --config (con recarga en caliente) o desde la lista 'reuniones'."""
+    if not args.config:
+        planificador.agregar_varias(reus)
+        return None
+    recargador = RecargadorCatalogo(args.config, planificador)
+    recargador.cargar()
+    recargador.iniciar()
+    print(f"👀 Vigilando cambios en {recargador.ruta}")
+    return recargador
+
+def _apagar(recargador=None):
+    """
+    Cierre ordenado: deja de vigilar el catálogo, sale de las reuniones abiertas, cierra
+    los Chrome del pool (y sus clones) y por último detiene las métricas.
+    """
+    if recargador is not None:
+        recargador.detener()
+    abiertas = CICLO_VIDA.activas()
+    if abiertas:
+        print(f"🧹 Cerrando {abiertas} reunión(es) abierta(s)...")
+    CICLO_VIDA.cerrar_todas()
+    POOL_NAVEGADORES.cerrar_todo()
+    METRICAS.detener()
+
+def main(argv=None):
+    global CHROMEDRIVER_PATH, MODO_LIGERO
+    args = parse_args(argv)
+    if args.selectores:
+        print(ESTADISTICAS_SELECTORES.volcado())
+        return
+    if args.trazas:
+        print(resumen_trazas(args.trazas))
+        return
+    if args.chromedriver:
+        CHROMEDRIVER_PATH = args.chromedriver
+    if args.ligero:
+        MODO_LIGERO = True
+    reus = reuniones
+    if args.config:
+        try:
+            reus = cargar_reuniones(args.config)
+        except (OSError, ValueError) as e:
+            raise SystemExit(f"❌ No pude leer el catálogo {args.config}: {e}")
+
+    if args.proximas:
+        imprimir_proximas(reus, args.proximas)
+        return
+
+    if args.simular:
+        desde = RELOJ.ahora()
+        resultado = simular_planificador(reus, desde, desde + timedelta(days=args.simular))
+        print(f"🧪 Simulación: {resultado.resumen()}")
+        if args.disparos:
+            resultado.guardar_csv(args.disparos)
+            print(f"💾 Aperturas simuladas en {args.disparos}")
+        return
+
     print("=" * 70)
     print("🚀 ZOOM AUTO-JOIN LAUNCHER v3.0 (Programación automática - abre X min antes)")
     print("=" * 70)
     print(f"Sistema operativo: {platform.system()}")
     print(f"Zona horaria: {TZ.key}")
-    print(f"Total de reuniones configuradas: {len(reuniones)}\n")
+    print(f"Motor de planificación: {args.engine}")
+    print(f"Total de reuniones configuradas: {len(reus)}")
+    # Pool acotado (EDF) de aperturas; también corre las renovaciones de sesión
+    pool = PoolLanzamientos(args.max_lanzamientos)
+    if args.config or any(r.get("modo") == "navegador_auto" for r in reus):
+        # Resolver ChromeDriver ahora y no a la hora de la reunión
+        verificar_chromedriver()
+        if CLONAR_PERFILES and GESTOR_PERFILES.recolectar():
+            print("🧹 Clones de perfil huérfanos eliminados")
+        if GUARDAR_SESION and USAR_POOL_NAVEGADORES:
+            iniciar_refresco_sesiones(pool)
+    print()
 
-    # Lanzar un hilo por reunión (cada uno espera su horario y la abre)
-    threads = []
-    for r in reuniones:
-        t = threading.Thread(target=planificar_reunion, args=(r,), daemon=True)
-        t.start()
-        threads.append(t)
+    # Con un catálogo vigilado el planificador sigue vivo aunque se quede sin reuniones
+    seguir_vivo = bool(args.config)
+
+    if args.engine == "asyncio":
+        planificador = PlanificadorAsync(args.max_lanzamientos, salir_si_vacio=not seguir_vivo, pool=pool)
+        recargador = _cargar_en_planificador(planificador, reus, args)
+        _iniciar_metricas(args, planificador)
+        try:
+            asyncio.run(planificador.ejecutar())
+            # Sin más aperturas programadas: seguir mientras haya clases abiertas
+            while CICLO_VIDA.activas() > 0:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            print("\n👋 Script finalizado por el usuario")
+        _apagar(recargador)
+        print(f"📈 Retraso del planificador: {REGISTRO_RETRASOS.resumen()}")
+        print(f"⏱️  Esperas del flujo de unión: {MEDIDOR_FASES.resumen()}")
+        # El pool ya está cerrado, pero conserva las esperas de lo que llegó a lanzarse
+        print(f"📊 Cola de lanzamientos: {pool.estadisticas()}")
+        return
+
+    if args.engine == "hilos":
+        if args.config:
+            print("ℹ️  El motor 'hilos' no recarga el catálogo en caliente.")
+        recargador = None
+        # Lanzar un hilo por reunión (cada uno espera su horario y la abre)
+        threads = []
+        for r in reus:
+            t = threading.Thread(target=planificar_reunion, args=(r,), daemon=True)
+            t.start()
+            threads.append(t)
+        _iniciar_metricas(args)
+        vivo = lambda: any(t.is_alive() for t in threads) or CICLO_VIDA.activas() > 0
+    else:
+        # Un único hilo planificador para todas las reuniones
+        planificador = Planificador(salir_si_vacio=not seguir_vivo, pool=pool)
+        recargador = _cargar_en_planificador(planificador, reus, args)
+        _iniciar_metricas(args, planificador)
+        hilo = threading.Thread(target=planificador.ejecutar, name="planificador", daemon=True)
+        hilo.start()
+        vivo = lambda: (hilo.is_alive() or planificador.lanzamientos_en_curso() > 0
+                        or CICLO_VIDA.activas() > 0)
 
     # Mantener el script corriendo
     try:
-        while any(t.is_alive() for t in threads):
+        while vivo():
             time.sleep(1)
     except KeyboardInterrupt:
         print("\n👋 Script finalizado por el usuario")
+    _apagar(recargador)
+    print(f"📈 Retraso del planificador: {REGISTRO_RETRASOS.resumen()}")
+    print(f"⏱️  Esperas del flujo de unión: {MEDIDOR_FASES.resumen()}")
+    if args.engine == "heap":
+        print(f"📊 Cola de lanzamientos: {pool.estadisticas()}")
 
 # =====================================
 # EJECUCIÓN